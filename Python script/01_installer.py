@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import argparse
-import logging
 import os
+import zipfile
 from pathlib import Path
 from typing import Iterable
 
@@ -21,8 +21,20 @@ except ImportError:  # pragma: no cover - allow direct execution as a script
     sys.path.append(str(Path(__file__).resolve().parent))
     import common  # type: ignore[no-redef]
 
+import bundle
+import copy_executor
+import install_journal
+import install_plan
+import install_state
+import metrics
+import payload_source
+import profiles
+import profiling
+import registry_trace
+import run_report
 
-def parse_args() -> argparse.Namespace:
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Office template installer (Python)")
     parser.add_argument(
         "--allowed-authors",
@@ -33,117 +45,404 @@ def parse_args() -> argparse.Namespace:
         metavar="RUTA",
         help="Only validate the author for a file/folder and exit.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--plan",
+        "--dry-run",
+        dest="plan",
+        action="store_true",
+        help="Print the install plan as JSON without copying anything.",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore the resume journal of an interrupted install and start over; also reinstalls an unchanged --source bundle.",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Only apply templates added, changed or removed since the last install.",
+    )
+    parser.add_argument(
+        "--source",
+        metavar="RUTA_O_URL",
+        help="Payload folder, UNC share, bundle file or http(s) bundle URL; remote sources are cached locally.",
+    )
+    parser.add_argument(
+        "--bundle",
+        metavar="RUTA",
+        help="Install from a payload bundle (see bundle.py) instead of the current folder.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        metavar="RUTA",
+        help="Install into this user profile folder instead of the current user (repeatable).",
+    )
+    parser.add_argument(
+        "--profiles-root",
+        metavar="RUTA",
+        help="Install into every user profile under this folder (e.g. C:\\Users).",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="RUTA",
+        help="Write a JSON run report with per-phase and per-file timings to this file.",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="RUTA",
+        help="Write run metrics (Prometheus textfile, or JSON for a .json path) to this file or folder.",
+    )
+    parser.add_argument(
+        "--results",
+        metavar="RUTA",
+        help="Write the per-file install outcomes (source, destination, outcome, bytes, author) as JSON.",
+    )
+    parser.add_argument(
+        "--event-log",
+        metavar="RUTA",
+        help="Append every design-log event as one JSON object per line to this file.",
+    )
+    profiling.add_profile_arguments(parser)
+    return parser.parse_args(None if argv is None else list(argv))
 
 
-def main(argv: Iterable[str] | None = None) -> int:
-    args = parse_args()
+def main(argv: Iterable[str] | None = None) -> common.InstallReport:
+    """Run the installer; the returned report's exit_code is the process exit code."""
+    args = parse_args(argv)
     design_mode = _resolve_design_mode()
-    common.refresh_design_log_flags(design_mode)
+    common.configure_events(design_mode, args.event_log)
     common.configure_logging(design_mode)
+    report = run_report.RunReport("install")
+    metrics_path = metrics.resolve_metrics_path(args.metrics, "install")
+    tracer = None
+    if args.report or metrics_path is not None:
+        tracer = registry_trace.install(common, common.path_utils)
+    exit_code = 1
+    with profiling.profiled(args.cprofile, args.cprofile_sample):
+        try:
+            results = _run(args, design_mode, report)
+            exit_code = results.exit_code
+            if args.results:
+                _write_results(results, args.results, design_mode)
+            return results
+        except SystemExit as exc:
+            exit_code = exc.code if isinstance(exc.code, int) else 1
+            raise
+        finally:
+            if tracer is not None:
+                report.add_section("registry", tracer.to_dict())
+            if args.report:
+                _write_report(report, args.report, design_mode)
+            if metrics_path is not None:
+                _write_metrics(report, metrics_path, exit_code, design_mode)
+            common.EVENTS.close()
 
-    resolved_paths = common.resolve_template_paths()
-    common.log_registry_sources(design_mode)
-    common.log_template_paths(resolved_paths, design_mode)
-    if design_mode and common.DESIGN_LOG_PATHS:
-        logging.getLogger(__name__).info(
-            "[INFO] Extra template folder (WORD): %s", resolved_paths["CUSTOM_WORD"]
-        )
-        logging.getLogger(__name__).info(
-            "[INFO] Extra template folder (POWERPOINT): %s", resolved_paths["CUSTOM_PPT"]
-        )
-        logging.getLogger(__name__).info(
-            "[INFO] Extra template folder (EXCEL): %s", resolved_paths["CUSTOM_EXCEL"]
-        )
+
+def _run(args: argparse.Namespace, design_mode: bool, report: run_report.RunReport) -> common.InstallReport:
+    with report.span("resolve-paths"):
+        resolved_paths = common.resolve_template_paths()
+        common.log_registry_sources(design_mode)
+        common.log_template_paths(resolved_paths, design_mode)
+    common.EVENTS.paths.info("[INFO] Extra template folder (WORD): %s", resolved_paths["CUSTOM_WORD"])
+    common.EVENTS.paths.info("[INFO] Extra template folder (POWERPOINT): %s", resolved_paths["CUSTOM_PPT"])
+    common.EVENTS.paths.info("[INFO] Extra template folder (EXCEL): %s", resolved_paths["CUSTOM_EXCEL"])
 
     working_dir = Path.cwd()
     base_dir = common.resolve_base_directory(working_dir)
+    source: payload_source.ResolvedSource | None = None
 
-    if base_dir == working_dir and common.path_in_appdata(working_dir):
-        common.exit_with_error(
-            '[ERROR] Template path was not provided. Run the installer from "1. Pin templates..." so the correct folder is passed in.',
-            design_mode,
-        )
+    if args.source:
+        try:
+            with report.span("fetch-source") as phase:
+                source = payload_source.resolve_source(args.source, design_mode)
+                phase.attributes.update(fetch=source.fetch, bytes=source.bytes_transferred)
+        except OSError as exc:
+            common.exit_with_error(f"[ERROR] {exc}", design_mode)
+        common.EVENTS.installer.info("[INFO] Payload source %s -> %s (%s)", args.source, source.path, source.fetch)
+        if source.is_bundle:
+            args.bundle = str(source.path)
+        else:
+            base_dir = source.path
+    elif common.is_unpinned_payload(working_dir, base_dir):
+        common.exit_with_error(common.UNPINNED_PAYLOAD_ERROR.format(tool="installer"), design_mode)
 
     allowed_authors = _resolve_allowed_authors(args.allowed_authors)
     validation_enabled = common.AUTHOR_VALIDATION_ENABLED
 
     if args.check_author:
-        result = common.check_template_author(
-            Path(args.check_author),
-            allowed_authors=allowed_authors,
-            validation_enabled=validation_enabled,
-            design_mode=design_mode,
-        )
+        with report.span("check-author"):
+            result = common.check_template_author(
+                Path(args.check_author),
+                allowed_authors=allowed_authors,
+                validation_enabled=validation_enabled,
+                design_mode=design_mode,
+            )
         print(result.as_cli_output())
-        if design_mode and common.DESIGN_LOG_AUTHOR:
-            logging.getLogger(__name__).info(result.message)
-        return 0 if result.allowed else 1
+        common.EVENTS.author.info(result.message)
+        return common.InstallReport(exit_code=0 if result.allowed else 1)
 
-    _print_intro(base_dir, design_mode)
-    common.close_office_apps(design_mode)
+    if args.profile or args.profiles_root:
+        if args.plan:
+            # Profile installs have no plan preview; never let a dry run copy into profiles.
+            common.exit_with_error("[ERROR] --plan cannot be combined with --profile or --profiles-root.", design_mode)
+        exit_code = _install_to_profiles(args, base_dir, allowed_authors, validation_enabled, design_mode, report)
+        return common.InstallReport(exit_code=exit_code)
 
     destinations = common.default_destinations()
-    flags = common.InstallFlags()
-
-    # Base templates
-    base_targets = [
-        ("WORD", "Normal.dotx", destinations["WORD"]),
-        ("WORD", "Normal.dotm", destinations["WORD"]),
-        ("WORD", "NormalEmail.dotx", destinations["WORD"]),
-        ("WORD", "NormalEmail.dotm", destinations["WORD"]),
-        ("POWERPOINT", "Blank.potx", destinations["POWERPOINT"]),
-        ("POWERPOINT", "Blank.potm", destinations["POWERPOINT"]),
-        ("EXCEL", "Book.xltx", destinations["EXCEL"]),
-        ("EXCEL", "Book.xltm", destinations["EXCEL"]),
-        ("EXCEL", "Sheet.xltx", destinations["EXCEL"]),
-        ("EXCEL", "Sheet.xltm", destinations["EXCEL"]),
-    ]
-
-    for app_label, filename, destination in base_targets:
-        common.install_template(
-            app_label,
-            filename,
+    if args.bundle:
+        if args.plan:
+            # Bundles have no plan preview; never let a dry run stream members to their destinations.
+            common.exit_with_error("[ERROR] --plan cannot be combined with a bundle source.", design_mode)
+        if source is not None and source.installed and not args.fresh:
+            common.EVENTS.installer.info("[INFO] Payload source unchanged since the last install; nothing to do.")
+            if not design_mode:
+                print("Ready")
+            return common.InstallReport()
+        results = _install_bundle(
+            Path(args.bundle), destinations, allowed_authors, validation_enabled, design_mode, report
+        )
+        if source is not None and not results.by_outcome(common.FileOutcome.FAILED):
+            payload_source.mark_installed(source)
+        return results
+    if args.plan:
+        # A dry run must not read, resume or discard the journal of an interrupted install.
+        plan, *_ = _prepare_plan(
             base_dir,
-            destination,
             destinations,
-            flags,
             allowed_authors,
             validation_enabled,
+            args.sync,
+            False,
             design_mode,
+            report,
+            use_journal=False,
         )
+        print(plan.to_json())
+        return common.InstallReport()
 
-    # Custom templates
-    common.copy_custom_templates(
-        base_dir=base_dir,
-        destinations=destinations,
-        flags=flags,
-        allowed=allowed_authors,
-        validation_enabled=validation_enabled,
-        design_mode=design_mode,
-    )
-    _run_post_install_actions(base_dir, design_mode)
-
-    if design_mode and common.DESIGN_LOG_INSTALLER:
-        logging.getLogger(__name__).info(
-            "[FINAL] Installation completed. Files copied=%s, errors=%s, blocked=%s.",
-            flags.totals["files"],
-            flags.totals["errors"],
-            flags.totals["blocked"],
-        )
-    elif not design_mode:
+    _print_intro(base_dir, design_mode)
+    results = run_install(
+        base_dir,
+        destinations,
+        allowed_authors,
+        validation_enabled,
+        design_mode,
+        sync=args.sync,
+        fresh=args.fresh,
+        report=report,
+    )
+    if results is None:
+        if not design_mode:
+            print("Ready")
+        return common.InstallReport()
+    with report.span("post-install"):
+        _run_post_install_actions(base_dir, design_mode)
+
+    common.EVENTS.installer.info(
+        "[FINAL] Installation completed. Files copied=%s, errors=%s, blocked=%s.",
+        results.totals["files"],
+        results.totals["errors"],
+        results.totals["blocked"],
+    )
+    if not design_mode:
         print("Ready")
-    return 0
+    return results
+
+
+def run_install(
+    base_dir: Path,
+    destinations: dict[str, Path],
+    allowed_authors: list[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    sync: bool = False,
+    fresh: bool = False,
+    report: run_report.RunReport | None = None,
+) -> common.InstallReport | None:
+    """Install the payload in `base_dir`; return None when --sync found nothing to do."""
+    report = report or run_report.RunReport("install")
+    plan, state, authors_key, changes, journal = _prepare_plan(
+        base_dir, destinations, allowed_authors, validation_enabled, sync, fresh, design_mode, report
+    )
+    if changes == 0:
+        common.EVENTS.installer.info("[INFO] Sync: installed templates are up to date.")
+        return None
+    with report.span("close-apps"):
+        common.close_office_apps(design_mode, targets=install_plan.planned_targets(plan))
+    results = common.InstallReport()
+
+    # Base templates first, then custom templates
+    with report.span("copy", estimated_bytes=plan.estimated_bytes):
+        outcomes = install_plan.execute_install_plan(
+            plan, results, allowed_authors, validation_enabled, design_mode, journal
+        )
+    record_outcomes(report, outcomes)
+    if journal is not None:
+        # Keep the journal while copies still fail so the next run resumes.
+        if any(outcome.status == copy_executor.STATUS_FAILED for outcome in outcomes):
+            journal.close()
+        else:
+            journal.discard()
+    with report.span("removals"):
+        removal_results = install_state.execute_removals(plan, design_mode)
+    for result in removal_results:
+        report.add_file(result.target, "", f"{result.kind}-{result.outcome}", result.duration)
+    metrics.METRICS.record_results(results)
+    with report.span("save-state"):
+        state.record_install(outcomes, removal_results, authors_key)
+        try:
+            state.save()
+        except OSError as exc:
+            common.EVENTS.installer.warning("[WARN] Could not save install state (%s)", exc)
+    return results
+
+
+def record_outcomes(report: run_report.RunReport, outcomes: Iterable[copy_executor.CopyOutcome]) -> None:
+    for outcome in outcomes:
+        report.add_file(outcome.job.source, outcome.job.destination, outcome.status, outcome.duration, outcome.bytes)
+        if outcome.backup:
+            report.count("backups")
+
+
+def _prepare_plan(
+    base_dir: Path,
+    destinations: dict[str, Path],
+    allowed_authors: list[str],
+    validation_enabled: bool,
+    sync: bool,
+    fresh: bool,
+    design_mode: bool,
+    report: run_report.RunReport,
+    use_journal: bool = True,
+) -> tuple[install_plan.InstallPlan, install_state.InstallState, str, int | None, install_journal.InstallJournal | None]:
+    with report.span("plan"):
+        plan = install_plan.build_install_plan(base_dir, destinations)
+    with report.span("load-state"):
+        state = install_state.InstallState.for_payload(base_dir)
+        authors_key = install_state.authors_fingerprint(allowed_authors, validation_enabled)
+    changes = None
+    if sync:
+        with report.span("sync-delta") as phase:
+            changes = install_state.apply_delta(plan, state, authors_key)
+            phase.attributes["changes"] = changes
+    journal = None
+    if use_journal:
+        with report.span("journal"):
+            journal = _open_journal(base_dir, plan, discard=fresh, design_mode=design_mode)
+    for kind, count in plan.operation_counts().items():
+        report.count(f"ops.{kind}", count)
+    return plan, state, authors_key, changes, journal
 
 
 def _print_intro(base_dir: Path, design_mode: bool) -> None:
-    if design_mode and common.DESIGN_LOG_INSTALLER:
-        logging.getLogger(__name__).info("[DEBUG] Design mode enabled=true")
-        logging.getLogger(__name__).info("[INFO] Base folder: %s", base_dir)
-    else:
+    common.EVENTS.installer.info("[DEBUG] Design mode enabled=true")
+    common.EVENTS.installer.info("[INFO] Base folder: %s", base_dir)
+    if not common.EVENTS.installer.console:
         print("Installing custom templates and applying them as the new Microsoft Office defaults...")
 
 
+def _install_to_profiles(
+    args: argparse.Namespace,
+    base_dir: Path,
+    allowed_authors: list[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    report: run_report.RunReport,
+) -> int:
+    """Fan out to several profiles; Office is not closed since it may belong to other users."""
+    profile_roots = [common.normalize_path(path) for path in args.profile or []]
+    if args.profiles_root:
+        profile_roots.extend(profiles.enumerate_profiles(common.normalize_path(args.profiles_root)))
+    _print_intro(base_dir, design_mode)
+    with report.span("profiles", count=len(profile_roots)):
+        results = profiles.install_to_profiles(base_dir, profile_roots, allowed_authors, validation_enabled, design_mode)
+    report.add_section("profiles", [result.to_dict() for result in results])
+    for result in results:
+        print(result.as_line())
+    failed = any(result.error for result in results)
+    if not design_mode:
+        print("Ready")
+    return 1 if failed else 0
+
+
+def _install_bundle(
+    bundle_path: Path,
+    destinations: dict[str, Path],
+    allowed_authors: list[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    report: run_report.RunReport,
+) -> common.InstallReport:
+    _print_intro(bundle_path, design_mode)
+    results = common.InstallReport()
+    try:
+        with report.span("bundle"):
+            outcomes = bundle.install_bundle(
+                bundle_path, destinations, results, allowed_authors, validation_enabled, design_mode
+            )
+        record_outcomes(report, outcomes)
+        metrics.METRICS.record_results(results)
+    except (OSError, zipfile.BadZipFile, bundle.BundleError) as exc:
+        common.exit_with_error(f"[ERROR] Could not install bundle \"{bundle_path}\" ({exc})", design_mode)
+    common.EVENTS.installer.info(
+        "[FINAL] Bundle installed. Files copied=%s, errors=%s, blocked=%s.",
+        results.totals["files"],
+        results.totals["errors"],
+        results.totals["blocked"],
+    )
+    if not design_mode:
+        print("Ready")
+    return results
+
+
+def _write_results(results: common.InstallReport, path: str, design_mode: bool) -> None:
+    try:
+        results.write(path)
+    except OSError as exc:
+        common.EVENTS.installer.warning("[WARN] Could not write install results (%s)", exc)
+        if not design_mode:
+            print(f"[WARN] Could not write install results ({exc})")
+
+
+def _write_report(report: run_report.RunReport, path: str, design_mode: bool) -> None:
+    try:
+        report.write(path)
+    except OSError as exc:
+        common.EVENTS.installer.warning("[WARN] Could not write run report (%s)", exc)
+        if not design_mode:
+            print(f"[WARN] Could not write run report ({exc})")
+
+
+def _write_metrics(report: run_report.RunReport, path: Path, exit_code: int, design_mode: bool) -> None:
+    metrics.METRICS.record_report(report)
+    metrics.METRICS.finish_run(report.command, report.duration, exit_code)
+    try:
+        metrics.METRICS.write(path)
+    except OSError as exc:
+        common.EVENTS.installer.warning("[WARN] Could not write metrics (%s)", exc)
+        if not design_mode:
+            print(f"[WARN] Could not write metrics ({exc})")
+
+
+def _open_journal(
+    base_dir: Path,
+    plan: install_plan.InstallPlan,
+    discard: bool,
+    design_mode: bool,
+) -> install_journal.InstallJournal | None:
+    if not install_journal.JOURNAL_ENABLED:
+        return None
+    journal = install_journal.InstallJournal.for_payload(base_dir)
+    if discard:
+        journal.discard()
+        return journal
+    resumed = install_journal.apply_journal(plan, journal)
+    if resumed:
+        common.EVENTS.installer.info("[INFO] Resuming interrupted install (%s files already handled)", resumed)
+    return journal
+
+
 def _resolve_allowed_authors(cli_value: str | None) -> list[str]:
     env_value = os.environ.get("AllowedTemplateAuthors")
     raw = cli_value or env_value
@@ -166,14 +465,10 @@ def _run_post_install_actions(base_dir: Path, design_mode: bool) -> None:
         office_files_copy_allowed_destinations.run_actions(base_dir, design_mode)
         office_files_copy_allowed_apps.run_actions(base_dir, design_mode)
     except OSError as exc:
-        if design_mode and common.DESIGN_LOG_INSTALLER:
-            logging.getLogger(__name__).warning(
-                "[WARN] Post-install actions could not be executed (%s)",
-                exc,
-            )
-        elif not design_mode:
+        common.EVENTS.installer.warning("[WARN] Post-install actions could not be executed (%s)", exc)
+        if not design_mode:
             print(f"[WARN] Post-install actions could not be executed ({exc})")
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main().exit_code)
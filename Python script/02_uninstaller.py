@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import argparse
-import logging
 from pathlib import Path
 
 # Manual configuration for design mode.
@@ -19,59 +18,138 @@ except ImportError:  # pragma: no cover - allow direct execution as a script
     sys.path.append(str(Path(__file__).resolve().parent))
     import common  # type: ignore[no-redef]
 
+import install_state
+import metrics
+import profiling
+import registry_trace
+import run_report
+import uninstall_plan
 
-def parse_args() -> argparse.Namespace:
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Office template uninstaller (Python)")
-    return parser.parse_args()
+    parser.add_argument(
+        "--report",
+        metavar="RUTA",
+        help="Write a JSON run report with per-phase and per-file timings to this file.",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="RUTA",
+        help="Write run metrics (Prometheus textfile, or JSON for a .json path) to this file or folder.",
+    )
+    parser.add_argument(
+        "--event-log",
+        metavar="RUTA",
+        help="Append every design-log event as one JSON object per line to this file.",
+    )
+    profiling.add_profile_arguments(parser)
+    return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
-    args = parse_args()
+    args = parse_args(argv)
     design_mode = _resolve_design_mode()
-    common.refresh_design_log_flags(design_mode)
+    common.configure_events(design_mode, args.event_log)
     common.configure_logging(design_mode)
-    common.close_office_apps(design_mode)
-
+    report = run_report.RunReport("uninstall")
+    metrics_path = metrics.resolve_metrics_path(args.metrics, "uninstall")
+    tracer = None
+    if args.report or metrics_path is not None:
+        tracer = registry_trace.install(common, common.path_utils)
+    exit_code = 1
+    with profiling.profiled(args.cprofile, args.cprofile_sample):
+        try:
+            exit_code = _run(design_mode, report)
+            return exit_code
+        except SystemExit as exc:
+            exit_code = exc.code if isinstance(exc.code, int) else 1
+            raise
+        finally:
+            if tracer is not None:
+                report.add_section("registry", tracer.to_dict())
+            if args.report:
+                _write_report(report, args.report, design_mode)
+            if metrics_path is not None:
+                _write_metrics(report, metrics_path, exit_code, design_mode)
+            common.EVENTS.close()
+
+
+def _run(design_mode: bool, report: run_report.RunReport) -> int:
     base_dir = common.resolve_base_directory(Path.cwd())
-    if base_dir == Path.cwd() and common.path_in_appdata(base_dir):
-        common.exit_with_error(
-            '[ERROR] Template path was not provided. Run the uninstaller from "1. Pin templates..." so the correct folder is passed in.',
-            design_mode,
-        )
+    if common.is_unpinned_payload(Path.cwd(), base_dir):
+        common.exit_with_error(common.UNPINNED_PAYLOAD_ERROR.format(tool="uninstaller"), design_mode)
 
     _print_intro(base_dir, design_mode)
 
-    if design_mode and common.DESIGN_LOG_UNINSTALLER:
-        logging.getLogger(__name__).info("[INFO] Uninstalling from: %s", base_dir)
-
-    destinations = common.default_destinations()
-    if design_mode and common.DESIGN_LOG_UNINSTALLER:
-        logging.getLogger(__name__).info(
-            "[INFO] Default paths: WORD=%s PPT=%s EXCEL=%s",
-            destinations.get("WORD"),
-            destinations.get("POWERPOINT"),
-            destinations.get("EXCEL"),
-        )
+    common.EVENTS.uninstaller.info("[INFO] Uninstalling from: %s", base_dir)
+
+    with report.span("resolve-paths"):
+        destinations = common.default_destinations()
+    common.EVENTS.uninstaller.info(
+        "[INFO] Default paths: WORD=%s PPT=%s EXCEL=%s",
+        destinations.get("WORD"),
+        destinations.get("POWERPOINT"),
+        destinations.get("EXCEL"),
+    )
     common.log_template_folder_contents(common.resolve_template_paths(), design_mode)
-    common.remove_normal_templates(design_mode)
-    common.remove_installed_templates(destinations, design_mode, base_dir)
-    common.delete_custom_copies(base_dir, destinations, design_mode)
-    common.clear_mru_entries_for_payload(base_dir, destinations, design_mode)
-    common.remove_normal_templates(design_mode)
-    _run_post_uninstall_actions(base_dir, design_mode)
-
-    if design_mode and common.DESIGN_LOG_UNINSTALLER:
-        logging.getLogger(__name__).info("[FINAL] Uninstall completed.")
-    elif not design_mode:
+    run_uninstall(base_dir, destinations, design_mode, report)
+    with report.span("post-uninstall"):
+        _run_post_uninstall_actions(base_dir, design_mode)
+
+    common.EVENTS.uninstaller.info("[FINAL] Uninstall completed.")
+    if not design_mode:
         print("Ready")
     return 0
 
 
+def run_uninstall(
+    base_dir: Path,
+    destinations: dict[str, Path],
+    design_mode: bool,
+    report: run_report.RunReport | None = None,
+) -> list[uninstall_plan.OperationResult]:
+    """Remove the payload in `base_dir` and forget its install state."""
+    report = report or run_report.RunReport("uninstall")
+    with report.span("plan"):
+        plan = uninstall_plan.build_uninstall_plan(base_dir, destinations)
+    report.count("ops.delete", len(plan.deletes))
+    report.count("ops.mru-cleanup", len(plan.mru_cleanups))
+    with report.span("close-apps"):
+        common.close_office_apps(design_mode, targets=[op.target for op in plan.deletes if op.present])
+    with report.span("execute"):
+        results = uninstall_plan.execute_uninstall_plan(plan, design_mode)
+    for result in results:
+        report.add_file(result.target, "", f"{result.kind}-{result.outcome}", result.duration)
+    with report.span("discard-state"):
+        install_state.InstallState.for_payload(base_dir).discard()
+    return results
+
+
+def _write_report(report: run_report.RunReport, path: str, design_mode: bool) -> None:
+    try:
+        report.write(path)
+    except OSError as exc:
+        common.EVENTS.uninstaller.warning("[WARN] Could not write run report (%s)", exc)
+        if not design_mode:
+            print(f"[WARN] Could not write run report ({exc})")
+
+
+def _write_metrics(report: run_report.RunReport, path: Path, exit_code: int, design_mode: bool) -> None:
+    metrics.METRICS.record_report(report)
+    metrics.METRICS.finish_run(report.command, report.duration, exit_code)
+    try:
+        metrics.METRICS.write(path)
+    except OSError as exc:
+        common.EVENTS.uninstaller.warning("[WARN] Could not write metrics (%s)", exc)
+        if not design_mode:
+            print(f"[WARN] Could not write metrics ({exc})")
+
+
 def _print_intro(base_dir: Path, design_mode: bool) -> None:
-    if design_mode and common.DESIGN_LOG_UNINSTALLER:
-        logging.getLogger(__name__).info("[DEBUG] Design mode enabled=true")
-        logging.getLogger(__name__).info("[INFO] Base folder: %s", base_dir)
-    else:
+    common.EVENTS.uninstaller.info("[DEBUG] Design mode enabled=true")
+    common.EVENTS.uninstaller.info("[INFO] Base folder: %s", base_dir)
+    if not common.EVENTS.uninstaller.console:
         print("Removing custom templates and restoring the Microsoft Office default settings...")
 
 
@@ -89,12 +167,8 @@ def _run_post_uninstall_actions(base_dir: Path, design_mode: bool) -> None:
         office_files_copy_allowed_destinations.run_actions(base_dir, design_mode)
         office_files_copy_allowed_apps.run_actions(base_dir, design_mode)
     except OSError as exc:
-        if design_mode and common.DESIGN_LOG_UNINSTALLER:
-            logging.getLogger(__name__).warning(
-                "[WARN] Post-uninstall actions could not be executed (%s)",
-                exc,
-            )
-        elif not design_mode:
+        common.EVENTS.uninstaller.warning("[WARN] Post-uninstall actions could not be executed (%s)", exc)
+        if not design_mode:
             print(f"[WARN] Post-uninstall actions could not be executed ({exc})")
 
 
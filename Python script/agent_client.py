@@ -0,0 +1,113 @@
+"""Thin client for the resident template agent.
+
+Only the standard library is imported here so a BAT entry point pays for one
+interpreter start and a round trip, not for path resolution or template
+parsing. Exit code 3 means the agent is not running; callers can then fall
+back to 01_installer.py / 02_uninstaller.py.
+
+Run: py agent_client.py install --sync
+     py agent_client.py check-author "C:\\Templates\\Blank.potx"
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection
+from pathlib import Path
+from typing import Any
+
+EXIT_AGENT_UNAVAILABLE = 3
+AGENT_PIPE_NAME = "TemplateAgent"
+
+
+class AgentUnavailable(OSError):
+    """The agent is not listening or rejected the handshake."""
+
+
+def state_dir() -> Path:
+    """Same default as common.INSTALLER_STATE_DIR, without importing common."""
+    override = os.environ.get("TemplateInstallerStateDir")
+    if override:
+        return Path(override.strip().rstrip("\\/"))
+    appdata = os.environ.get("APPDATA") or str(Path.home() / "AppData" / "Roaming")
+    return Path(appdata.strip().rstrip("\\/")) / "TemplateInstaller"
+
+
+def agent_address() -> str:
+    override = os.environ.get("TemplateAgentAddress")
+    if override:
+        return override
+    if os.name == "nt":
+        user = os.environ.get("USERNAME", "user")
+        return rf"\\.\pipe\{AGENT_PIPE_NAME}-{user}"
+    return str(state_dir() / "agent.sock")
+
+
+def key_path() -> Path:
+    return state_dir() / "agent.key"
+
+
+def connect() -> Connection:
+    try:
+        return Client(agent_address(), authkey=key_path().read_bytes())
+    except (OSError, EOFError, AuthenticationError) as exc:
+        raise AgentUnavailable(str(exc)) from exc
+
+
+def request(job: str, **params: Any) -> dict[str, Any]:
+    """Send one job and return the agent's reply ({"ok", "result", "error", "elapsed"})."""
+    with connect() as conn:
+        conn.send({"job": job, "params": params})
+        try:
+            return conn.recv()
+        except EOFError as exc:
+            raise AgentUnavailable("agent closed the connection") from exc
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Send a job to the resident template agent.")
+    sub = parser.add_subparsers(dest="job", required=True)
+    for name in ("install", "uninstall", "list", "repair-mru"):
+        job = sub.add_parser(name)
+        job.add_argument("--base-dir", default=os.getcwd(), help="Payload folder (defaults to the current folder).")
+        if name == "install":
+            job.add_argument("--allowed-authors", help="Semicolon-separated list of allowed authors.")
+            job.add_argument("--sync", action="store_true")
+            job.add_argument("--fresh", action="store_true")
+    check = sub.add_parser("check-author")
+    check.add_argument("path")
+    check.add_argument("--allowed-authors", help="Semicolon-separated list of allowed authors.")
+    sub.add_parser("ping")
+    sub.add_parser("refresh")
+    sub.add_parser("shutdown")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    params = {key: value for key, value in vars(args).items() if key != "job" and value is not None}
+    if "base_dir" in params:
+        params["base_dir"] = os.path.abspath(params["base_dir"])
+    if "path" in params:
+        params["path"] = os.path.abspath(params["path"])
+    try:
+        reply = request(args.job, **params)
+    except AgentUnavailable as exc:
+        print(f"[WARN] Template agent is not available ({exc})", file=sys.stderr)
+        return EXIT_AGENT_UNAVAILABLE
+    if not reply.get("ok"):
+        print(f"[ERROR] {reply.get('error')}", file=sys.stderr)
+        return 1
+    result = reply.get("result")
+    if args.job == "check-author":
+        print("TRUE" if result["allowed"] else "FALSE")
+        return 0 if result["allowed"] else 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+"""asyncio install pipeline: scan -> validate -> copy -> MRU.
+
+Each stage runs its blocking work (source lookups on the payload share, ZIP
+parsing, file copies, registry writes) on its own executor and hands results
+to the next stage through a bounded queue, so a slow SMB read, a slow author
+check and a slow copy overlap instead of adding up, and at most QUEUE_SIZE
+jobs wait between two stages. The stages are copy_executor's own steps:
+the scanner runs _scan_job (destination, missing source, resume), the
+validators _validate_job (check_template_author), the copiers _copy_checked
+(create_backup, ensure_parents_and_copy / stream_to_destination), and the
+last stage is the same single writer (_apply_outcome) that logs, records the
+InstallReport entry and writes the MRU list.
+
+Jobs come from the same list the threaded path uses (install_plan items or
+copy_executor.collect_copy_jobs). Like execute_copy_jobs, the writer applies
+outcomes in job order; a job that finishes early waits for the ones before
+it, and at most 3 * QUEUE_SIZE jobs are between the scanner and the writer.
+Enable it for plan installs with TemplateAsyncPipeline=true.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Iterable, Optional
+
+import common
+import copy_executor
+from copy_executor import CopyJob, CopyOutcome, StepJournal
+
+ASYNC_PIPELINE_ENABLED = os.environ.get("TemplateAsyncPipeline", "false").lower() == "true"
+DEFAULT_VALIDATE_WORKERS = max(1, int(os.environ.get("TemplateValidateWorkers", "4") or 1))
+QUEUE_SIZE = max(1, int(os.environ.get("TemplatePipelineQueueSize", "32") or 1))
+
+
+def execute_pipeline(
+    jobs: Iterable[CopyJob],
+    results: common.InstallReport,
+    allowed_authors: Iterable[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    copy_workers: int = copy_executor.DEFAULT_COPY_WORKERS,
+    validate_workers: int = DEFAULT_VALIDATE_WORKERS,
+    journal: StepJournal | None = None,
+    author_results: dict[Path, common.AuthorCheckResult] | None = None,
+    queue_size: int = QUEUE_SIZE,
+) -> list[CopyOutcome]:
+    """Synchronous entry point with execute_copy_jobs' arguments; runs its own event loop."""
+    return asyncio.run(
+        run_pipeline(
+            jobs,
+            results,
+            allowed_authors,
+            validation_enabled,
+            design_mode,
+            copy_workers=copy_workers,
+            validate_workers=validate_workers,
+            journal=journal,
+            author_results=author_results,
+            queue_size=queue_size,
+        )
+    )
+
+
+async def run_pipeline(
+    jobs: Iterable[CopyJob],
+    results: common.InstallReport,
+    allowed_authors: Iterable[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    copy_workers: int = copy_executor.DEFAULT_COPY_WORKERS,
+    validate_workers: int = DEFAULT_VALIDATE_WORKERS,
+    journal: StepJournal | None = None,
+    author_results: dict[Path, common.AuthorCheckResult] | None = None,
+    queue_size: int = QUEUE_SIZE,
+) -> list[CopyOutcome]:
+    loop = asyncio.get_running_loop()
+    jobs = list(jobs)
+    allowed_authors = list(allowed_authors)
+    validate_queue: asyncio.Queue[Optional[tuple[int, CopyOutcome]]] = asyncio.Queue(queue_size)
+    copy_queue: asyncio.Queue[Optional[tuple[int, CopyOutcome]]] = asyncio.Queue(queue_size)
+    mru_queue: asyncio.Queue[Optional[tuple[int, CopyOutcome]]] = asyncio.Queue(queue_size)
+    # Slots for jobs between the scanner and the writer; bounds the reorder buffer.
+    window = asyncio.Semaphore(3 * queue_size)
+    outcomes: list[CopyOutcome] = []
+
+    scan_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-scan")
+    validate_pool = ThreadPoolExecutor(max_workers=validate_workers, thread_name_prefix="pipeline-validate")
+    copy_pool = ThreadPoolExecutor(max_workers=copy_workers, thread_name_prefix="pipeline-copy")
+    # One thread: MRU lists and the InstallReport are only ever written by this stage.
+    mru_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-mru")
+
+    async def scan() -> None:
+        for index, job in enumerate(jobs):
+            await window.acquire()
+            outcome = CopyOutcome(job)
+            started = time.perf_counter()
+            needs_check = await loop.run_in_executor(scan_pool, copy_executor._scan_job, outcome)
+            outcome.duration += time.perf_counter() - started
+            await (validate_queue if needs_check else mru_queue).put((index, outcome))
+        for _ in range(validate_workers):
+            await validate_queue.put(None)
+
+    async def validate() -> None:
+        while (item := await validate_queue.get()) is not None:
+            outcome = item[1]
+            started = time.perf_counter()
+            needs_copy = await loop.run_in_executor(
+                validate_pool,
+                copy_executor._validate_job,
+                outcome,
+                allowed_authors,
+                validation_enabled,
+                design_mode,
+                author_results,
+            )
+            outcome.duration += time.perf_counter() - started
+            await (copy_queue if needs_copy else mru_queue).put(item)
+
+    async def copy() -> None:
+        while (item := await copy_queue.get()) is not None:
+            outcome = item[1]
+            started = time.perf_counter()
+            await loop.run_in_executor(copy_pool, copy_executor._copy_checked, outcome, journal)
+            outcome.duration += time.perf_counter() - started
+            await mru_queue.put(item)
+
+    async def write() -> None:
+        finished: dict[int, CopyOutcome] = {}
+        while (item := await mru_queue.get()) is not None:
+            finished[item[0]] = item[1]
+            while len(outcomes) in finished:
+                outcome = finished.pop(len(outcomes))
+                await loop.run_in_executor(mru_pool, copy_executor._apply_outcome, outcome, results, design_mode, journal)
+                outcomes.append(outcome)
+                window.release()
+
+    async def drive() -> None:
+        await scan()
+        await asyncio.gather(*validators)
+        for _ in range(copy_workers):
+            await copy_queue.put(None)
+        await asyncio.gather(*copiers)
+        await mru_queue.put(None)
+        await writer
+
+    writer = asyncio.create_task(write())
+    copiers = [asyncio.create_task(copy()) for _ in range(copy_workers)]
+    validators = [asyncio.create_task(validate()) for _ in range(validate_workers)]
+    try:
+        await _supervise(drive(), [writer, *copiers, *validators])
+    finally:
+        for pool in (scan_pool, validate_pool, copy_pool, mru_pool):
+            pool.shutdown(wait=True)
+    return outcomes
+
+
+async def _supervise(main: Awaitable[None], workers: list[asyncio.Task[None]]) -> None:
+    """Await `main`; if any stage fails, cancel the rest so no stage waits on a full queue forever."""
+    driver = asyncio.ensure_future(main)
+    pending: set[asyncio.Future[None]] = {driver, *workers}
+    try:
+        while not driver.done():
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()  # type: ignore[misc]
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
@@ -0,0 +1,254 @@
+"""Compliance audit for large template libraries.
+
+Walks a folder tree (e.g. the corporate template share), checks every
+template's author in parallel and streams one record per file as JSONL or
+CSV. Only a bounded window of files is in flight at a time, and duplicates
+are tracked by content hash, so memory does not grow with the per-file
+records. A JSON summary with counts and duplicate groups is written at the end.
+
+Run: py audit.py "\\\\server\\Templates" --format csv --output audit.csv --summary audit.json
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO
+
+import author_validation
+
+DEFAULT_AUDIT_WORKERS = max(1, int(os.environ.get("TemplateAuditWorkers", "16") or 1))
+MACRO_EXTENSIONS = {".dotm", ".potm", ".xltm"}
+# Office owner files and staged copies that can sit next to templates on a share.
+SKIPPED_PREFIXES = ("~$", "~tmp-")
+_HASH_CHUNK = 1024 * 1024
+
+FIELDS = (
+    "path",
+    "name",
+    "extension",
+    "size",
+    "author",
+    "allowed",
+    "macro_enabled",
+    "sha256",
+    "duplicate_of",
+    "error",
+)
+
+
+@dataclass
+class AuditRecord:
+    path: str
+    name: str
+    extension: str
+    size: int = 0
+    author: str = ""
+    allowed: bool = False
+    macro_enabled: bool = False
+    sha256: str = ""
+    duplicate_of: str = ""
+    error: str = ""
+
+
+@dataclass
+class AuditSummary:
+    root: str
+    files: int = 0
+    bytes: int = 0
+    allowed: int = 0
+    blocked: int = 0
+    no_author: int = 0
+    errors: int = 0
+    macro_enabled: int = 0
+    by_extension: dict[str, int] = field(default_factory=dict)
+    by_author: dict[str, int] = field(default_factory=dict)
+    duplicate_groups: list[list[str]] = field(default_factory=list)
+
+    def add(self, record: AuditRecord) -> None:
+        self.files += 1
+        self.bytes += record.size
+        self.by_extension[record.extension] = self.by_extension.get(record.extension, 0) + 1
+        if record.error:
+            self.errors += 1
+        elif record.allowed:
+            self.allowed += 1
+        else:
+            self.blocked += 1
+        if not record.author and not record.error and record.extension != ".thmx":
+            self.no_author += 1
+        if record.author:
+            self.by_author[record.author] = self.by_author.get(record.author, 0) + 1
+        if record.macro_enabled:
+            self.macro_enabled += 1
+
+
+class DuplicateTracker:
+    """First path per content hash; full groups are kept only for hashes seen twice."""
+
+    def __init__(self) -> None:
+        self._first: dict[str, str] = {}
+        self._groups: dict[str, list[str]] = {}
+
+    def add(self, record: AuditRecord) -> None:
+        if not record.sha256:
+            return
+        first = self._first.setdefault(record.sha256, record.path)
+        if first == record.path:
+            return
+        record.duplicate_of = first
+        self._groups.setdefault(record.sha256, [first]).append(record.path)
+
+    def groups(self) -> list[list[str]]:
+        return sorted(self._groups.values(), key=len, reverse=True)
+
+
+def iter_templates(root: Path) -> Iterator[Path]:
+    """Yield template files under `root`, depth first, without building a full listing."""
+    pending = [str(root)]
+    while pending:
+        folder = pending.pop()
+        try:
+            with os.scandir(folder) as entries:
+                children = sorted(entries, key=lambda entry: entry.name.lower())
+        except OSError:
+            continue
+        subfolders = []
+        for entry in children:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subfolders.append(entry.path)
+                    continue
+            except OSError:
+                continue
+            if entry.name.startswith(SKIPPED_PREFIXES):
+                continue
+            if os.path.splitext(entry.name)[1].lower() in author_validation.SUPPORTED_TEMPLATE_EXTENSIONS:
+                yield Path(entry.path)
+        pending.extend(reversed(subfolders))
+
+
+def audit_file(path: Path, allowed_authors: list[str], validation_enabled: bool) -> AuditRecord:
+    extension = path.suffix.lower()
+    record = AuditRecord(str(path), path.name, extension, macro_enabled=extension in MACRO_EXTENSIONS)
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+                digest.update(chunk)
+                record.size += len(chunk)
+        record.sha256 = digest.hexdigest()
+    except OSError as exc:
+        record.error = str(exc)
+        return record
+    # Every file is read once; caching would keep an entry per file of the share.
+    author, error = author_validation.read_template_author(path, cached=False)
+    record.author = author or ""
+    if error and not error.startswith("[WARN]"):
+        record.error = error
+        return record
+    result = author_validation.evaluate_authors(path, [author] if author else [], allowed_authors, validation_enabled)
+    record.allowed = result.allowed
+    return record
+
+
+def audit_tree(
+    root: Path,
+    allowed_authors: Iterable[str],
+    validation_enabled: bool = True,
+    max_workers: int = DEFAULT_AUDIT_WORKERS,
+) -> Iterator[AuditRecord]:
+    """Yield records in walk order with at most a few batches of files in flight."""
+    allowed_authors = list(allowed_authors)
+    window = max_workers * 4
+    in_flight: deque[Future[AuditRecord]] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for path in iter_templates(root):
+            in_flight.append(pool.submit(audit_file, path, allowed_authors, validation_enabled))
+            if len(in_flight) >= window:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+class RecordWriter:
+    def __init__(self, stream: TextIO, output_format: str) -> None:
+        self.stream = stream
+        self.csv: Optional[csv.DictWriter] = None
+        if output_format == "csv":
+            self.csv = csv.DictWriter(stream, fieldnames=FIELDS)
+            self.csv.writeheader()
+
+    def write(self, record: AuditRecord) -> None:
+        if self.csv is not None:
+            self.csv.writerow(asdict(record))
+        else:
+            self.stream.write(json.dumps(asdict(record)) + "\n")
+
+
+def run_audit(
+    root: Path,
+    stream: TextIO,
+    output_format: str,
+    allowed_authors: Iterable[str],
+    validation_enabled: bool = True,
+    max_workers: int = DEFAULT_AUDIT_WORKERS,
+) -> AuditSummary:
+    summary = AuditSummary(str(root))
+    duplicates = DuplicateTracker()
+    writer = RecordWriter(stream, output_format)
+    for record in audit_tree(root, allowed_authors, validation_enabled, max_workers):
+        duplicates.add(record)
+        summary.add(record)
+        writer.write(record)
+    summary.duplicate_groups = duplicates.groups()
+    return summary
+
+
+def _resolve_allowed_authors(cli_value: str | None) -> list[str]:
+    raw = cli_value or os.environ.get("AllowedTemplateAuthors")
+    if not raw:
+        return author_validation.DEFAULT_ALLOWED_TEMPLATE_AUTHORS
+    return [author.strip() for author in raw.split(";") if author.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Audit a template library for author compliance.")
+    parser.add_argument("root", nargs="?", default=".", help="Folder to walk (defaults to the current folder).")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--output", help="Per-file records (defaults to stdout).")
+    parser.add_argument("--summary", help="Write the JSON summary here (defaults to stderr).")
+    parser.add_argument("--allowed-authors", help="Semicolon-separated list of allowed authors.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_AUDIT_WORKERS)
+    args = parser.parse_args(argv)
+
+    root = author_validation.normalize_path(args.root)
+    if not root.is_dir():
+        print(f"[ERROR] Folder not found: {root}", file=sys.stderr)
+        return 1
+    allowed = _resolve_allowed_authors(args.allowed_authors)
+    validation_enabled = author_validation.AUTHOR_VALIDATION_ENABLED
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as stream:
+            summary = run_audit(root, stream, args.format, allowed, validation_enabled, max(1, args.workers))
+    else:
+        summary = run_audit(root, sys.stdout, args.format, allowed, validation_enabled, max(1, args.workers))
+
+    report = json.dumps(asdict(summary), indent=2)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as handle:
+            handle.write(report)
+    else:
+        print(report, file=sys.stderr)
+    return 1 if summary.blocked or summary.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
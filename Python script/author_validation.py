@@ -3,10 +3,11 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Iterable, Iterator, List, Optional
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional
 import xml.etree.ElementTree as ET
 
 
@@ -26,6 +27,11 @@ SUPPORTED_TEMPLATE_EXTENSIONS = {
 }
 
 AUTHOR_VALIDATION_ENABLED = os.environ.get("AuthorValidationEnabled", "TRUE").lower() != "false"
+AUTHOR_CACHE_ENABLED = os.environ.get("AuthorCacheEnabled", "true").lower() != "false"
+
+# normcase(path) -> (size, mtime_ns, author, error); a changed file misses the cache.
+_author_cache: dict[str, tuple[int, int, Optional[str], Optional[str]]] = {}
+_author_cache_lock = threading.Lock()
 
 
 def normalize_path(path: Path | str | None) -> Path:
@@ -103,14 +109,46 @@ def check_template_author(
     author, error = _extract_author(target)
     if error:
         return AuthorCheckResult(False, error, [], error=True)
-    if not author:
-        return AuthorCheckResult(False, f"[WARN] File \"{target}\" has no assigned author.", [])
+    return evaluate_authors(target, [author] if author else [], allowed)
+
 
+def evaluate_authors(
+    target: Path,
+    authors: list[str],
+    allowed_authors: Iterable[str] | None = None,
+    validation_enabled: bool = True,
+) -> AuthorCheckResult:
+    """Apply the author policy to authors that were already read (e.g. from a bundle member)."""
+    if not validation_enabled:
+        return AuthorCheckResult(True, "[INFO] Author validation is disabled.", [])
+    if target.suffix.lower() == ".thmx":
+        return AuthorCheckResult(True, "[INFO] Author validation skipped for themes.", [])
+    if not authors:
+        return AuthorCheckResult(False, f"[WARN] File \"{target}\" has no assigned author.", [])
+    allowed = _normalize_allowed_authors(allowed_authors or DEFAULT_ALLOWED_TEMPLATE_AUTHORS)
+    author = authors[0]
     is_allowed = any(author.lower() == a.lower() for a in allowed)
     message = "[OK] Author approved." if is_allowed else f"[BLOCKED] Author not allowed for \"{target}\"."
     return AuthorCheckResult(is_allowed, message, [author])
 
 
+def read_template_author(template_path: Path, cached: bool = True) -> tuple[Optional[str], Optional[str]]:
+    """Return (author, error) for one template, served from the author cache when possible.
+
+    One-pass callers (audits of whole shares) pass cached=False so the cache
+    does not grow by one entry per file they see.
+    """
+    template_path = normalize_path(template_path)
+    if not cached:
+        return _read_author(template_path, template_path.name)
+    return _extract_author(template_path)
+
+
+def read_stream_author(stream: BinaryIO, name: str) -> tuple[Optional[str], Optional[str]]:
+    """Return (author, error) for a template read from a seekable stream (e.g. a bundle member)."""
+    return _read_author(stream, name)
+
+
 def _normalize_allowed_authors(authors: Iterable[str]) -> list[str]:
     normalized: list[str] = []
     for author in authors:
@@ -120,22 +158,43 @@ def _normalize_allowed_authors(authors: Iterable[str]) -> list[str]:
     return normalized
 
 
+def clear_author_cache() -> None:
+    with _author_cache_lock:
+        _author_cache.clear()
+
+
 def _extract_author(template_path: Path) -> tuple[Optional[str], Optional[str]]:
-    if not template_path.exists():
+    """Read the creator from core.xml, reusing the result while size and mtime match."""
+    try:
+        stat = os.stat(template_path)
+    except OSError:
         return None, f"[ERROR] Path not found: \"{template_path}\""
-
+    if not AUTHOR_CACHE_ENABLED:
+        return _read_author(template_path, template_path.name)
+    key = os.path.normcase(str(template_path))
+    with _author_cache_lock:
+        cached = _author_cache.get(key)
+    if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2], cached[3]
+    author, error = _read_author(template_path, template_path.name)
+    with _author_cache_lock:
+        _author_cache[key] = (stat.st_size, stat.st_mtime_ns, author, error)
+    return author, error
+
+
+def _read_author(source: Path | BinaryIO, name: str) -> tuple[Optional[str], Optional[str]]:
     try:
-        with zipfile.ZipFile(template_path) as zipped:
+        with zipfile.ZipFile(source) as zipped:
             try:
                 with zipped.open("docProps/core.xml") as core_file:
                     tree = ET.fromstring(core_file.read())
             except KeyError:
-                return None, f"[WARN] Could not read author for \"{template_path.name}\" (core.xml missing)."
+                return None, f"[WARN] Could not read author for \"{name}\" (core.xml missing)."
     except Exception as exc:  # noqa: BLE001
-        return None, f"[ERROR] {template_path.name}: {exc}"
+        return None, f"[ERROR] {name}: {exc}"
 
     for candidate in ("{http://purl.org/dc/elements/1.1/}creator", "creator"):
         node = tree.find(candidate)
         if node is not None and node.text:
             return node.text.strip(), None
-    return None, f"[WARN] \"{template_path.name}\" has no author defined."
+    return None, f"[WARN] \"{name}\" has no author defined."
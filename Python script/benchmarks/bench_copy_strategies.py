@@ -0,0 +1,99 @@
+"""Compare copy strategies on large .potx files.
+
+Run: py benchmarks/bench_copy_strategies.py --size-mb 64 --files 4 --dir D:\\scratch
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+import copy_strategies  # noqa: E402
+
+SAMPLE_TEMPLATE = Path(__file__).resolve().parents[2] / "Test" / "The blank presentation - By www.grada.cc.potx"
+
+
+def build_large_potx(path: Path, size_mb: int, seed: int) -> None:
+    """Clone the sample presentation and pad it with an incompressible media part."""
+    rng = random.Random(seed)
+    with zipfile.ZipFile(SAMPLE_TEMPLATE) as sample, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+        for info in sample.infolist():
+            target.writestr(info, sample.read(info.filename))
+        target.writestr(
+            zipfile.ZipInfo("ppt/media/image_bench.bin"),
+            rng.randbytes(size_mb * 1024 * 1024),
+            compress_type=zipfile.ZIP_STORED,
+        )
+
+
+def run(size_mb: int, files: int, repeat: int, work_dir: Path, seed: int) -> dict[str, object]:
+    sources = []
+    for index in range(files):
+        source = work_dir / f"Large presentation {index}.potx"
+        build_large_potx(source, size_mb, seed + index)
+        sources.append(source)
+    total_bytes = sum(source.stat().st_size for source in sources)
+
+    results: dict[str, object] = {}
+    for strategy in (*copy_strategies.STRATEGY_ORDER, copy_strategies.STRATEGY_HARDLINK):
+        timings: list[float] = []
+        error = ""
+        for attempt in range(repeat):
+            out_dir = work_dir / f"{strategy}-{attempt}"
+            out_dir.mkdir()
+            started = time.perf_counter()
+            try:
+                for source in sources:
+                    destination = out_dir / source.name
+                    if strategy == copy_strategies.STRATEGY_HARDLINK:
+                        copy_strategies.link_or_copy(source, destination)
+                    else:
+                        copy_strategies.copy_file(source, destination, strategy)
+            except OSError as exc:
+                error = str(exc)
+                break
+            timings.append(time.perf_counter() - started)
+        if error:
+            results[strategy] = {"supported": False, "error": error}
+            continue
+        median = statistics.median(timings)
+        results[strategy] = {
+            "supported": True,
+            "median_seconds": round(median, 6),
+            "min_seconds": round(min(timings), 6),
+            "mb_per_second": round(total_bytes / 1024 / 1024 / median, 1) if median else None,
+        }
+    return {
+        "scenario": "copy_strategies",
+        "files": files,
+        "bytes": total_bytes,
+        "repeat": repeat,
+        "platform": sys.platform,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark copy strategies on large .potx files.")
+    parser.add_argument("--size-mb", type=int, default=64, help="Media payload per file in MiB.")
+    parser.add_argument("--files", type=int, default=4, help="Number of .potx files.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per strategy.")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the media payload.")
+    parser.add_argument("--dir", help="Folder on the volume to test (defaults to a temp folder).")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as work_dir:
+        report = run(args.size_mb, args.files, args.repeat, Path(work_dir), args.seed)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,339 @@
+"""Benchmark suite for the installer hot paths at 10, 1k and 50k templates.
+
+Scenarios:
+  scan       iter_template_files and office_files.iter_office_files
+  author     check_template_author per file (cold cache) and on the folder
+  copy       install_template for base templates, copy_custom_templates, the
+             copy executor against the async_pipeline stages
+  mru        MRU writes and cleanup against benchmarks/fake_winreg
+  install    01_installer.run_install / 02_uninstaller.run_uninstall into temp roots
+
+The default corpus links (or copies) the small Test/ samples under new
+names; the multi-megabyte presentation samples are left out so the 50k copy
+scenarios stay around 1.5 GB. --corpus synthetic uses ooxml_generator with
+--seed instead, which adds macro, missing-author and corrupt files. Results are JSON so two commits can be compared with
+--baseline.
+
+Run: py benchmarks/bench_suite.py --sizes 10,1000 --output before.json
+     py benchmarks/bench_suite.py --sizes 10,1000 --baseline before.json
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(SCRIPT_DIR))
+os.environ.setdefault("IsDesignModeEnabled", "false")
+
+import async_pipeline  # noqa: E402
+import author_validation  # noqa: E402
+import common  # noqa: E402
+import copy_executor  # noqa: E402
+import fake_winreg  # noqa: E402
+import ooxml_generator  # noqa: E402
+import office_files  # noqa: E402
+import profiles  # noqa: E402
+
+SAMPLES_DIR = SCRIPT_DIR.parent / "Test"
+SCENARIOS = ("scan", "author", "copy", "mru", "install")
+DEFAULT_SIZES = (10, 1000, 50000)
+# Larger samples are skipped to keep big corpora cheap to copy.
+MAX_SAMPLE_BYTES = 100 * 1024
+MRU_WRITES = 200
+
+
+def build_corpus(target: Path, size: int, samples_dir: Path = SAMPLES_DIR) -> list[Path]:
+    """Fill `target` with `size` templates: the base samples once, then renamed custom samples."""
+    target.mkdir(parents=True, exist_ok=True)
+    samples = sorted(samples_dir.iterdir(), key=lambda path: path.name.lower())
+    base = [path for path in samples if path.name in common.BASE_TEMPLATE_NAMES]
+    custom = [
+        path
+        for path in samples
+        if path.name not in common.BASE_TEMPLATE_NAMES
+        and path.suffix.lower() in author_validation.SUPPORTED_TEMPLATE_EXTENSIONS
+        and path.stat().st_size <= MAX_SAMPLE_BYTES
+    ]
+    files: list[Path] = []
+    for sample in base[: min(len(base), size)]:
+        files.append(_link(sample, target / sample.name))
+    for index in range(size - len(files)):
+        sample = custom[index % len(custom)]
+        files.append(_link(sample, target / f"{sample.stem} {index:05d}{sample.suffix}"))
+    return files
+
+
+def build_synthetic_corpus(target: Path, size: int, seed: int) -> list[Path]:
+    """Fill `target` with `size` generated templates (5% macro, 1% corrupt)."""
+    config = ooxml_generator.GeneratorConfig(count=size, seed=seed, macro_ratio=0.05, corrupt_ratio=0.01)
+    return [target / record.name for record in ooxml_generator.generate(target, config, manifest=False)]
+
+
+def _link(source: Path, destination: Path) -> Path:
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+    return destination
+
+
+def _time(repeat: int, setup: Callable[[], None] | None, body: Callable[[], object]) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        body()
+        timings.append(time.perf_counter() - started)
+    return {"median_seconds": round(statistics.median(timings), 6), "min_seconds": round(min(timings), 6)}
+
+
+def _cold_cache() -> None:
+    author_validation.clear_author_cache()
+
+
+def scenario_scan(corpus: Path, work: Path, size: int, repeat: int) -> dict[str, dict[str, float]]:
+    return {
+        "iter_template_files": _time(repeat, None, lambda: sum(1 for _ in common.iter_template_files(corpus))),
+        "iter_office_files": _time(repeat, _cold_cache, lambda: office_files.iter_office_files(corpus)),
+    }
+
+
+def scenario_author(corpus: Path, work: Path, size: int, repeat: int) -> dict[str, dict[str, float]]:
+    files = list(common.iter_template_files(corpus))
+    allowed = common.DEFAULT_ALLOWED_TEMPLATE_AUTHORS
+
+    def per_file() -> None:
+        for file in files:
+            common.check_template_author(file, allowed_authors=allowed)
+
+    return {
+        "check_file_cold": _time(repeat, _cold_cache, per_file),
+        "check_file_warm": _time(repeat, None, per_file),
+        "check_folder": _time(repeat, _cold_cache, lambda: common.check_template_author(corpus, allowed)),
+    }
+
+
+def scenario_copy(corpus: Path, work: Path, size: int, repeat: int) -> dict[str, dict[str, float]]:
+    destinations = profiles.destinations_for_profile(work / "profile")
+    allowed = common.DEFAULT_ALLOWED_TEMPLATE_AUTHORS
+
+    def reset() -> None:
+        shutil.rmtree(work / "profile", ignore_errors=True)
+        common.DIRECTORIES.reset()
+        _cold_cache()
+
+    def base() -> None:
+        results = common.InstallReport()
+        for app_label, filename, root in common.base_template_targets(destinations):
+            if (corpus / filename).exists():
+                common.install_template(app_label, filename, corpus, root, destinations, results, allowed, True, False)
+
+    def custom() -> None:
+        common.copy_custom_templates(corpus, destinations, common.InstallReport(), allowed, True, False)
+
+    def executor() -> None:
+        jobs = copy_executor.collect_copy_jobs(corpus, destinations)
+        copy_executor.execute_copy_jobs(jobs, common.InstallReport(), allowed, True, False)
+
+    def pipeline() -> None:
+        jobs = copy_executor.collect_copy_jobs(corpus, destinations)
+        async_pipeline.execute_pipeline(jobs, common.InstallReport(), allowed, True, False)
+
+    return {
+        "install_template": _time(repeat, reset, base),
+        "install_template_with_backup": _time(repeat, None, base),
+        "copy_custom_templates": _time(repeat, reset, custom),
+        "execute_copy_jobs": _time(repeat, reset, executor),
+        "async_pipeline": _time(repeat, reset, pipeline),
+    }
+
+
+def scenario_mru(corpus: Path, work: Path, size: int, repeat: int) -> dict[str, dict[str, float]]:
+    targets = [work / "profile" / file.name for file in common.iter_template_files(corpus)]
+    targets = [path for path in targets if common._should_update_mru(path)]
+    writes = targets[:MRU_WRITES]
+    registry = fake_winreg.FakeRegistry()
+
+    def write() -> None:
+        for path in writes:
+            common._update_mru_if_applicable(path, False)
+
+    def cleanup() -> None:
+        for app_label in ("WORD", "POWERPOINT", "EXCEL"):
+            common._clear_mru_for_app(app_label, {str(path) for path in targets}, False)
+
+    with fake_winreg.installed(common, registry):
+        results = {
+            "update_mru": _time(repeat, None, write),
+            "clear_mru": _time(repeat, write, cleanup),
+        }
+    results["registry_calls"] = dict(sorted(registry.calls.items()))  # type: ignore[assignment]
+    return results
+
+
+def scenario_install(corpus: Path, work: Path, size: int, repeat: int) -> dict[str, dict[str, float]]:
+    installer = importlib.import_module("01_installer")
+    uninstaller = importlib.import_module("02_uninstaller")
+    destinations = profiles.destinations_for_profile(work / "profile")
+    allowed = common.DEFAULT_ALLOWED_TEMPLATE_AUTHORS
+    state_dir = work / "state"
+    previous_state = common.INSTALLER_STATE_DIR
+
+    def reset() -> None:
+        shutil.rmtree(work / "profile", ignore_errors=True)
+        shutil.rmtree(state_dir, ignore_errors=True)
+        common.DIRECTORIES.reset()
+        _cold_cache()
+
+    def install() -> None:
+        installer.run_install(corpus, destinations, allowed, True, False)
+
+    def uninstall() -> None:
+        uninstaller.run_uninstall(corpus, destinations, False)
+
+    common.INSTALLER_STATE_DIR = state_dir
+    try:
+        with fake_winreg.installed(common):
+            return {
+                "install": _time(repeat, reset, install),
+                "sync_unchanged": _time(repeat, None, lambda: installer.run_install(
+                    corpus, destinations, allowed, True, False, sync=True
+                )),
+                "uninstall": _time(repeat, install, uninstall),
+            }
+    finally:
+        common.INSTALLER_STATE_DIR = previous_state
+
+
+RUNNERS = {
+    "scan": scenario_scan,
+    "author": scenario_author,
+    "copy": scenario_copy,
+    "mru": scenario_mru,
+    "install": scenario_install,
+}
+
+
+def run(
+    scenarios: list[str],
+    sizes: list[int],
+    repeat: int,
+    work_root: Path | None,
+    corpus_kind: str = "samples",
+    seed: int = 0,
+) -> dict[str, object]:
+    results: list[dict[str, object]] = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(dir=work_root) as temp:
+            if corpus_kind == "synthetic":
+                corpus = build_synthetic_corpus(Path(temp) / "corpus", size, seed)
+            else:
+                corpus = build_corpus(Path(temp) / "corpus", size)
+            for scenario in scenarios:
+                work = Path(temp) / scenario
+                work.mkdir()
+                started = time.perf_counter()
+                measurements = RUNNERS[scenario](Path(temp) / "corpus", work, len(corpus), repeat)
+                for measurement in measurements.values():
+                    if "median_seconds" in measurement:
+                        measurement["per_file_us"] = round(measurement["median_seconds"] / len(corpus) * 1e6, 2)
+                results.append(
+                    {
+                        "scenario": scenario,
+                        "size": size,
+                        "elapsed_seconds": round(time.perf_counter() - started, 3),
+                        "measurements": measurements,
+                    }
+                )
+                print(f"[BENCH] {scenario} @ {size}: done", file=sys.stderr)
+    return {
+        "suite": "installer",
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "repeat": repeat,
+        "corpus": corpus_kind if corpus_kind != "synthetic" else f"synthetic:{seed}",
+        "results": results,
+    }
+
+
+def compare(current: dict[str, object], baseline: dict[str, object]) -> list[str]:
+    """Lines of `baseline median / current median` per measurement (>1 means faster now)."""
+    def index(report: dict[str, object]) -> dict[tuple[str, int, str], float]:
+        values = {}
+        for result in report["results"]:  # type: ignore[index]
+            for name, measurement in result["measurements"].items():
+                if isinstance(measurement, dict) and "median_seconds" in measurement:
+                    values[(result["scenario"], result["size"], name)] = measurement["median_seconds"]
+        return values
+
+    old, new = index(baseline), index(current)
+    lines = []
+    for key in sorted(new):
+        if key in old and new[key]:
+            lines.append(f"{key[0]:<8} {key[1]:>6}  {key[2]:<30} {old[key] / new[key]:6.2f}x")
+    return lines
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the installer hot paths.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of scenarios.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="Comma-separated corpus sizes.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus", choices=("samples", "synthetic"), default="samples")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --corpus synthetic.")
+    parser.add_argument("--dir", help="Folder for corpora and temp roots (defaults to a temp folder).")
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout.")
+    parser.add_argument("--baseline", help="Earlier results to compare against.")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in RUNNERS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report = run(
+        scenarios,
+        sizes,
+        max(1, args.repeat),
+        Path(args.dir) if args.dir else None,
+        args.corpus,
+        args.seed,
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            for line in compare(report, json.load(handle)):
+                print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+"""In-memory stand-in for the parts of ``winreg`` the MRU code uses.
+
+Values keep insertion order and ``EnumValue`` raises OSError past the end,
+like the real API, so the enumerate/delete loops in common behave the same.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Iterator
+
+HKEY_CURRENT_USER = "HKCU"
+KEY_READ = 0x20019
+KEY_ALL_ACCESS = 0xF003F
+REG_SZ = 1
+
+
+class FakeKey:
+    def __init__(self, registry: "FakeRegistry", path: str) -> None:
+        self.registry = registry
+        self.path = path
+        # Like PyHKEY.handle: non-zero while open, 0 once closed.
+        self.handle = 1
+
+    def __enter__(self) -> "FakeKey":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.Close()
+
+    def Close(self) -> None:  # noqa: N802 - winreg naming
+        self.handle = 0
+
+
+class FakeRegistry:
+    """One HKCU hive; keys are case-insensitive like the real registry."""
+
+    HKEY_CURRENT_USER = HKEY_CURRENT_USER
+    KEY_READ = KEY_READ
+    KEY_ALL_ACCESS = KEY_ALL_ACCESS
+    REG_SZ = REG_SZ
+
+    def __init__(self) -> None:
+        self.values: dict[str, dict[str, tuple[object, int]]] = {}
+        self.calls: dict[str, int] = {}
+
+    def _count(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    @staticmethod
+    def _normalize(hive: object, sub_key: str) -> str:
+        return f"{hive}\\{sub_key}".strip("\\").lower()
+
+    def OpenKey(self, hive: object, sub_key: str, reserved: int = 0, access: int = KEY_READ) -> FakeKey:  # noqa: N802
+        self._count("OpenKey")
+        path = self._normalize(hive, sub_key)
+        if path not in self.values:
+            raise FileNotFoundError(2, "The system cannot find the file specified", sub_key)
+        return FakeKey(self, path)
+
+    def CreateKeyEx(self, hive: object, sub_key: str, reserved: int = 0, access: int = KEY_ALL_ACCESS) -> FakeKey:  # noqa: N802
+        self._count("CreateKeyEx")
+        path = self._normalize(hive, sub_key)
+        parts = path.split("\\")
+        for end in range(1, len(parts) + 1):
+            self.values.setdefault("\\".join(parts[:end]), {})
+        return FakeKey(self, path)
+
+    def CloseKey(self, key: FakeKey) -> None:  # noqa: N802
+        self._count("CloseKey")
+        key.Close()
+
+    def _subkeys(self, path: str) -> list[str]:
+        prefix = path + "\\"
+        return sorted({key[len(prefix):].split("\\", 1)[0] for key in self.values if key.startswith(prefix)})
+
+    def QueryInfoKey(self, key: FakeKey) -> tuple[int, int, int]:  # noqa: N802
+        self._count("QueryInfoKey")
+        return len(self._subkeys(key.path)), len(self.values[key.path]), 0
+
+    def EnumKey(self, key: FakeKey, index: int) -> str:  # noqa: N802
+        self._count("EnumKey")
+        subkeys = self._subkeys(key.path)
+        if index >= len(subkeys):
+            raise OSError(259, "No more data is available")
+        return subkeys[index]
+
+    def EnumValue(self, key: FakeKey, index: int) -> tuple[str, object, int]:  # noqa: N802
+        self._count("EnumValue")
+        items = list(self.values[key.path].items())
+        if index >= len(items):
+            raise OSError(259, "No more data is available")
+        name, (value, kind) = items[index]
+        return name, value, kind
+
+    def QueryValueEx(self, key: FakeKey, name: str) -> tuple[object, int]:  # noqa: N802
+        self._count("QueryValueEx")
+        try:
+            return self.values[key.path][name]
+        except KeyError:
+            raise FileNotFoundError(2, "The system cannot find the file specified", name) from None
+
+    def SetValueEx(self, key: FakeKey, name: str, reserved: int, kind: int, value: object) -> None:  # noqa: N802
+        self._count("SetValueEx")
+        self.values[key.path][name] = (value, kind)
+
+    def DeleteValue(self, key: FakeKey, name: str) -> None:  # noqa: N802
+        self._count("DeleteValue")
+        try:
+            del self.values[key.path][name]
+        except KeyError:
+            raise FileNotFoundError(2, "The system cannot find the file specified", name) from None
+
+
+@contextmanager
+def installed(common: ModuleType, registry: FakeRegistry | None = None) -> Iterator[FakeRegistry]:
+    """Point common's MRU code at a fake registry for the duration of the block."""
+    registry = registry or FakeRegistry()
+    saved = common.winreg, common.is_windows
+    common.winreg = registry
+    common.is_windows = lambda: True
+    try:
+        yield registry
+    finally:
+        common.winreg, common.is_windows = saved
@@ -0,0 +1,365 @@
+"""Seeded generator of synthetic Office templates for load tests.
+
+Builds valid OOXML packages (.dotx/.potx/.xltx/.thmx, or .dotm/.potm/.xltm
+when a macro part is added) with a configurable author mix, core.xml size,
+part count and media payload, plus corrupt variants. The same seed and
+settings always produce byte-identical files, so benchmark corpora and
+audit runs can be compared between commits.
+
+A manifest.jsonl next to the files records each file's author mode and the
+outcome check_template_author should report for it.
+
+Run: py benchmarks/ooxml_generator.py D:\\scratch\\corpus --count 50000 --seed 7
+     py benchmarks/ooxml_generator.py out --count 100 --authors allowed=6,missing=2,multi=2 --corrupt 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import sys
+import zipfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator
+from xml.sax.saxutils import escape
+
+ALLOWED_AUTHORS = ("www.grada.cc", "www.gradaz.com")
+UNAUTHORIZED_AUTHORS = ("Guillermo", "Ricardo Barrera", "Contoso Ltd")
+
+AUTHOR_MODES = ("allowed", "unauthorized", "multi", "missing", "empty", "no-core")
+CORRUPT_MODES = ("truncated", "not-zip", "bad-core-xml")
+
+OUTCOME_ALLOWED = "allowed"
+OUTCOME_BLOCKED = "blocked"
+OUTCOME_ERROR = "error"
+
+# Fixed timestamp for every member so output depends only on the seed.
+_ZIP_DATE = (2024, 1, 1, 0, 0, 0)
+
+_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+_CORE_REL = "http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties"
+_CUSTOM_XML_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/customXml"
+_IMAGE_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+_VBA_REL = "http://schemas.microsoft.com/office/2006/relationships/vbaProject"
+
+
+@dataclass(frozen=True)
+class Kind:
+    extension: str
+    macro_extension: str
+    main_part: str
+    content_type: str
+    macro_content_type: str
+    root_xml: str
+
+
+KINDS = {
+    "dotx": Kind(
+        ".dotx",
+        ".dotm",
+        "word/document.xml",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.template.main+xml",
+        "application/vnd.ms-word.template.macroEnabledTemplate.main+xml",
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        "<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>",
+    ),
+    "potx": Kind(
+        ".potx",
+        ".potm",
+        "ppt/presentation.xml",
+        "application/vnd.openxmlformats-officedocument.presentationml.template.main+xml",
+        "application/vnd.ms-powerpoint.template.macroEnabled.main+xml",
+        '<p:presentation xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+        '<p:sldSz cx="12192000" cy="6858000"/><p:notesSz cx="6858000" cy="9144000"/>'
+        "<!-- {text} --></p:presentation>",
+    ),
+    "xltx": Kind(
+        ".xltx",
+        ".xltm",
+        "xl/workbook.xml",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.template.main+xml",
+        "application/vnd.ms-excel.template.macroEnabled.main+xml",
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<sheets><sheet name="{text}" sheetId="1"/></sheets></workbook>',
+    ),
+    "thmx": Kind(
+        ".thmx",
+        ".thmx",
+        "theme/theme/theme1.xml",
+        "application/vnd.openxmlformats-officedocument.theme+xml",
+        "application/vnd.openxmlformats-officedocument.theme+xml",
+        '<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" name="{text}">'
+        "<a:themeElements/></a:theme>",
+    ),
+}
+
+
+@dataclass
+class GeneratorConfig:
+    count: int = 100
+    seed: int = 0
+    kinds: dict[str, float] = field(default_factory=lambda: {"dotx": 4, "potx": 3, "xltx": 3, "thmx": 1})
+    authors: dict[str, float] = field(
+        default_factory=lambda: {"allowed": 80, "unauthorized": 10, "multi": 4, "missing": 4, "empty": 1, "no-core": 1}
+    )
+    core_padding: int = 0
+    parts: int = 2
+    part_size: int = 2048
+    media_size: int = 0
+    macro_ratio: float = 0.0
+    corrupt_ratio: float = 0.0
+
+
+@dataclass
+class GeneratedFile:
+    name: str
+    kind: str
+    author_mode: str
+    author: str
+    corrupt: str
+    macro: bool
+    size: int
+    expected: str
+
+
+def expected_outcome(kind: str, author_mode: str, corrupt: str) -> str:
+    """Outcome check_template_author reports for a generated file with validation on.
+
+    Themes are never opened, so even a corrupt .thmx is allowed; a missing or
+    empty creator is reported as a read warning, not as a blocked author.
+    """
+    if kind == "thmx":
+        return OUTCOME_ALLOWED
+    if corrupt or author_mode in {"missing", "empty", "no-core"}:
+        return OUTCOME_ERROR
+    if author_mode == "allowed":
+        return OUTCOME_ALLOWED
+    return OUTCOME_BLOCKED
+
+
+def _pick(rng: random.Random, weights: dict[str, float]) -> str:
+    names = sorted(weights)
+    return rng.choices(names, weights=[weights[name] for name in names])[0]
+
+
+def _author_for(rng: random.Random, mode: str) -> str:
+    if mode == "allowed":
+        return rng.choice(ALLOWED_AUTHORS)
+    if mode == "unauthorized":
+        return rng.choice(UNAUTHORIZED_AUTHORS)
+    if mode == "multi":
+        return f"{rng.choice(ALLOWED_AUTHORS)}; {rng.choice(UNAUTHORIZED_AUTHORS)}"
+    return ""
+
+
+def _core_xml(rng: random.Random, mode: str, author: str, padding: int) -> str:
+    created = f"20{rng.randint(15, 25):02d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T08:00:00Z"
+    creator = ""
+    if mode == "empty":
+        creator = "<dc:creator></dc:creator>"
+    elif author:
+        creator = f"<dc:creator>{escape(author)}</dc:creator>"
+    description = escape(_filler(rng, padding)) if padding else ""
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+        '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        f"<dc:title>Synthetic template</dc:title>{creator}"
+        f"<dc:description>{description}</dc:description>"
+        f"<cp:lastModifiedBy>{escape(rng.choice(UNAUTHORIZED_AUTHORS))}</cp:lastModifiedBy>"
+        f'<dcterms:created xsi:type="dcterms:W3CDTF">{created}</dcterms:created>'
+        "</cp:coreProperties>"
+    )
+
+
+def _filler(rng: random.Random, size: int) -> str:
+    words = ("template", "layout", "corporate", "brand", "slide", "table", "heading", "footer")
+    text: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        text.append(word)
+        length += len(word) + 1
+    return " ".join(text)[:size]
+
+
+def _relationships(entries: list[tuple[str, str, str]]) -> str:
+    body = "".join(
+        f'<Relationship Id="{rel_id}" Type="{rel_type}" Target="{target}"/>' for rel_id, rel_type, target in entries
+    )
+    return f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n<Relationships xmlns="{_RELS_NS}">{body}</Relationships>'
+
+
+def build_package(rng: random.Random, kind_name: str, author_mode: str, macro: bool, config: GeneratorConfig) -> tuple[bytes, str]:
+    """Return (zip bytes, author) for one well-formed template package."""
+    kind = KINDS[kind_name]
+    author = _author_for(rng, author_mode)
+    main_dir = kind.main_part.rsplit("/", 1)[0]
+    main_name = kind.main_part.rsplit("/", 1)[1]
+    has_core = kind_name != "thmx" and author_mode != "no-core"
+
+    overrides = [(f"/{kind.main_part}", kind.macro_content_type if macro else kind.content_type)]
+    package_rels = [("rId1", _DOC_REL, kind.main_part)]
+    main_rels: list[tuple[str, str, str]] = []
+    members: list[tuple[str, bytes, int]] = []
+
+    members.append((kind.main_part, kind.root_xml.format(text=f"Synthetic {rng.randrange(10**6):06d}").encode(), zipfile.ZIP_DEFLATED))
+    if has_core:
+        overrides.append(("/docProps/core.xml", "application/vnd.openxmlformats-package.core-properties+xml"))
+        package_rels.append(("rId2", _CORE_REL, "docProps/core.xml"))
+        members.append(("docProps/core.xml", _core_xml(rng, author_mode, author, config.core_padding).encode(), zipfile.ZIP_DEFLATED))
+    for index in range(1, config.parts + 1):
+        part = f"customXml/item{index}.xml"
+        overrides.append((f"/{part}", "application/xml"))
+        main_rels.append((f"rId{100 + index}", _CUSTOM_XML_REL, f"../{part}"))
+        members.append((part, f"<item>{escape(_filler(rng, config.part_size))}</item>".encode(), zipfile.ZIP_DEFLATED))
+    if config.media_size:
+        main_rels.append(("rId200", _IMAGE_REL, "media/image1.png"))
+        members.append((f"{main_dir}/media/image1.png", rng.randbytes(config.media_size), zipfile.ZIP_STORED))
+    if macro:
+        overrides.append((f"/{main_dir}/vbaProject.bin", "application/vnd.ms-office.vbaProject"))
+        main_rels.append(("rId300", _VBA_REL, "vbaProject.bin"))
+        members.append((f"{main_dir}/vbaProject.bin", rng.randbytes(4096), zipfile.ZIP_DEFLATED))
+
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Default Extension="png" ContentType="image/png"/>'
+        + "".join(f'<Override PartName="{name}" ContentType="{ctype}"/>' for name, ctype in overrides)
+        + "</Types>"
+    )
+    head = [
+        ("[Content_Types].xml", content_types.encode(), zipfile.ZIP_DEFLATED),
+        ("_rels/.rels", _relationships(package_rels).encode(), zipfile.ZIP_DEFLATED),
+    ]
+    if main_rels:
+        head.append((f"{main_dir}/_rels/{main_name}.rels", _relationships(main_rels).encode(), zipfile.ZIP_DEFLATED))
+    return _zip(head + members), author
+
+
+def _zip(members: list[tuple[str, bytes, int]]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as package:
+        for name, data, compression in members:
+            info = zipfile.ZipInfo(name, date_time=_ZIP_DATE)
+            info.compress_type = compression
+            package.writestr(info, data)
+    return buffer.getvalue()
+
+
+def corrupt_package(rng: random.Random, data: bytes, mode: str) -> bytes:
+    if mode == "truncated":
+        return data[: max(1, len(data) // rng.randint(2, 5))]
+    if mode == "not-zip":
+        return b"This is not an Office package.\r\n" + rng.randbytes(256)
+    if mode == "bad-core-xml":
+        with zipfile.ZipFile(io.BytesIO(data)) as package:
+            members = [(info.filename, package.read(info), info.compress_type) for info in package.infolist()]
+        return _zip(
+            [
+                (name, b"<cp:coreProperties><dc:creator>" if name == "docProps/core.xml" else content, compression)
+                for name, content, compression in members
+            ]
+        )
+    raise ValueError(f"Unknown corrupt mode: {mode}")
+
+
+def iter_files(config: GeneratorConfig) -> Iterator[tuple[GeneratedFile, bytes]]:
+    """Yield (record, bytes) for each file; one RNG stream keeps the sequence reproducible."""
+    rng = random.Random(config.seed)
+    for index in range(config.count):
+        kind = _pick(rng, config.kinds)
+        author_mode = "allowed" if kind == "thmx" else _pick(rng, config.authors)
+        macro = kind != "thmx" and rng.random() < config.macro_ratio
+        data, author = build_package(rng, kind, author_mode, macro, config)
+        corrupt = ""
+        if rng.random() < config.corrupt_ratio:
+            choices = [mode for mode in CORRUPT_MODES if mode != "bad-core-xml" or (kind != "thmx" and author_mode != "no-core")]
+            corrupt = rng.choice(choices)
+            data = corrupt_package(rng, data, corrupt)
+        extension = KINDS[kind].macro_extension if macro else KINDS[kind].extension
+        record = GeneratedFile(
+            name=f"Synthetic template {index:05d}{extension}",
+            kind=kind,
+            author_mode=author_mode if kind != "thmx" else "",
+            author=author if kind != "thmx" else "",
+            corrupt=corrupt,
+            macro=macro,
+            size=len(data),
+            expected=expected_outcome(kind, author_mode, corrupt),
+        )
+        yield record, data
+
+
+def generate(target: Path, config: GeneratorConfig, manifest: bool = True) -> list[GeneratedFile]:
+    """Write `config.count` templates into `target` (and manifest.jsonl when asked)."""
+    target.mkdir(parents=True, exist_ok=True)
+    records: list[GeneratedFile] = []
+    for record, data in iter_files(config):
+        (target / record.name).write_bytes(data)
+        records.append(record)
+    if manifest:
+        with open(target / "manifest.jsonl", "w", encoding="utf-8") as handle:
+            for record in records:
+                handle.write(json.dumps(asdict(record)) + "\n")
+    return records
+
+
+def _weights(raw: str, known: tuple[str, ...] | list[str]) -> dict[str, float]:
+    weights: dict[str, float] = {}
+    for item in raw.split(","):
+        name, _, value = item.strip().partition("=")
+        if name not in known:
+            raise argparse.ArgumentTypeError(f"unknown choice {name!r} (expected one of {', '.join(known)})")
+        weights[name] = float(value or 1)
+    return weights
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description="Generate synthetic Office templates for load tests.")
+    parser.add_argument("target", help="Output folder.")
+    parser.add_argument("--count", type=int, default=defaults.count)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--kinds", help="Weights per kind, e.g. dotx=4,potx=3,xltx=3,thmx=1.")
+    parser.add_argument("--authors", help=f"Weights per author mode ({', '.join(AUTHOR_MODES)}).")
+    parser.add_argument("--core-padding", type=int, default=defaults.core_padding, help="Extra bytes of text in core.xml.")
+    parser.add_argument("--parts", type=int, default=defaults.parts, help="Custom XML parts per package.")
+    parser.add_argument("--part-size", type=int, default=defaults.part_size)
+    parser.add_argument("--media-size", type=int, default=defaults.media_size, help="Bytes of incompressible media.")
+    parser.add_argument("--macro", type=float, default=defaults.macro_ratio, help="Share of files with a VBA part.")
+    parser.add_argument("--corrupt", type=float, default=defaults.corrupt_ratio, help="Share of corrupt files.")
+    parser.add_argument("--no-manifest", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        config = GeneratorConfig(
+            count=args.count,
+            seed=args.seed,
+            kinds=_weights(args.kinds, list(KINDS)) if args.kinds else defaults.kinds,
+            authors=_weights(args.authors, AUTHOR_MODES) if args.authors else defaults.authors,
+            core_padding=args.core_padding,
+            parts=args.parts,
+            part_size=args.part_size,
+            media_size=args.media_size,
+            macro_ratio=args.macro,
+            corrupt_ratio=args.corrupt,
+        )
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+    records = generate(Path(args.target), config, manifest=not args.no_manifest)
+    summary: dict[str, int] = {}
+    for record in records:
+        summary[record.expected] = summary.get(record.expected, 0) + 1
+    print(json.dumps({"files": len(records), "bytes": sum(r.size for r in records), **summary}), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""Local HTTP stand-in for a central payload server.
+
+Serves files from one folder with ETag, Last-Modified, conditional GET and
+single-range support, which is what payload_source.fetch_url relies on.
+``--drop-after`` cuts each full response after N bytes to exercise resume.
+
+Run: py benchmarks/payload_server.py --dir D:\\bundles --port 8765
+     py 01_installer.py --source http://127.0.0.1:8765/payload.zip
+"""
+from __future__ import annotations
+
+import argparse
+import email.utils
+import hashlib
+import os
+import re
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+
+class PayloadHandler(BaseHTTPRequestHandler):
+    def __init__(self, *args, root: Path, drop_after: int, **kwargs) -> None:
+        self.root = root
+        self.drop_after = drop_after
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        path = (self.root / self.path.lstrip("/").split("?", 1)[0]).resolve()
+        if self.root not in path.parents or not path.is_file():
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        stat = path.stat()
+        etag = '"' + hashlib.sha1(f"{stat.st_size}-{stat.st_mtime_ns}".encode()).hexdigest()[:16] + '"'
+        last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+
+        if self._not_modified(etag, stat.st_mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        start, end = 0, stat.st_size - 1
+        status = HTTPStatus.OK
+        match = _RANGE.match(self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        if match and (if_range is None or if_range in {etag, last_modified}):
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else end
+            if start >= stat.st_size:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{stat.st_size}")
+                self.end_headers()
+                return
+            status = HTTPStatus.PARTIAL_CONTENT
+
+        length = end - start + 1
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(length))
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{stat.st_size}")
+        self.end_headers()
+        limit = min(length, self.drop_after) if self.drop_after and status == HTTPStatus.OK else length
+        with open(path, "rb") as handle:
+            handle.seek(start)
+            self.wfile.write(handle.read(limit))
+        if limit < length:
+            self.close_connection = True
+
+    def _not_modified(self, etag: str, mtime: float) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in {tag.strip() for tag in if_none_match.split(",")}
+        since = self.headers.get("If-Modified-Since")
+        if since:
+            try:
+                return int(mtime) <= email.utils.parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve payload bundles like a central payload server.")
+    parser.add_argument("--dir", default=os.getcwd(), help="Folder to serve.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--drop-after", type=int, default=0, help="Cut full responses after N bytes.")
+    args = parser.parse_args(argv)
+    handler = partial(PayloadHandler, root=Path(args.dir).resolve(), drop_after=args.drop_after)
+    with ThreadingHTTPServer(("127.0.0.1", args.port), handler) as server:
+        print(f"Serving {args.dir} on http://127.0.0.1:{args.port}/")
+        server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,301 @@
+"""Single-file payload bundles: one ZIP of templates plus a manifest.
+
+A bundle holds ``manifest.json`` followed by the templates under
+``templates/``. Members are stored, not deflated, because Office templates are
+already ZIP files. The manifest records each template's SHA-256, size, authors
+and destination key. On install only the name and hash are trusted: the
+destination comes from the routing table and the author is read from the
+member itself, exactly as for a payload folder. Members are streamed to their
+destinations in archive order and verified against the manifest hash before
+they replace anything.
+
+Run: py bundle.py build "D:\\Payload" "D:\\payload.zip"
+     py bundle.py show "D:\\payload.zip"
+     py 01_installer.py --bundle "D:\\payload.zip"
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import zipfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional
+
+import author_validation
+import common
+import copy_executor
+import install_state
+
+BUNDLE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+MEMBER_DIR = "templates/"
+
+
+class BundleError(ValueError):
+    """The file is not a bundle this version can install."""
+
+
+@dataclass
+class BundleEntry:
+    name: str
+    sha256: str
+    size: int
+    # Informational (bundle.py show); installs read the author from the member.
+    authors: list[str]
+    # Informational; installs route by name through common.ROUTES.
+    destination: str
+
+    @property
+    def member(self) -> str:
+        return MEMBER_DIR + self.name
+
+
+def check_entry_name(name: object) -> str:
+    """Return `name` if it is a plain template file name; manifests must not steer writes elsewhere."""
+    if (
+        not isinstance(name, str)
+        or name in ("", ".", "..")
+        or any(char in name for char in '/\\:\0')
+        or os.path.isabs(name)
+        or os.path.basename(name) != name
+    ):
+        raise BundleError(f"Invalid template name in bundle manifest: {name!r}")
+    if os.path.splitext(name)[1].lower() not in author_validation.SUPPORTED_TEMPLATE_EXTENSIONS:
+        raise BundleError(f"Unsupported template type in bundle manifest: {name!r}")
+    return name
+
+
+@dataclass
+class BundleManifest:
+    version: int = BUNDLE_VERSION
+    created: str = ""
+    entries: list[BundleEntry] = field(default_factory=list)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+    @classmethod
+    def from_json(cls, raw: bytes | str) -> "BundleManifest":
+        try:
+            data = json.loads(raw)
+        except ValueError as exc:
+            raise BundleError(f"Invalid bundle manifest ({exc})") from exc
+        if not isinstance(data, dict):
+            raise BundleError("Invalid bundle manifest")
+        if data.get("version") != BUNDLE_VERSION:
+            raise BundleError(f"Unsupported bundle version: {data.get('version')}")
+        try:
+            entries = [BundleEntry(**entry) for entry in data.get("entries", [])]
+        except TypeError as exc:
+            raise BundleError(f"Invalid bundle manifest ({exc})") from exc
+        seen: set[str] = set()
+        for entry in entries:
+            # Names become destination file names, which Windows compares case-insensitively.
+            key = check_entry_name(entry.name).lower()
+            if key in seen:
+                raise BundleError(f"Duplicate template name in bundle manifest: {entry.name!r}")
+            seen.add(key)
+        return cls(data["version"], data.get("created", ""), entries)
+
+
+_BASE_APPS = {filename: app_label for app_label, filename in common.BASE_TEMPLATE_TARGETS}
+
+
+def destination_key(name: str) -> str:
+    """Destination key for a payload file, matching install_plan.build_install_plan."""
+    route = common.ROUTES.for_name(name)
+    return route.destination if route is not None else ""
+
+
+def build_manifest(base_dir: Path) -> BundleManifest:
+    manifest = BundleManifest(created=datetime.now(timezone.utc).isoformat(timespec="seconds"))
+    for file in sorted(common.iter_template_files(base_dir), key=lambda path: path.name.lower()):
+        author, _ = author_validation.read_template_author(file)
+        manifest.entries.append(
+            BundleEntry(
+                name=file.name,
+                sha256=install_state.hash_file(file),
+                size=file.stat().st_size,
+                authors=[author] if author else [],
+                destination=destination_key(file.name),
+            )
+        )
+    return manifest
+
+
+def create_bundle(base_dir: Path, output: Path) -> BundleManifest:
+    """Pack the templates of `base_dir` into `output`, replacing it atomically."""
+    base_dir = common.normalize_path(base_dir)
+    output = common.normalize_path(output)
+    manifest = build_manifest(base_dir)
+    common.ensure_directory(output.parent)
+    handle, temp_name = tempfile.mkstemp(prefix=common.STAGED_TEMP_PREFIX, suffix=".part", dir=output.parent)
+    os.close(handle)
+    try:
+        with zipfile.ZipFile(temp_name, "w", zipfile.ZIP_STORED) as bundle:
+            # Manifest first so installers can read it before any member data.
+            bundle.writestr(MANIFEST_NAME, manifest.to_json())
+            for entry in manifest.entries:
+                bundle.write(base_dir / entry.name, entry.member)
+        os.replace(temp_name, output)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+    return manifest
+
+
+def read_manifest(bundle: zipfile.ZipFile) -> BundleManifest:
+    try:
+        return BundleManifest.from_json(bundle.read(MANIFEST_NAME))
+    except KeyError as exc:
+        raise BundleError(f"{MANIFEST_NAME} is missing") from exc
+
+
+def bundle_jobs(
+    bundle: zipfile.ZipFile,
+    bundle_path: Path,
+    manifest: BundleManifest,
+    destinations: dict[str, Path],
+    allowed_authors: Optional[Iterable[str]] = None,
+    validation_enabled: bool = True,
+) -> list[copy_executor.CopyJob]:
+    """Base jobs in their fixed order, then custom jobs by name, like collect_copy_jobs.
+
+    Base templates missing from the bundle get a job without an opener, so
+    they count as missing like in a folder install. With `allowed_authors`,
+    each job carries the author check of its own member's core.xml.
+    """
+    entries = {entry.name: entry for entry in manifest.entries}
+    members = set(bundle.namelist())
+    if allowed_authors is not None:
+        allowed_authors = list(allowed_authors)
+    jobs: list[copy_executor.CopyJob] = []
+
+    def add(entry: BundleEntry) -> None:
+        job = _entry_job(bundle, bundle_path, entry, destinations, members)
+        if allowed_authors is not None:
+            job.author_result = _member_author(bundle, entry, job.source, allowed_authors, validation_enabled)
+        jobs.append(job)
+
+    for app_label, name, root in common.base_template_targets(destinations):
+        if name in entries:
+            add(entries[name])
+        else:
+            jobs.append(copy_executor.CopyJob(bundle_path / name, common.normalize_path(root) / name, app_label))
+    for entry in sorted(manifest.entries, key=lambda entry: entry.name.lower()):
+        if entry.name not in _BASE_APPS:
+            add(entry)
+    return jobs
+
+
+def _entry_job(
+    bundle: zipfile.ZipFile,
+    bundle_path: Path,
+    entry: BundleEntry,
+    destinations: dict[str, Path],
+    members: set[str],
+) -> copy_executor.CopyJob:
+    if entry.member not in members:
+        raise BundleError(f"{entry.member} is listed in the manifest but missing from the bundle")
+    name = check_entry_name(entry.name)
+    key = destination_key(name)
+    root = destinations.get(key) if key else None
+    destination = None
+    if root is not None:
+        root = common.normalize_path(root)
+        destination = root / name
+        if destination.resolve().parent != root.resolve():
+            raise BundleError(f"{entry.name!r} resolves outside its destination folder {root}")
+    return copy_executor.CopyJob(
+        source=bundle_path / name,
+        destination=destination,
+        app_label=_BASE_APPS.get(name),
+        opener=_member_opener(bundle, entry.member),
+        sha256=entry.sha256,
+        mtime=time.mktime(bundle.getinfo(entry.member).date_time + (0, 0, -1)),
+    )
+
+
+def _member_author(
+    bundle: zipfile.ZipFile,
+    entry: BundleEntry,
+    source: Path,
+    allowed_authors: list[str],
+    validation_enabled: bool,
+) -> common.AuthorCheckResult:
+    """Author check on the member's own core.xml, like check_template_author on a file."""
+    authors: list[str] = []
+    if validation_enabled and source.suffix.lower() != ".thmx":
+        with bundle.open(entry.member) as member:
+            author, error = author_validation.read_stream_author(member, entry.name)
+        if error:
+            return common.AuthorCheckResult(False, error, [], error=True)
+        authors = [author] if author else []
+    return author_validation.evaluate_authors(source, authors, allowed_authors, validation_enabled)
+
+
+def _member_opener(bundle: zipfile.ZipFile, member: str) -> Callable[[], BinaryIO]:
+    return lambda: bundle.open(member)  # type: ignore[return-value]
+
+
+def install_bundle(
+    bundle_path: Path,
+    destinations: dict[str, Path],
+    results: common.InstallReport,
+    allowed_authors: Iterable[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    close_apps: bool = True,
+) -> list[copy_executor.CopyOutcome]:
+    """Stream every member of `bundle_path` to its destination."""
+    bundle_path = common.normalize_path(bundle_path)
+    allowed_authors = list(allowed_authors)
+    with zipfile.ZipFile(bundle_path) as bundle:
+        manifest = read_manifest(bundle)
+        jobs = bundle_jobs(bundle, bundle_path, manifest, destinations, allowed_authors, validation_enabled)
+        if close_apps:
+            common.close_office_apps(design_mode, targets=[job.destination for job in jobs if job.destination])
+        # One worker: the archive is read front to back instead of seeking between members.
+        return copy_executor.execute_copy_jobs(
+            jobs,
+            results,
+            allowed_authors,
+            validation_enabled,
+            design_mode,
+            max_workers=1,
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or inspect template payload bundles.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Pack a payload folder into a bundle.")
+    build.add_argument("payload")
+    build.add_argument("output")
+    show = sub.add_parser("show", help="Print a bundle's manifest.")
+    show.add_argument("bundle")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        manifest = create_bundle(Path(args.payload), Path(args.output))
+        print(f"[OK] Bundled {len(manifest.entries)} templates into {args.output}")
+        return 0
+    try:
+        with zipfile.ZipFile(args.bundle) as bundle:
+            print(read_manifest(bundle).to_json())
+    except (OSError, zipfile.BadZipFile, BundleError) as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,18 +1,20 @@
 """Shared helpers for installing/uninstalling Office templates."""
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
-import shutil
-import subprocess
 import sys
-from dataclasses import dataclass, field
+import tempfile
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Iterable, Optional, Set
+from typing import BinaryIO, Callable, Iterable, Optional, Set
 
 from author_validation import (
     AUTHOR_VALIDATION_ENABLED,
+    AuthorCheckResult,
     DEFAULT_ALLOWED_TEMPLATE_AUTHORS,
     SUPPORTED_TEMPLATE_EXTENSIONS,
     check_template_author,
@@ -28,6 +30,15 @@ def normalize_path(path: Path | str | None) -> Path:
 
 sys.path.append(str(Path(__file__).resolve().parent))
 import path_utils  # type: ignore  # noqa: E402
+import copy_strategies  # type: ignore  # noqa: E402
+import event_log  # type: ignore  # noqa: E402
+import install_report  # type: ignore  # noqa: E402
+import lock_probe  # type: ignore  # noqa: E402
+import metrics  # type: ignore  # noqa: E402
+import process_manager  # type: ignore  # noqa: E402
+import registry_trace  # type: ignore  # noqa: E402
+import routing  # type: ignore  # noqa: E402
+from routing import destinations_from_template_paths  # type: ignore  # noqa: E402,F401
 
 try:
     import winreg  # type: ignore[import-not-found]
@@ -56,49 +67,47 @@ MANUAL_DESIGN_LOG_UNINSTALLER: bool | None = False
 # Constantes base
 # --------------------------------------------------------------------------- #
 
-_BASE_PATHS = path_utils.resolve_base_paths()
-APPDATA_PATH = _BASE_PATHS["APPDATA"]
-DOCUMENTS_PATH = _BASE_PATHS["DOCUMENTS"]
-
 DEFAULT_DESIGN_MODE = os.environ.get("IsDesignModeEnabled", "false").lower() == "true"
 MRU_VALUE_PREFIX = "[F00000000][T01ED6D7E58D00000][O00000000]*"
+# Staged copies write "~tmp-*.part" next to the target and os.replace it, so readers
+# never observe a half-written template.
+STAGED_COPY_ENABLED = os.environ.get("StagedCopyEnabled", "true").lower() != "false"
+STAGED_COPY_FSYNC = os.environ.get("StagedCopyFsync", "false").lower() == "true"
+STAGED_TEMP_PREFIX = "~tmp-"
+STREAM_CHUNK_SIZE = 1024 * 1024
+BACKUP_HARDLINKS_ENABLED = os.environ.get("BackupHardlinksEnabled", "true").lower() != "false"
+# "locked" closes only the Office apps holding a target open; "always" closes them unconditionally.
+CLOSE_OFFICE_APPS_MODE = os.environ.get("CloseOfficeAppsMode", "locked").lower()
+
+
+EVENTS = event_log.EVENTS
+
+
+def configure_events(design_mode: bool, jsonl_path: Path | str | None = None) -> None:
+    """Resolve the design-log categories for this run based on the effective mode."""
+    EVENTS.configure(
+        design_mode,
+        {
+            "paths": MANUAL_DESIGN_LOG_PATHS,
+            "mru": MANUAL_DESIGN_LOG_MRU,
+            "author": MANUAL_DESIGN_LOG_AUTHOR,
+            "copy_base": MANUAL_DESIGN_LOG_COPY_BASE,
+            "copy_custom": MANUAL_DESIGN_LOG_COPY_CUSTOM,
+            "backup": MANUAL_DESIGN_LOG_BACKUP,
+            "close_apps": MANUAL_DESIGN_LOG_CLOSE_APPS,
+            "installer": MANUAL_DESIGN_LOG_INSTALLER,
+            "uninstaller": MANUAL_DESIGN_LOG_UNINSTALLER,
+        },
+        jsonl_path,
+    )
+
 
+configure_events(DEFAULT_DESIGN_MODE)
 
-def _design_flag(env_var: str, manual_override: bool | None, fallback: bool) -> bool:
-    if manual_override is not None:
-        return bool(manual_override)
-    raw = os.environ.get(env_var)
-    if raw is None:
-        return fallback
-    return raw.lower() == "true"
-
-
-DESIGN_LOG_PATHS = _design_flag("DesignLogPaths", MANUAL_DESIGN_LOG_PATHS, DEFAULT_DESIGN_MODE)
-DESIGN_LOG_MRU = _design_flag("DesignLogMRU", MANUAL_DESIGN_LOG_MRU, DEFAULT_DESIGN_MODE)
-DESIGN_LOG_AUTHOR = _design_flag("DesignLogAuthor", MANUAL_DESIGN_LOG_AUTHOR, DEFAULT_DESIGN_MODE)
-DESIGN_LOG_COPY_BASE = _design_flag("DesignLogCopyBase", MANUAL_DESIGN_LOG_COPY_BASE, DEFAULT_DESIGN_MODE)
-DESIGN_LOG_COPY_CUSTOM = _design_flag("DesignLogCopyCustom", MANUAL_DESIGN_LOG_COPY_CUSTOM, DEFAULT_DESIGN_MODE)
-DESIGN_LOG_BACKUP = _design_flag("DesignLogBackup", MANUAL_DESIGN_LOG_BACKUP, DEFAULT_DESIGN_MODE)
-DESIGN_LOG_CLOSE_APPS = _design_flag("DesignLogCloseApps", MANUAL_DESIGN_LOG_CLOSE_APPS, DEFAULT_DESIGN_MODE)
-DESIGN_LOG_INSTALLER = _design_flag("DesignLogInstaller", MANUAL_DESIGN_LOG_INSTALLER, DEFAULT_DESIGN_MODE)
-DESIGN_LOG_UNINSTALLER = _design_flag("DesignLogUninstaller", MANUAL_DESIGN_LOG_UNINSTALLER, DEFAULT_DESIGN_MODE)
-
-
-def refresh_design_log_flags(effective_design_mode: bool) -> None:
-    """Update design flags for this run based on the effective mode."""
-    global DESIGN_LOG_PATHS, DESIGN_LOG_MRU
-    global DESIGN_LOG_AUTHOR, DESIGN_LOG_COPY_BASE, DESIGN_LOG_COPY_CUSTOM, DESIGN_LOG_BACKUP
-    global DESIGN_LOG_CLOSE_APPS, DESIGN_LOG_INSTALLER, DESIGN_LOG_UNINSTALLER
-
-    DESIGN_LOG_PATHS = _design_flag("DesignLogPaths", MANUAL_DESIGN_LOG_PATHS, effective_design_mode)
-    DESIGN_LOG_MRU = _design_flag("DesignLogMRU", MANUAL_DESIGN_LOG_MRU, effective_design_mode)
-    DESIGN_LOG_AUTHOR = _design_flag("DesignLogAuthor", MANUAL_DESIGN_LOG_AUTHOR, effective_design_mode)
-    DESIGN_LOG_COPY_BASE = _design_flag("DesignLogCopyBase", MANUAL_DESIGN_LOG_COPY_BASE, effective_design_mode)
-    DESIGN_LOG_COPY_CUSTOM = _design_flag("DesignLogCopyCustom", MANUAL_DESIGN_LOG_COPY_CUSTOM, effective_design_mode)
-    DESIGN_LOG_BACKUP = _design_flag("DesignLogBackup", MANUAL_DESIGN_LOG_BACKUP, effective_design_mode)
-    DESIGN_LOG_CLOSE_APPS = _design_flag("DesignLogCloseApps", MANUAL_DESIGN_LOG_CLOSE_APPS, effective_design_mode)
-    DESIGN_LOG_INSTALLER = _design_flag("DesignLogInstaller", MANUAL_DESIGN_LOG_INSTALLER, effective_design_mode)
-    DESIGN_LOG_UNINSTALLER = _design_flag("DesignLogUninstaller", MANUAL_DESIGN_LOG_UNINSTALLER, effective_design_mode)
+# Resolved after configure_events so the paths channel can log them.
+_BASE_PATHS = path_utils.resolve_base_paths()
+APPDATA_PATH = _BASE_PATHS["APPDATA"]
+DOCUMENTS_PATH = _BASE_PATHS["DOCUMENTS"]
 
 DEFAULT_CUSTOM_OFFICE_TEMPLATE_PATH = normalize_path(
     os.environ.get("CUSTOM_OFFICE_TEMPLATE_PATH", _BASE_PATHS["CUSTOM_WORD"])
@@ -116,19 +125,14 @@ DEFAULT_EXCEL_STARTUP_FOLDER = normalize_path(
     os.environ.get("EXCEL_STARTUP_FOLDER_PATH", _BASE_PATHS["EXCEL_STARTUP"])
 )
 DEFAULT_THEME_FOLDER = normalize_path(_BASE_PATHS["THEME"])
+INSTALLER_STATE_DIR = normalize_path(
+    os.environ.get("TemplateInstallerStateDir", APPDATA_PATH / "TemplateInstaller")
+)
 
-BASE_TEMPLATE_NAMES = {
-    "Normal.dotx",
-    "Normal.dotm",
-    "NormalEmail.dotx",
-    "NormalEmail.dotm",
-    "Blank.potx",
-    "Blank.potm",
-    "Book.xltx",
-    "Book.xltm",
-    "Sheet.xltx",
-    "Sheet.xltm",
-}
+# Extension and base-name routing (routing.json); see routing.py.
+ROUTES = routing.ROUTES
+BASE_TEMPLATE_NAMES = ROUTES.base_names
+BASE_TEMPLATE_TARGETS = ROUTES.base_targets
 
 
 # --------------------------------------------------------------------------- #
@@ -136,9 +140,37 @@ BASE_TEMPLATE_NAMES = {
 # --------------------------------------------------------------------------- #
 
 
+class DirectoryRegistry:
+    """Create each folder at most once per run (mkdir chains are slow on file servers)."""
+
+    def __init__(self) -> None:
+        self._created: set[str] = set()
+        self._lock = threading.Lock()
+
+    def ensure(self, path: Path) -> Path:
+        key = os.path.normcase(str(path))
+        if key in self._created:
+            return path
+        with self._lock:
+            if key not in self._created:
+                path.mkdir(parents=True, exist_ok=True)
+                self._created.add(key)
+        return path
+
+    def prepare(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            self.ensure(path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._created.clear()
+
+
+DIRECTORIES = DirectoryRegistry()
+
+
 def ensure_directory(path: Path) -> Path:
-    path.mkdir(parents=True, exist_ok=True)
-    return path
+    return DIRECTORIES.ensure(path)
 
 
 def resolve_base_directory(base_dir: Path) -> Path:
@@ -155,16 +187,77 @@ def path_in_appdata(path: Path) -> bool:
         return False
 
 
-def ensure_parents_and_copy(source: Path, destination: Path) -> None:
-    ensure_directory(destination.parent)
-    shutil.copy2(source, destination)
+UNPINNED_PAYLOAD_ERROR = (
+    '[ERROR] Template path was not provided. Run the {tool} from "1. Pin templates..." '
+    "so the correct folder is passed in."
+)
 
 
-def _design_log(enabled: bool, design_mode: bool, level: int, message: str, *args: object) -> None:
-    if design_mode and enabled:
-        LOGGER.log(level, message, *args)
+def is_unpinned_payload(requested: Path, base_dir: Path) -> bool:
+    """True when `base_dir` is `requested` itself and lies under APPDATA, i.e. no payload folder was passed in."""
+    return base_dir == normalize_path(requested) and path_in_appdata(base_dir)
 
 
+def ensure_parents_and_copy(source: Path, destination: Path) -> str:
+    """Copy `source` over `destination`; return the copy strategy used."""
+    ensure_directory(destination.parent)
+    if STAGED_COPY_ENABLED:
+        return staged_copy(source, destination)
+    return copy_strategies.copy_file(source, destination)
+
+
+def staged_copy(source: Path, destination: Path, fsync: bool | None = None) -> str:
+    """Copy to a temp file beside `destination`, then swap it in with os.replace."""
+    if fsync is None:
+        fsync = STAGED_COPY_FSYNC
+    handle, temp_name = tempfile.mkstemp(prefix=STAGED_TEMP_PREFIX, suffix=".part", dir=destination.parent)
+    os.close(handle)
+    temp_path = Path(temp_name)
+    try:
+        strategy = copy_strategies.copy_file(source, temp_path)
+        if fsync:
+            with open(temp_path, "rb+") as staged:
+                os.fsync(staged.fileno())
+        os.replace(temp_path, destination)
+        return strategy
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def stream_to_destination(
+    reader: BinaryIO,
+    destination: Path,
+    expected_sha256: Optional[str] = None,
+    mtime: Optional[float] = None,
+) -> str:
+    """Write `reader` to a temp file beside `destination`, verify it, then os.replace it in."""
+    ensure_directory(destination.parent)
+    digest = hashlib.sha256()
+    handle, temp_name = tempfile.mkstemp(prefix=STAGED_TEMP_PREFIX, suffix=".part", dir=destination.parent)
+    try:
+        with os.fdopen(handle, "wb") as staged:
+            for chunk in iter(lambda: reader.read(STREAM_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                staged.write(chunk)
+            if STAGED_COPY_FSYNC:
+                staged.flush()
+                os.fsync(staged.fileno())
+        if expected_sha256 and digest.hexdigest() != expected_sha256:
+            raise OSError(f"checksum mismatch for {destination.name}")
+        if mtime is not None:
+            os.utime(temp_name, (mtime, mtime))
+        os.replace(temp_name, destination)
+        return "stream"
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
 
 
 # --------------------------------------------------------------------------- #
@@ -172,9 +265,8 @@ def _design_log(enabled: bool, design_mode: bool, level: int, message: str, *arg
 # --------------------------------------------------------------------------- #
 
 
-@dataclass
-class InstallFlags:
-    totals: dict[str, int] = field(default_factory=lambda: {"files": 0, "errors": 0, "blocked": 0})
+InstallReport = install_report.InstallReport
+FileOutcome = install_report.FileOutcome
 
 
 def install_template(
@@ -183,18 +275,19 @@ def install_template(
     source_root: Path,
     destination_root: Path,
     destinations_map: dict[str, Path],
-    flags: InstallFlags,
+    results: InstallReport,
     allowed_authors: Iterable[str],
     validation_enabled: bool,
     design_mode: bool,
 ) -> None:
+    started = time.perf_counter()
     source = normalize_path(source_root / filename)
     destination_root = ensure_directory(normalize_path(destination_root))
     destination = destination_root / filename
 
     if not source.exists():
-        _design_log(DESIGN_LOG_COPY_BASE, design_mode, logging.WARNING, "[WARNING] Source file not found: %s", source)
-        flags.totals["errors"] += 1
+        EVENTS.copy_base.warning("[WARNING] Source file not found: %s", source)
+        results.add(source, destination, FileOutcome.MISSING, duration=time.perf_counter() - started)
         return
 
     author_check = check_template_author(
@@ -202,138 +295,46 @@ def install_template(
         allowed_authors=allowed_authors,
         validation_enabled=validation_enabled,
         design_mode=design_mode,
-        log_callback=lambda level, message, *args: _design_log(
-            DESIGN_LOG_AUTHOR,
-            design_mode,
-            level,
-            message,
-            *args,
-        ),
+        log_callback=EVENTS.author.log if EVENTS.author.enabled else None,
     )
+    author = "; ".join(author_check.authors) or None
     if not author_check.allowed:
-        _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.WARNING, author_check.message)
-        flags.totals["blocked"] += 1
+        EVENTS.author.warning(author_check.message)
+        results.add(source, destination, FileOutcome.BLOCKED, duration=time.perf_counter() - started, author=author)
         return
 
     backup_existing(destination, design_mode)
     try:
         ensure_parents_and_copy(source, destination)
-        flags.totals["files"] += 1
-        _design_log(DESIGN_LOG_COPY_BASE, design_mode, logging.INFO, "[OK] Copied %s to %s", filename, destination)
-        _update_mru_if_applicable(app_label, destination, design_mode)
+        size = destination.stat().st_size
     except OSError as exc:
-        flags.totals["errors"] += 1
-        _design_log(DESIGN_LOG_COPY_BASE, design_mode, logging.ERROR, "[ERROR] Copy failed for %s (%s)", filename, exc)
+        results.add(source, destination, FileOutcome.FAILED, duration=time.perf_counter() - started, author=author)
+        EVENTS.copy_base.error("[ERROR] Copy failed for %s (%s)", filename, exc)
         return
+    results.add(source, destination, FileOutcome.COPIED, size, time.perf_counter() - started, author)
+    if EVENTS.copy_base.enabled:
+        EVENTS.copy_base.info("[OK] Copied %s to %s", filename, destination)
+    _update_mru_if_applicable(destination, design_mode)
 
 
-def copy_custom_templates(base_dir: Path, destinations: dict[str, Path], flags: InstallFlags, allowed: Iterable[str], validation_enabled: bool, design_mode: bool) -> None:
-    for file in iter_template_files(base_dir):
-        filename = file.name
-        extension = file.suffix.lower()
-        if filename in BASE_TEMPLATE_NAMES:
-            continue
-        if extension in {".xltx", ".xltm"}:
-            destination_root = destinations["EXCEL_CUSTOM"]
-        elif extension in {".dotx", ".dotm"}:
-            destination_root = destinations["WORD_CUSTOM"]
-        elif extension in {".potx", ".potm"}:
-            destination_root = destinations["POWERPOINT_CUSTOM"]
-        else:
-            destination_root = _destination_for_extension(extension, destinations)
-        if destination_root is None:
-            _design_log(DESIGN_LOG_COPY_CUSTOM, design_mode, logging.WARNING, "[WARNING] No destination for %s", filename)
-            continue
+def copy_custom_templates(base_dir: Path, destinations: dict[str, Path], results: InstallReport, allowed: Iterable[str], validation_enabled: bool, design_mode: bool) -> None:
+    import copy_executor
 
-        result = check_template_author(
-            file,
-            allowed_authors=allowed,
-            validation_enabled=validation_enabled,
-            design_mode=design_mode,
-            log_callback=lambda level, message, *args: _design_log(
-                DESIGN_LOG_AUTHOR,
-                design_mode,
-                level,
-                message,
-                *args,
-            ),
-        )
-        if not result.allowed:
-            flags.totals["blocked"] += 1
-            _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.WARNING, result.message)
-            continue
+    copy_executor.execute_copy_jobs(
+        copy_executor.collect_custom_jobs(base_dir, destinations),
+        results,
+        allowed,
+        validation_enabled,
+        design_mode,
+    )
 
-        target_path = destination_root / filename
-        backup_existing(target_path, design_mode)
-        try:
-            ensure_parents_and_copy(file, target_path)
-            flags.totals["files"] += 1
-            _design_log(
-                DESIGN_LOG_COPY_CUSTOM,
-                design_mode,
-                logging.INFO,
-                "[OK] Copied %s to %s",
-                filename,
-                target_path,
-            )
-            _update_mru_if_applicable_extension(extension, target_path, design_mode)
-        except OSError as exc:
-            flags.totals["errors"] += 1
-            _design_log(DESIGN_LOG_COPY_CUSTOM, design_mode, logging.ERROR, "[ERROR] Copy failed for %s (%s)", filename, exc)
-            continue
 
+def custom_destination_for(extension: str, destinations: dict[str, Path]) -> Optional[Path]:
+    return ROUTES.destination_for_extension(extension, destinations)
 
-def remove_installed_templates(
-    destinations: dict[str, Path],
-    design_mode: bool,
-    payload_dir: Path | None = None,
-) -> None:
-    targets = {
-        destinations["WORD"]: ["Normal.dotx", "Normal.dotm", "NormalEmail.dotx", "NormalEmail.dotm"],
-        destinations["POWERPOINT"]: ["Blank.potx", "Blank.potm"],
-        destinations["EXCEL"]: ["Book.xltx", "Book.xltm", "Sheet.xltx", "Sheet.xltm"],
-        destinations["THEMES"]: [],
-    }
-    failures: list[Path] = []
-    for root, files in targets.items():
-        for name in files:
-            target = normalize_path(root / name)
-            try:
-                _design_log(
-                    DESIGN_LOG_UNINSTALLER,
-                    design_mode,
-                    logging.INFO,
-                    "[INFO] Checking %s",
-                    target,
-                )
-                if not target.exists():
-                    _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.INFO, "[INFO] Does not exist %s", target)
-                    continue
-                backup_existing(target, design_mode)
-                _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.INFO, "[INFO] Deleting %s", target)
-                target.unlink()
-                _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.INFO, "[INFO] Deleted %s", target)
-                if target.exists():
-                    _design_log(
-                        DESIGN_LOG_UNINSTALLER,
-                        design_mode,
-                        logging.WARNING,
-                        "[WARN] File persisted after deletion: %s",
-                        target,
-                    )
-                    failures.append(target)
-            except OSError as exc:
-                _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.WARNING, "[WARN] Could not delete %s (%s)", target, exc)
-                failures.append(target)
-    if failures:
-        summary = ", ".join(str(path) for path in failures)
-        _design_log(
-            DESIGN_LOG_UNINSTALLER,
-            design_mode,
-            logging.WARNING,
-            "[WARN] Files remained after deletion. Close Office/Outlook and try again: %s",
-            summary,
-        )
+
+def base_template_targets(destinations: dict[str, Path]) -> list[tuple[str, str, Path]]:
+    return [(route.app, filename, destinations[route.destination]) for filename, route in ROUTES.base_routes]
 
 
 def remove_normal_templates(
@@ -341,7 +342,7 @@ def remove_normal_templates(
     emit: Callable[[str], None] | None = None,
 ) -> None:
     if emit is None:
-        emit = lambda message: _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.INFO, message)
+        emit = EVENTS.uninstaller.info
     template_dir = resolve_template_paths()["ROAMING"]
     emit('[INFO] Path retrieved from common.resolve_template_paths()["ROAMING"]')
     emit(f"[INFO] Template path (ROAMING): {template_dir}")
@@ -364,129 +365,69 @@ def remove_normal_templates(
             emit(f"[ERROR] Could not delete {target} ({exc})")
 
 
-def delete_custom_copies(
-    base_dir: Path,
-    destinations: dict[str, Path],
-    design_mode: bool,
-) -> None:
-    for file in iter_template_files(base_dir):
-        if file.name in BASE_TEMPLATE_NAMES:
-            continue
-        extension = file.suffix.lower()
-        for dest in destinations.values():
-            candidate = normalize_path(dest / file.name)
-            try:
-                if candidate.exists():
-                    if design_mode:
-                        print(f"[DELETE] Deleting file: {candidate}")
-                    candidate.unlink()
-                    _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.INFO, "[INFO] Deleted %s", candidate)
-            except OSError as exc:
-                _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.WARNING, "[WARN] Could not delete %s (%s)", candidate, exc)
-
-
-def clear_mru_entries_for_payload(base_dir: Path, destinations: dict[str, Path], design_mode: bool) -> None:
-    """Remove MRU entries for payload templates and base templates."""
-    if not is_windows() or winreg is None:
-        return
-    targets = _collect_mru_targets(base_dir, destinations)
-    if not targets:
-        return
-    grouped: dict[str, set[str]] = {"WORD": set(), "POWERPOINT": set(), "EXCEL": set()}
-    for path in targets:
-        ext = path.suffix.lower()
-        if ext in {".dotx", ".dotm"}:
-            grouped["WORD"].add(str(path))
-        elif ext in {".potx", ".potm"}:
-            grouped["POWERPOINT"].add(str(path))
-        elif ext in {".xltx", ".xltm"}:
-            grouped["EXCEL"].add(str(path))
-    for app_label, paths in grouped.items():
-        if paths:
-            _clear_mru_for_app(app_label, paths, design_mode)
-
-
-def backup_existing(target_file: Path, design_mode: bool) -> None:
+def create_backup(target_file: Path) -> Optional[Path]:
+    """Copy `target_file` into its Backups folder; raise OSError on failure."""
     if not target_file.exists():
-        return
+        return None
     backup_dir = target_file.parent / "Backups"
     ensure_directory(backup_dir)
     timestamp = datetime.now().strftime("%Y.%m.%d.%H%M")
     backup_path = backup_dir / f"{timestamp} - {target_file.name}"
+    if STAGED_COPY_ENABLED and BACKUP_HARDLINKS_ENABLED:
+        # Staged copies replace the target's directory entry, so a hardlinked
+        # backup keeps pointing at the previous content.
+        if backup_path.exists():
+            backup_path.unlink()
+        copy_strategies.link_or_copy(target_file, backup_path)
+    else:
+        copy_strategies.copy_file(target_file, backup_path)
+    metrics.METRICS.inc("backups_total")
+    return backup_path
+
+
+def backup_existing(target_file: Path, design_mode: bool) -> None:
     try:
-        shutil.copy2(target_file, backup_path)
-        _design_log(DESIGN_LOG_BACKUP, design_mode, logging.INFO, "[BACKUP] Copy created at %s", backup_path)
+        backup_path = create_backup(target_file)
+        if backup_path is not None and EVENTS.backup.enabled:
+            EVENTS.backup.info("[BACKUP] Copy created at %s", backup_path)
     except OSError as exc:
-        _design_log(
-            DESIGN_LOG_BACKUP,
-            design_mode,
-            logging.WARNING,
-            "[WARN] Could not create backup of %s (%s)",
-            target_file,
-            exc,
-        )
+        EVENTS.backup.warning("[WARN] Could not create backup of %s (%s)", target_file, exc)
 
 
 
 
-def _update_mru_if_applicable(app_label: str, destination: Path, design_mode: bool) -> None:
-    if not _should_update_mru(destination):
-        return
-    ext = destination.suffix.lower()
-    if ext in {".dotx", ".dotm", ".potx", ".potm", ".xltx", ".xltm"}:
+def _update_mru_if_applicable(destination: Path, design_mode: bool) -> None:
+    app_label = ROUTES.mru_app(destination.name)
+    if app_label:
         update_mru_for_template(app_label, destination, design_mode)
 
 
-def _update_mru_if_applicable_extension(extension: str, destination: Path, design_mode: bool) -> None:
-    if not _should_update_mru(destination):
-        return
-    if extension in {".dotx", ".dotm"}:
-        update_mru_for_template("WORD", destination, design_mode)
-    if extension in {".potx", ".potm"}:
-        update_mru_for_template("POWERPOINT", destination, design_mode)
-    if extension in {".xltx", ".xltm"}:
-        update_mru_for_template("EXCEL", destination, design_mode)
-
-
 def _should_update_mru(path: Path) -> bool:
-    name = path.name
-    ext = path.suffix.lower()
-    if name in BASE_TEMPLATE_NAMES:
-        return False
-    if ext == ".thmx":
-        return False
-    return True
+    return bool(ROUTES.mru_app(path.name))
 
 
-def _collect_mru_targets(base_dir: Path, destinations: dict[str, Path]) -> list[Path]:
+def _collect_mru_targets(
+    base_dir: Path,
+    destinations: dict[str, Path],
+    payload_files: Iterable[Path] | None = None,
+) -> list[Path]:
     """Return potential MRU paths to clear (base + custom payload)."""
     targets: set[Path] = set()
     # Base templates
-    base_targets = {
-        "WORD": ["Normal.dotx", "Normal.dotm", "NormalEmail.dotx", "NormalEmail.dotm"],
-        "POWERPOINT": ["Blank.potx", "Blank.potm"],
-        "EXCEL": ["Book.xltx", "Book.xltm", "Sheet.xltx", "Sheet.xltm"],
-    }
-    for app, names in base_targets.items():
-        dest = destinations.get(app)
+    for name, route in ROUTES.base_routes:
+        dest = route.folder(destinations)
         if dest:
-            for name in names:
-                targets.add(normalize_path(dest / name))
+            targets.add(normalize_path(dest / name))
     # Custom payload templates
-    for file in iter_template_files(base_dir):
+    if payload_files is None:
+        payload_files = iter_template_files(base_dir)
+    for file in payload_files:
         if file.name in BASE_TEMPLATE_NAMES:
             continue
-        ext = file.suffix.lower()
-        if ext == ".thmx":
+        route = ROUTES.for_extension(file.suffix)
+        if route is None or not route.mru:
             continue
-        if ext in {".dotx", ".dotm"}:
-            dest = destinations.get("WORD_CUSTOM")
-        elif ext in {".potx", ".potm"}:
-            dest = destinations.get("POWERPOINT_CUSTOM")
-        elif ext in {".xltx", ".xltm"}:
-            dest = destinations.get("EXCEL_CUSTOM")
-        else:
-            dest = _destination_for_extension(ext, destinations)
+        dest = route.folder(destinations)
         if dest:
             targets.add(normalize_path(dest / file.name))
     return list(targets)
@@ -494,13 +435,13 @@ def _collect_mru_targets(base_dir: Path, destinations: dict[str, Path]) -> list[
 
 def _clear_mru_for_app(app_label: str, target_paths: Set[str], design_mode: bool) -> None:
     mru_paths = _find_mru_paths(app_label)
-    if design_mode and DESIGN_LOG_MRU:
-        LOGGER.info("[MRU] Cleanup for %s, target paths=%s", app_label, sorted(target_paths))
+    if EVENTS.mru.enabled:
+        EVENTS.mru.info("[MRU] Cleanup for %s, target paths=%s", app_label, sorted(target_paths))
     for mru_path in mru_paths:
         try:
             _rewrite_mru_excluding(mru_path, target_paths, design_mode)
         except OSError as exc:
-            _design_log(DESIGN_LOG_MRU, design_mode, logging.WARNING, "[MRU] Could not clean %s (%s)", mru_path, exc)
+            EVENTS.mru.warning("[MRU] Could not clean %s (%s)", mru_path, exc)
 
 
 # --------------------------------------------------------------------------- #
@@ -512,27 +453,39 @@ def is_windows() -> bool:
     return os.name == "nt"
 
 
-def close_office_apps(design_mode: bool) -> None:
-    if not is_windows():
-        return
-    processes = ("WINWORD.EXE", "POWERPNT.EXE", "EXCEL.EXE", "OUTLOOK.EXE")
-    for exe in processes:
-        try:
-            os.system(f"taskkill /IM {exe} /F >nul 2>&1")
-        except OSError:
-            _design_log(DESIGN_LOG_CLOSE_APPS, design_mode, logging.DEBUG, "[DEBUG] Could not close %s", exe)
-    for exe in processes:
-        try:
-            result = subprocess.run(
-                ["tasklist", "/FI", f"IMAGENAME eq {exe}", "/NH"],
-                capture_output=True,
-                text=True,
-            )
-            output = (result.stdout or "") + (result.stderr or "")
-            if exe.lower() in output.lower():
-                os.system(f"taskkill /IM {exe} /F >nul 2>&1")
-        except OSError:
-            _design_log(DESIGN_LOG_CLOSE_APPS, design_mode, logging.DEBUG, "[DEBUG] Could not verify %s", exe)
+def close_office_apps(
+    design_mode: bool,
+    table: process_manager.WindowsProcessTable | process_manager.FakeProcessTable | None = None,
+    targets: Iterable[Path] | None = None,
+) -> process_manager.ShutdownResult | None:
+    """Close Office; with `targets`, only the apps holding one of them open."""
+    if table is None and not is_windows():
+        return None
+    images: Iterable[str] = process_manager.OFFICE_PROCESSES
+    if targets is not None and CLOSE_OFFICE_APPS_MODE != "always":
+        probe = lock_probe.probe_targets(targets)
+        for path, exc in probe.errors:
+            EVENTS.close_apps.warning("[WARN] Could not check %s for locks (%s)", path, exc)
+        if not probe.locked:
+            EVENTS.close_apps.debug("[DEBUG] No locked targets; Office apps left open")
+            return None
+        if EVENTS.close_apps.enabled:
+            EVENTS.close_apps.debug("[DEBUG] Locked targets: %s", ", ".join(str(path) for path in probe.locked))
+        images = probe.processes
+    try:
+        result = process_manager.close_processes(images, table)
+    except OSError as exc:
+        EVENTS.close_apps.debug("[DEBUG] Could not close Office apps (%s)", exc)
+        return None
+    if result.targeted:
+        EVENTS.close_apps.debug("[DEBUG] Closed %s in %.2fs", ", ".join(result.closed) or "[none]", result.elapsed)
+    for exe in result.remaining:
+        EVENTS.close_apps.debug("[DEBUG] Could not close %s", exe)
+    if result.closed:
+        metrics.METRICS.inc("process_kills_total", len(result.closed), result="closed")
+    if result.remaining:
+        metrics.METRICS.inc("process_kills_total", len(result.remaining), result="remaining")
+    return result
 
 
 
@@ -543,18 +496,7 @@ def close_office_apps(design_mode: bool) -> None:
 
 
 def default_destinations() -> dict[str, Path]:
-    paths = resolve_template_paths()
-    return {
-        "WORD": paths["ROAMING"],
-        "POWERPOINT": paths["ROAMING"],
-        "EXCEL": paths["EXCEL"],
-        "CUSTOM": paths["CUSTOM_WORD"],
-        "WORD_CUSTOM": paths["CUSTOM_WORD"],
-        "POWERPOINT_CUSTOM": paths["CUSTOM_PPT"],
-        "EXCEL_CUSTOM": paths["CUSTOM_EXCEL"],
-        "ROAMING": paths["ROAMING"],
-        "THEMES": paths["THEME"],
-    }
+    return destinations_from_template_paths(resolve_template_paths())
 
 
 def resolve_template_paths() -> dict[str, Path]:
@@ -568,10 +510,22 @@ def resolve_template_paths() -> dict[str, Path]:
     }
 
 
+def template_paths_from_base(base_paths: dict[str, Path]) -> dict[str, Path]:
+    """Template paths from `path_utils` base paths, without environment overrides."""
+    return {
+        "THEME": normalize_path(base_paths["THEME"]),
+        "CUSTOM_WORD": normalize_path(base_paths["CUSTOM_WORD"]),
+        "CUSTOM_PPT": normalize_path(base_paths["CUSTOM_PPT"]),
+        "CUSTOM_EXCEL": normalize_path(base_paths["CUSTOM_EXCEL"]),
+        "ROAMING": normalize_path(base_paths["ROAMING"]),
+        "EXCEL": normalize_path(base_paths["EXCEL_STARTUP"]),
+    }
+
+
 def log_template_paths(paths: dict[str, Path], design_mode: bool) -> None:
-    if not design_mode or not DESIGN_LOG_PATHS:
+    if not EVENTS.paths.enabled:
         return
-    logger = logging.getLogger(__name__)
+    logger = EVENTS.paths
     logger.info("================= CALCULATED PATHS =================")
     logger.info("THEME_PATH                  = %s", paths["THEME"])
     logger.info("CUSTOM_WORD_TEMPLATE_PATH   = %s", paths["CUSTOM_WORD"])
@@ -583,9 +537,9 @@ def log_template_paths(paths: dict[str, Path], design_mode: bool) -> None:
 
 
 def log_template_folder_contents(paths: dict[str, Path], design_mode: bool) -> None:
-    if not design_mode or not (DESIGN_LOG_PATHS or DESIGN_LOG_MRU):
+    if not (EVENTS.paths.enabled or EVENTS.mru.enabled):
         return
-    logger = logging.getLogger(__name__)
+    logger = EVENTS.paths if EVENTS.paths.enabled else EVENTS.mru
     targets = [
         ("THEME_PATH", paths["THEME"]),
         ("CUSTOM_WORD_TEMPLATE_PATH", paths["CUSTOM_WORD"]),
@@ -606,9 +560,9 @@ def log_template_folder_contents(paths: dict[str, Path], design_mode: bool) -> N
 
 
 def log_registry_sources(design_mode: bool) -> None:
-    if not design_mode or not DESIGN_LOG_MRU:
+    if not EVENTS.mru.enabled:
         return
-    logger = logging.getLogger(__name__)
+    logger = EVENTS.mru
     word_personal = path_utils.read_registry_value(
         r"Software\Microsoft\Office\\16.0\\Word\\Options",
         "PersonalTemplates",
@@ -645,16 +599,16 @@ def update_mru_for_template(app_label: str, file_path: Path, design_mode: bool)
     if not is_windows() or winreg is None:
         return
     mru_paths = _find_mru_paths(app_label)
-    if design_mode and DESIGN_LOG_MRU:
-        LOGGER.info("[MRU] Updating MRU for %s at paths: %s", app_label, mru_paths)
+    if EVENTS.mru.enabled:
+        EVENTS.mru.info("[MRU] Updating MRU for %s at paths: %s", app_label, mru_paths)
     for mru_path in mru_paths:
         try:
             _write_mru_entry(mru_path, file_path, design_mode)
         except OSError as exc:
-            if design_mode and DESIGN_LOG_MRU:
-                LOGGER.warning("[MRU] Could not write to %s (%s)", mru_path, exc)
+            EVENTS.mru.warning("[MRU] Could not write to %s (%s)", mru_path, exc)
 
 
+@registry_trace.traced("mru.find_paths")
 def _find_mru_paths(app_label: str) -> list[str]:
     reg_name = _app_registry_name(app_label)
     if not reg_name:
@@ -690,6 +644,7 @@ def _app_registry_name(app_label: str) -> str:
     return mapping.get(app_label.upper(), "")
 
 
+@registry_trace.traced("mru.write")
 def _write_mru_entry(reg_path: str, file_path: Path, design_mode: bool) -> None:
     if winreg is None:
         return
@@ -737,16 +692,19 @@ def _write_mru_entry(reg_path: str, file_path: Path, design_mode: bool) -> None:
         # Limit to e.g. 10 entries
         new_entries = new_entries[:10]
         # Rewrite
+        log_items = EVENTS.mru.enabled
         for idx, entry in enumerate(new_entries, start=1):
             item_name = f"Item {idx}"
             meta_name = f"Item Metadata {idx}"
             reg_value = f"{MRU_VALUE_PREFIX}{entry}"
             meta_value = f"<Metadata><AppSpecific><id>{entry}</id><nm>{basename}</nm><du>{entry}</du></AppSpecific></Metadata>"
-            _design_log(DESIGN_LOG_MRU, design_mode, logging.INFO, "[MRU] %s -> %s", item_name, entry)
-            _design_log(DESIGN_LOG_MRU, design_mode, logging.DEBUG, "[MRU] %s (name=%s)", meta_name, basename)
+            if log_items:
+                EVENTS.mru.info("[MRU] %s -> %s", item_name, entry)
+                EVENTS.mru.debug("[MRU] %s (name=%s)", meta_name, basename)
             winreg.SetValueEx(key, item_name, 0, winreg.REG_SZ, reg_value)
             winreg.SetValueEx(key, meta_name, 0, winreg.REG_SZ, meta_value)
-        _design_log(DESIGN_LOG_MRU, design_mode, logging.INFO, "[MRU] %s updated with %s", reg_path, full_path)
+        EVENTS.mru.info("[MRU] %s updated with %s", reg_path, full_path)
+    metrics.METRICS.inc("mru_writes_total")
 
 
 def _extract_mru_path(raw_value: str) -> Optional[str]:
@@ -758,6 +716,7 @@ def _extract_mru_path(raw_value: str) -> Optional[str]:
     return raw_value.strip() or None
 
 
+@registry_trace.traced("mru.cleanup")
 def _rewrite_mru_excluding(mru_path: str, targets: Set[str], design_mode: bool) -> None:
     """Rewrite the MRU excluding target paths and reindex items."""
     if winreg is None:
@@ -818,20 +777,12 @@ def _rewrite_mru_excluding(mru_path: str, targets: Set[str], design_mode: bool)
         for new_idx, (val, meta_val) in enumerate(filtered, start=1):
             item_name = f"Item {new_idx}"
             meta_name = f"Item Metadata {new_idx}"
-            _design_log(DESIGN_LOG_MRU, design_mode, logging.INFO, "[MRU] Cleanup %s -> %s", item_name, _extract_mru_path(val) or val)
+            if EVENTS.mru.enabled:
+                EVENTS.mru.info("[MRU] Cleanup %s -> %s", item_name, _extract_mru_path(val) or val)
             winreg.SetValueEx(key, item_name, 0, winreg.REG_SZ, val)
             if meta_val:
                 winreg.SetValueEx(key, meta_name, 0, winreg.REG_SZ, meta_val)
-def _destination_for_extension(extension: str, destinations: dict[str, Path]) -> Optional[Path]:
-    if extension in {".dotx", ".dotm"}:
-        return destinations["WORD"]
-    if extension in {".potx", ".potm"}:
-        return destinations["POWERPOINT"]
-    if extension in {".xltx", ".xltm"}:
-        return destinations["EXCEL"]
-    if extension == ".thmx":
-        return destinations["THEMES"]
-    return None
+    metrics.METRICS.inc("mru_cleanups_total")
 
 
 def configure_logging(design_mode: bool) -> None:
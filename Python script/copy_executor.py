@@ -0,0 +1,304 @@
+"""Parallel validate/backup/copy for template payloads."""
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional, Protocol
+
+import common
+import event_log
+
+DEFAULT_COPY_WORKERS = max(1, int(os.environ.get("TemplateCopyWorkers", "8") or 1))
+
+STATUS_COPIED = common.FileOutcome.COPIED.value
+STATUS_MISSING = common.FileOutcome.MISSING.value
+STATUS_NO_DESTINATION = common.FileOutcome.NO_DESTINATION.value
+STATUS_BLOCKED = common.FileOutcome.BLOCKED.value
+STATUS_FAILED = common.FileOutcome.FAILED.value
+STATUS_RESUMED = common.FileOutcome.RESUMED.value
+
+
+class StepJournal(Protocol):
+    def record(self, destination: Path, step: str) -> None: ...
+
+
+@dataclass
+class CopyJob:
+    source: Path
+    destination: Optional[Path]
+    app_label: Optional[str] = None
+    validate: bool = True
+    backup: bool = True
+    update_mru: bool = True
+    resumed: bool = False
+    # Set for bundle members: the data is streamed from `opener` instead of copied from `source`.
+    opener: Optional[Callable[[], BinaryIO]] = None
+    sha256: Optional[str] = None
+    mtime: Optional[float] = None
+    # Author check decided up front (bundle members: from their own manifest entry).
+    author_result: Optional[common.AuthorCheckResult] = None
+
+    @property
+    def is_base(self) -> bool:
+        return self.app_label is not None
+
+
+@dataclass
+class CopyOutcome:
+    job: CopyJob
+    status: str = STATUS_COPIED
+    duration: float = 0.0
+    bytes: int = 0
+    backup: bool = False
+    author: Optional[str] = None
+    logs: list[tuple[event_log.Channel, int, str, tuple[object, ...]]] = field(default_factory=list)
+
+    def log(self, channel: event_log.Channel, level: int, message: str, *args: object) -> None:
+        # Replayed in job order by _apply_outcome; disabled channels keep nothing.
+        if channel.enabled:
+            self.logs.append((channel, level, message, args))
+
+
+def collect_copy_jobs(base_dir: Path, destinations: dict[str, Path]) -> list[CopyJob]:
+    """Return base jobs in their fixed order followed by custom jobs sorted by name."""
+    jobs = [
+        CopyJob(common.normalize_path(base_dir / filename), common.normalize_path(root) / filename, app_label)
+        for app_label, filename, root in common.base_template_targets(destinations)
+    ]
+    jobs.extend(collect_custom_jobs(base_dir, destinations))
+    return jobs
+
+
+def collect_custom_jobs(base_dir: Path, destinations: dict[str, Path]) -> list[CopyJob]:
+    jobs: list[CopyJob] = []
+    for file in sorted(common.iter_template_files(base_dir), key=lambda path: path.name.lower()):
+        if file.name in common.BASE_TEMPLATE_NAMES:
+            continue
+        root = common.custom_destination_for(file.suffix.lower(), destinations)
+        jobs.append(CopyJob(file, root / file.name if root is not None else None))
+    return jobs
+
+
+def volume_key(path: Optional[Path]) -> str:
+    """Group destinations by drive letter or UNC share."""
+    if path is None:
+        return ""
+    drive, _ = os.path.splitdrive(str(path))
+    return (drive or Path(path).anchor).lower()
+
+
+def execute_copy_jobs(
+    jobs: Iterable[CopyJob],
+    results: common.InstallReport,
+    allowed_authors: Iterable[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    max_workers: int = DEFAULT_COPY_WORKERS,
+    journal: StepJournal | None = None,
+    author_results: dict[Path, common.AuthorCheckResult] | None = None,
+) -> list[CopyOutcome]:
+    """Copy on per-volume worker pools, then log, record in `results` and write MRU in job order."""
+    jobs = list(jobs)
+    allowed_authors = list(allowed_authors)
+    volumes: dict[str, list[int]] = {}
+    if max_workers <= 1 and jobs:
+        # One sequential executor whatever the destination volumes, e.g. so bundle
+        # members are read from the archive in order by a single reader.
+        volumes[""] = list(range(len(jobs)))
+    else:
+        for index, job in enumerate(jobs):
+            volumes.setdefault(volume_key(job.destination), []).append(index)
+
+    outcomes: list[Optional[CopyOutcome]] = [None] * len(jobs)
+    per_volume = max(1, max_workers // max(1, len(volumes)))
+    pools = [ThreadPoolExecutor(max_workers=min(per_volume, len(indexes))) for indexes in volumes.values()]
+    try:
+        futures = []
+        for pool, indexes in zip(pools, volumes.values()):
+            for index in indexes:
+                future = pool.submit(
+                    _run_job,
+                    jobs[index],
+                    allowed_authors,
+                    validation_enabled,
+                    design_mode,
+                    journal,
+                    author_results,
+                )
+                futures.append((index, future))
+        for index, future in futures:
+            outcomes[index] = future.result()
+    finally:
+        for pool in pools:
+            pool.shutdown(wait=True)
+
+    ordered = [outcome for outcome in outcomes if outcome is not None]
+    for outcome in ordered:
+        _apply_outcome(outcome, results, design_mode, journal)
+    return ordered
+
+
+def _run_job(
+    job: CopyJob,
+    allowed_authors: list[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    journal: StepJournal | None = None,
+    author_results: dict[Path, common.AuthorCheckResult] | None = None,
+) -> CopyOutcome:
+    started = time.perf_counter()
+    outcome = _copy_job(job, allowed_authors, validation_enabled, design_mode, journal, author_results)
+    outcome.duration = time.perf_counter() - started
+    return outcome
+
+
+def _copy_job(
+    job: CopyJob,
+    allowed_authors: list[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    journal: StepJournal | None = None,
+    author_results: dict[Path, common.AuthorCheckResult] | None = None,
+) -> CopyOutcome:
+    outcome = CopyOutcome(job)
+    if _check_job(outcome, allowed_authors, validation_enabled, design_mode, author_results):
+        _copy_checked(outcome, journal)
+    return outcome
+
+
+def _copy_channel(job: CopyJob) -> event_log.Channel:
+    return common.EVENTS.copy_base if job.is_base else common.EVENTS.copy_custom
+
+
+def _check_job(
+    outcome: CopyOutcome,
+    allowed_authors: list[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    author_results: dict[Path, common.AuthorCheckResult] | None = None,
+) -> bool:
+    """Source, resume and author checks; True when the job still has to be copied."""
+    return _scan_job(outcome) and _validate_job(
+        outcome, allowed_authors, validation_enabled, design_mode, author_results
+    )
+
+
+def _scan_job(outcome: CopyOutcome) -> bool:
+    """Destination, source and resume checks; True when the job still needs its author check."""
+    job = outcome.job
+    copy_channel = _copy_channel(job)
+    filename = job.source.name
+    if job.destination is None:
+        outcome.status = STATUS_NO_DESTINATION
+        outcome.log(copy_channel, logging.WARNING, "[WARNING] No destination for %s", filename)
+        return False
+    if job.is_base and job.opener is None and not job.source.exists():
+        outcome.status = STATUS_MISSING
+        outcome.log(copy_channel, logging.WARNING, "[WARNING] Source file not found: %s", job.source)
+        return False
+    if job.resumed:
+        outcome.status = STATUS_RESUMED
+        outcome.log(copy_channel, logging.INFO, "[SKIP] Already copied %s to %s", filename, job.destination)
+        return False
+    return True
+
+
+def _validate_job(
+    outcome: CopyOutcome,
+    allowed_authors: list[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    author_results: dict[Path, common.AuthorCheckResult] | None = None,
+) -> bool:
+    """Author check; True when the job may be copied."""
+    job = outcome.job
+    if job.validate:
+        result = job.author_result
+        if result is None and author_results is not None:
+            result = author_results.get(job.source)
+        if result is None:
+            result = common.check_template_author(
+                job.source,
+                allowed_authors=allowed_authors,
+                validation_enabled=validation_enabled,
+                design_mode=design_mode,
+                log_callback=functools.partial(outcome.log, common.EVENTS.author) if common.EVENTS.author.enabled else None,
+            )
+        outcome.author = "; ".join(result.authors) or None
+        if not result.allowed:
+            outcome.status = STATUS_BLOCKED
+            outcome.log(common.EVENTS.author, logging.WARNING, result.message)
+            return False
+    return True
+
+
+def _copy_checked(outcome: CopyOutcome, journal: StepJournal | None = None) -> None:
+    """Back up the current destination, then copy or stream the template over it."""
+    job = outcome.job
+    copy_channel = _copy_channel(job)
+    filename = job.source.name
+    if job.backup:
+        try:
+            backup_path = common.create_backup(job.destination)
+            if backup_path is not None:
+                outcome.backup = True
+                outcome.log(common.EVENTS.backup, logging.INFO, "[BACKUP] Copy created at %s", backup_path)
+                if journal is not None:
+                    journal.record(job.destination, "backup")
+        except OSError as exc:
+            outcome.log(
+                common.EVENTS.backup,
+                logging.WARNING,
+                "[WARN] Could not create backup of %s (%s)",
+                job.destination,
+                exc,
+            )
+    try:
+        if job.opener is not None:
+            with job.opener() as reader:
+                strategy = common.stream_to_destination(reader, job.destination, job.sha256, job.mtime)
+        else:
+            strategy = common.ensure_parents_and_copy(job.source, job.destination)
+        outcome.bytes = _file_size(job.destination)
+        outcome.log(copy_channel, logging.INFO, "[OK] Copied %s to %s", filename, job.destination)
+        outcome.log(copy_channel, logging.DEBUG, "[DEBUG] Copy strategy for %s: %s", filename, strategy)
+        if journal is not None:
+            journal.record(job.destination, "copy")
+    except OSError as exc:
+        outcome.status = STATUS_FAILED
+        outcome.log(copy_channel, logging.ERROR, "[ERROR] Copy failed for %s (%s)", filename, exc)
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def _apply_outcome(
+    outcome: CopyOutcome,
+    results: common.InstallReport,
+    design_mode: bool,
+    journal: StepJournal | None = None,
+) -> None:
+    for channel, level, message, args in outcome.logs:
+        channel.log(level, message, *args)
+    job = outcome.job
+    results.add(job.source, job.destination, outcome.status, outcome.bytes, outcome.duration, outcome.author)
+    if outcome.status in {STATUS_COPIED, STATUS_RESUMED}:
+        if _write_mru(job, design_mode) and journal is not None:
+            journal.record(job.destination, "mru")
+
+
+def _write_mru(job: CopyJob, design_mode: bool) -> bool:
+    """Single MRU writer: only ever called from the coordinating thread."""
+    if job.destination is None or not job.update_mru:
+        return False
+    common._update_mru_if_applicable(job.destination, design_mode)
+    return True
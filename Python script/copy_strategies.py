@@ -0,0 +1,144 @@
+"""Pick the cheapest correct file-copy primitive per volume pair."""
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    import fcntl  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+STRATEGY_REFLINK = "reflink"
+STRATEGY_COPY_FILE_RANGE = "copy_file_range"
+STRATEGY_SENDFILE = "sendfile"
+STRATEGY_HARDLINK = "hardlink"
+STRATEGY_COPYFILE = "copyfile"
+
+# ioctl request number for FICLONE (Btrfs, XFS, bcachefs, OCFS2).
+FICLONE = 0x40049409
+_IS_LINUX = sys.platform.startswith("linux")
+# Errors meaning "this primitive cannot do this copy"; anything else (EIO, EBADF,
+# ENOSPC...) is a real failure and is raised instead of retried with a slower strategy.
+_FALLBACK_ERRNOS = {
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    # copy_file_range/sendfile under seccomp filters and some network filesystems.
+    errno.EPERM,
+}
+
+
+def _unsupported(name: str) -> OSError:
+    return OSError(errno.ENOTSUP, f"{name} is not supported here")
+
+
+def _copy_reflink(source: Path, destination: Path) -> None:
+    if fcntl is None or not _IS_LINUX:
+        raise _unsupported(STRATEGY_REFLINK)
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError as exc:
+            # Filesystems without the clone ioctl at all answer ENOTTY.
+            if exc.errno == errno.ENOTTY:
+                raise _unsupported(STRATEGY_REFLINK) from exc
+            raise
+
+
+def _copy_kernel(source: Path, destination: Path, use_sendfile: bool) -> None:
+    name = STRATEGY_SENDFILE if use_sendfile else STRATEGY_COPY_FILE_RANGE
+    if not _IS_LINUX or not hasattr(os, "sendfile" if use_sendfile else "copy_file_range"):
+        raise _unsupported(name)
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        copied = 0
+        while copied < size:
+            if use_sendfile:
+                sent = os.sendfile(dst.fileno(), src.fileno(), copied, size - copied)
+            else:
+                sent = os.copy_file_range(src.fileno(), dst.fileno(), size - copied)
+            if sent == 0:
+                break
+            copied += sent
+        if copied != size:
+            raise OSError(errno.EIO, f"{name} stopped after {copied} of {size} bytes")
+
+
+def _copy_file_range(source: Path, destination: Path) -> None:
+    _copy_kernel(source, destination, use_sendfile=False)
+
+
+def _copy_sendfile(source: Path, destination: Path) -> None:
+    _copy_kernel(source, destination, use_sendfile=True)
+
+
+def _copy_userspace(source: Path, destination: Path) -> None:
+    shutil.copyfile(source, destination)
+
+
+STRATEGIES: dict[str, Callable[[Path, Path], None]] = {
+    STRATEGY_REFLINK: _copy_reflink,
+    STRATEGY_COPY_FILE_RANGE: _copy_file_range,
+    STRATEGY_SENDFILE: _copy_sendfile,
+    STRATEGY_COPYFILE: _copy_userspace,
+}
+STRATEGY_ORDER = (STRATEGY_REFLINK, STRATEGY_COPY_FILE_RANGE, STRATEGY_SENDFILE, STRATEGY_COPYFILE)
+
+_lock = threading.Lock()
+_unsupported_by_volume: dict[tuple[int, int], set[str]] = {}
+
+
+def _volume_pair(source: Path, destination: Path) -> tuple[int, int]:
+    try:
+        return os.stat(source).st_dev, os.stat(destination.parent).st_dev
+    except OSError:
+        return -1, -1
+
+
+def copy_file(source: Path, destination: Path, strategy: Optional[str] = None) -> str:
+    """Copy data and metadata like shutil.copy2; return the strategy that worked."""
+    if strategy is not None:
+        STRATEGIES[strategy](source, destination)
+        shutil.copystat(source, destination)
+        return strategy
+
+    key = _volume_pair(source, destination)
+    with _lock:
+        skipped = set(_unsupported_by_volume.get(key, ()))
+    for name in STRATEGY_ORDER:
+        if name in skipped:
+            continue
+        try:
+            STRATEGIES[name](source, destination)
+        except OSError as exc:
+            if name == STRATEGY_COPYFILE or exc.errno not in _FALLBACK_ERRNOS:
+                raise
+            with _lock:
+                _unsupported_by_volume.setdefault(key, set()).add(name)
+            continue
+        shutil.copystat(source, destination)
+        return name
+    raise _unsupported("copy")  # pragma: no cover - copyfile always runs last
+
+
+def link_or_copy(source: Path, destination: Path) -> str:
+    """Hardlink an immutable blob (e.g. a backup), falling back to a real copy."""
+    try:
+        os.link(source, destination)
+        return STRATEGY_HARDLINK
+    except OSError:
+        return copy_file(source, destination)
+
+
+def unsupported_strategies() -> dict[tuple[int, int], list[str]]:
+    """Strategies ruled out per (source, destination) volume pair, for diagnostics."""
+    with _lock:
+        return {key: sorted(names) for key, names in _unsupported_by_volume.items()}
@@ -14,7 +14,7 @@ except ImportError:  # pragma: no cover - allow direct execution as a script
 
 def delete_normal_templates() -> None:
     design_mode = common.DEFAULT_DESIGN_MODE
-    common.refresh_design_log_flags(design_mode)
+    common.configure_events(design_mode)
     if design_mode:
         common.configure_logging(design_mode)
         common.remove_normal_templates(design_mode, emit=print)
@@ -0,0 +1,162 @@
+"""Per-category event logging with an optional JSONL sink.
+
+Each design-log category is a ``Channel`` whose ``enabled`` flag is resolved
+once per run by ``EventLog.configure``. Hot paths check that attribute
+before formatting or allocating anything:
+
+    if EVENTS.mru.enabled:
+        EVENTS.mru.info("[MRU] %s -> %s", item_name, entry)
+
+Console output keeps the existing design-mode rules (IsDesignModeEnabled
+plus the DesignLog* variables and the MANUAL_DESIGN_LOG_* overrides in
+common). With a JSONL sink (TemplateEventLog or --event-log) every category
+is also written as one JSON object per line, design mode or not.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, TextIO
+
+EVENT_LOG_PATH = os.environ.get("TemplateEventLog", "")
+
+# Category name -> environment variable that overrides it.
+CATEGORIES = {
+    "paths": "DesignLogPaths",
+    "mru": "DesignLogMRU",
+    "author": "DesignLogAuthor",
+    "copy_base": "DesignLogCopyBase",
+    "copy_custom": "DesignLogCopyCustom",
+    "backup": "DesignLogBackup",
+    "close_apps": "DesignLogCloseApps",
+    "installer": "DesignLogInstaller",
+    "uninstaller": "DesignLogUninstaller",
+}
+
+
+class JsonlSink:
+    """Appends one JSON object per event; safe to share between worker threads."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stream: TextIO = open(self.path, "a", encoding="utf-8")
+
+    def write(self, category: str, level: int, message: str, args: tuple[object, ...]) -> None:
+        try:
+            text = message % args if args else message
+        except (TypeError, ValueError):
+            text = " ".join([message, *map(str, args)])
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "category": category,
+            "level": logging.getLevelName(level),
+            "event": message,
+            "args": [str(arg) for arg in args],
+            "text": text,
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._stream.write(line)
+            self._stream.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._stream.close()
+
+
+class Channel:
+    __slots__ = ("name", "enabled", "console", "sink", "_logger")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.enabled = False
+        self.console = False
+        self.sink: Optional[JsonlSink] = None
+        self._logger = logging.getLogger(f"events.{name}")
+
+    def log(self, level: int, message: str, *args: object) -> None:
+        if not self.enabled:
+            return
+        if self.console:
+            self._logger.log(level, message, *args)
+        if self.sink is not None:
+            self.sink.write(self.name, level, message, args)
+
+    def debug(self, message: str, *args: object) -> None:
+        self.log(logging.DEBUG, message, *args)
+
+    def info(self, message: str, *args: object) -> None:
+        self.log(logging.INFO, message, *args)
+
+    def warning(self, message: str, *args: object) -> None:
+        self.log(logging.WARNING, message, *args)
+
+    def error(self, message: str, *args: object) -> None:
+        self.log(logging.ERROR, message, *args)
+
+
+class EventLog:
+    paths: Channel
+    mru: Channel
+    author: Channel
+    copy_base: Channel
+    copy_custom: Channel
+    backup: Channel
+    close_apps: Channel
+    installer: Channel
+    uninstaller: Channel
+
+    def __init__(self) -> None:
+        self.sink: Optional[JsonlSink] = None
+        for name in CATEGORIES:
+            setattr(self, name, Channel(name))
+
+    def channel(self, name: str) -> Channel:
+        return getattr(self, name)
+
+    def configure(
+        self,
+        design_mode: bool,
+        overrides: Optional[dict[str, Optional[bool]]] = None,
+        jsonl_path: Optional[Path | str] = None,
+    ) -> None:
+        """Resolve every category for this run; call again to switch modes or sinks."""
+        overrides = overrides or {}
+        jsonl_path = jsonl_path or EVENT_LOG_PATH or None
+        if self.sink is not None and (jsonl_path is None or Path(jsonl_path) != self.sink.path):
+            self.sink.close()
+            self.sink = None
+        if jsonl_path is not None and self.sink is None:
+            self.sink = JsonlSink(jsonl_path)
+        for name, env_var in CATEGORIES.items():
+            channel = self.channel(name)
+            channel.console = design_mode and _category_flag(env_var, overrides.get(name), design_mode)
+            channel.sink = self.sink
+            channel.enabled = channel.console or channel.sink is not None
+
+    def close(self) -> None:
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
+        for name in CATEGORIES:
+            channel = self.channel(name)
+            channel.sink = None
+            channel.enabled = channel.console
+
+
+def _category_flag(env_var: str, manual_override: Optional[bool], fallback: bool) -> bool:
+    if manual_override is not None:
+        return bool(manual_override)
+    raw = os.environ.get(env_var)
+    if raw is None:
+        return fallback
+    return raw.lower() == "true"
+
+
+EVENTS = EventLog()
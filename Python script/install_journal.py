@@ -0,0 +1,153 @@
+"""Write-ahead journal so an interrupted install can resume."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import common
+import install_plan
+
+STEP_BACKUP = "backup"
+STEP_COPY = "copy"
+STEP_MRU = "mru"
+
+JOURNAL_ENABLED = os.environ.get("InstallJournalEnabled", "true").lower() != "false"
+JOURNAL_FSYNC = os.environ.get("InstallJournalFsync", "false").lower() == "true"
+
+
+def _signature(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def payload_key(base_dir: Path) -> str:
+    """Identify a payload by folder and file signatures so edits start a new journal."""
+    digest = hashlib.sha1(os.path.normcase(str(common.normalize_path(base_dir))).encode("utf-8"))
+    for file in sorted(common.iter_template_files(base_dir), key=lambda path: path.name.lower()):
+        signature = _signature(file)
+        digest.update(f"|{file.name}|{signature}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class InstallJournal:
+    """Append-only record of completed install steps for one payload and profile."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: dict[str, set[str]] = {}
+        # Destination (size, mtime_ns) right after each recorded copy.
+        self._copies: dict[str, tuple[int, int]] = {}
+        self._handle = None
+
+    @classmethod
+    def for_payload(cls, base_dir: Path, state_dir: Path | None = None) -> "InstallJournal":
+        root = common.normalize_path(state_dir or common.INSTALLER_STATE_DIR)
+        journal = cls(root / "journal" / f"{payload_key(base_dir)}.jsonl")
+        journal.load()
+        return journal
+
+    def load(self) -> None:
+        self._done.clear()
+        self._copies.clear()
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted write is ignored.
+                        continue
+                    key = record["destination"].lower()
+                    self._done.setdefault(key, set()).add(record["step"])
+                    if "size" in record and "mtime_ns" in record:
+                        self._copies[key] = (record["size"], record["mtime_ns"])
+        except OSError:
+            pass
+
+    def is_done(self, destination: Path, step: str) -> bool:
+        return step in self._done.get(str(destination).lower(), set())
+
+    def copy_signature(self, destination: Path) -> Optional[tuple[int, int]]:
+        return self._copies.get(str(destination).lower())
+
+    def record(self, destination: Path, step: str) -> None:
+        entry: dict[str, object] = {"step": step, "destination": str(destination)}
+        signature = _signature(destination) if step == STEP_COPY else None
+        if signature is not None:
+            entry["size"], entry["mtime_ns"] = signature
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            if self._handle is None:
+                common.ensure_directory(self.path.parent)
+                self._handle = open(self.path, "a", encoding="utf-8")
+            self._handle.write(line)
+            self._handle.flush()
+            if JOURNAL_FSYNC:
+                os.fsync(self._handle.fileno())
+            self._done.setdefault(str(destination).lower(), set()).add(step)
+            if signature is not None:
+                self._copies[str(destination).lower()] = signature
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def discard(self) -> None:
+        """Drop the journal once a run finishes cleanly."""
+        self.close()
+        self._done.clear()
+        self._copies.clear()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def apply_journal(plan: install_plan.InstallPlan, journal: InstallJournal) -> int:
+    """Remove steps the journal already committed; return how many items resume."""
+    resumed = 0
+    for item in plan.items:
+        destination = item.destination
+        if destination is None or not item.has(install_plan.CopyOp.kind):
+            continue
+        touched = False
+        if journal.is_done(destination, STEP_COPY) and _copy_intact(
+            item.source, destination, journal.copy_signature(destination)
+        ):
+            item.drop(install_plan.ValidateOp.kind)
+            item.drop(install_plan.BackupOp.kind)
+            item.drop(install_plan.CopyOp.kind)
+            item.operations.append(install_plan.SkipOp(reason=install_plan.SKIP_RESUMED))
+            touched = True
+            if journal.is_done(destination, STEP_MRU):
+                item.drop(install_plan.MruAddOp.kind)
+        elif journal.is_done(destination, STEP_BACKUP):
+            # The destination may hold a half-written copy now; never back that up.
+            item.drop(install_plan.BackupOp.kind)
+            touched = True
+        resumed += touched
+    return resumed
+
+
+def _copy_intact(source: Path, destination: Path, recorded: Optional[tuple[int, int]]) -> bool:
+    """True when `destination` is still the file the journalled copy wrote.
+
+    Size alone passes a torn or partly overwritten copy of the same length,
+    so the destination must also match the size and mtime recorded right
+    after the copy. Entries without a signature (older journals) recopy.
+    """
+    source_sig = _signature(source)
+    destination_sig = _signature(destination)
+    if source_sig is None or destination_sig is None or recorded is None:
+        return False
+    return source_sig[0] == destination_sig[0] and destination_sig == recorded
@@ -0,0 +1,230 @@
+"""Build an install plan up front and apply it separately."""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar, Iterable, Optional
+
+import async_pipeline
+import common
+import copy_executor
+
+
+SKIP_SOURCE_MISSING = "source-missing"
+SKIP_NO_DESTINATION = "no-destination"
+SKIP_RESUMED = "resumed"
+SKIP_UNCHANGED = "unchanged"
+
+
+@dataclass
+class PlanOperation:
+    kind: ClassVar[str] = ""
+
+    def to_dict(self) -> dict[str, object]:
+        return {"kind": self.kind}
+
+
+@dataclass
+class ValidateOp(PlanOperation):
+    kind: ClassVar[str] = "validate"
+
+
+@dataclass
+class BackupOp(PlanOperation):
+    kind: ClassVar[str] = "backup"
+    bytes: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {"kind": self.kind, "bytes": self.bytes}
+
+
+@dataclass
+class CopyOp(PlanOperation):
+    kind: ClassVar[str] = "copy"
+    bytes: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {"kind": self.kind, "bytes": self.bytes}
+
+
+@dataclass
+class SkipOp(PlanOperation):
+    kind: ClassVar[str] = "skip"
+    reason: str = ""
+    counts_as_error: bool = False
+
+    def to_dict(self) -> dict[str, object]:
+        return {"kind": self.kind, "reason": self.reason, "error": self.counts_as_error}
+
+
+@dataclass
+class MruAddOp(PlanOperation):
+    kind: ClassVar[str] = "mru-add"
+    app_label: str = ""
+
+    def to_dict(self) -> dict[str, object]:
+        return {"kind": self.kind, "app": self.app_label}
+
+
+@dataclass
+class PlanItem:
+    source: Path
+    destination: Optional[Path]
+    app_label: Optional[str]
+    operations: list[PlanOperation] = field(default_factory=list)
+
+    def has(self, kind: str) -> bool:
+        return any(op.kind == kind for op in self.operations)
+
+    def drop(self, kind: str) -> None:
+        self.operations = [op for op in self.operations if op.kind != kind]
+
+    def to_job(self) -> copy_executor.CopyJob:
+        return copy_executor.CopyJob(
+            self.source,
+            self.destination,
+            self.app_label,
+            validate=self.has(ValidateOp.kind),
+            backup=self.has(BackupOp.kind),
+            update_mru=self.has(MruAddOp.kind),
+            resumed=any(isinstance(op, SkipOp) and op.reason == SKIP_RESUMED for op in self.operations),
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "source": str(self.source),
+            "destination": str(self.destination) if self.destination else "",
+            "app": self.app_label or "",
+            "operations": [op.to_dict() for op in self.operations],
+        }
+
+
+@dataclass
+class InstallPlan:
+    base_dir: Path
+    items: list[PlanItem] = field(default_factory=list)
+    removals: list[Path] = field(default_factory=list)
+
+    @property
+    def estimated_bytes(self) -> int:
+        return sum(
+            op.bytes for item in self.items for op in item.operations if isinstance(op, (BackupOp, CopyOp))
+        )
+
+    def operation_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for item in self.items:
+            for op in item.operations:
+                counts[op.kind] = counts.get(op.kind, 0) + 1
+        return counts
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "base_dir": str(self.base_dir),
+            "estimated_bytes": self.estimated_bytes,
+            "operations": self.operation_counts(),
+            "items": [item.to_dict() for item in self.items],
+            "removals": [str(path) for path in self.removals],
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+def _file_size(path: Optional[Path]) -> Optional[int]:
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def build_install_plan(base_dir: Path, destinations: dict[str, Path]) -> InstallPlan:
+    """Describe every operation an install from `base_dir` would perform."""
+    plan = InstallPlan(common.normalize_path(base_dir))
+    for job in copy_executor.collect_copy_jobs(base_dir, destinations):
+        item = PlanItem(job.source, job.destination, job.app_label)
+        plan.items.append(item)
+        if job.destination is None:
+            item.operations.append(SkipOp(reason=SKIP_NO_DESTINATION))
+            continue
+        source_size = _file_size(job.source)
+        if source_size is None:
+            item.operations.append(SkipOp(reason=SKIP_SOURCE_MISSING, counts_as_error=job.is_base))
+            continue
+        item.operations.append(ValidateOp())
+        existing_size = _file_size(job.destination)
+        if existing_size is not None:
+            item.operations.append(BackupOp(bytes=existing_size))
+        item.operations.append(CopyOp(bytes=source_size))
+        mru_app = common.ROUTES.mru_app(job.destination.name)
+        if mru_app:
+            item.operations.append(MruAddOp(app_label=mru_app))
+    return plan
+
+
+def planned_targets(plan: InstallPlan) -> list[Path]:
+    targets = [item.destination for item in plan.items if item.destination is not None and item.has(CopyOp.kind)]
+    return targets + list(plan.removals)
+
+
+def is_unchanged(item: PlanItem) -> bool:
+    return any(isinstance(op, SkipOp) and op.reason == SKIP_UNCHANGED for op in item.operations)
+
+
+def planned_directories(plan: InstallPlan) -> list[Path]:
+    """Destination and Backups folders the plan writes into, each listed once."""
+    folders: dict[str, Path] = {}
+    for item in plan.items:
+        if item.destination is None:
+            continue
+        if item.has(CopyOp.kind):
+            folders.setdefault(os.path.normcase(str(item.destination.parent)), item.destination.parent)
+        if item.has(BackupOp.kind):
+            backups = item.destination.parent / "Backups"
+            folders.setdefault(os.path.normcase(str(backups)), backups)
+    return list(folders.values())
+
+
+def execute_install_plan(
+    plan: InstallPlan,
+    results: common.InstallReport,
+    allowed_authors: Iterable[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    journal: copy_executor.StepJournal | None = None,
+    author_results: dict[Path, common.AuthorCheckResult] | None = None,
+    max_workers: int = copy_executor.DEFAULT_COPY_WORKERS,
+) -> list[copy_executor.CopyOutcome]:
+    """Apply `plan` through the copy executor (or the asyncio pipeline when enabled)."""
+    for folder in planned_directories(plan):
+        try:
+            common.ensure_directory(folder)
+        except OSError:
+            # Leave it to the copy itself to report the failure for each file.
+            pass
+    jobs = [item.to_job() for item in plan.items if not is_unchanged(item)]
+    if async_pipeline.ASYNC_PIPELINE_ENABLED:
+        return async_pipeline.execute_pipeline(
+            jobs,
+            results,
+            allowed_authors,
+            validation_enabled,
+            design_mode,
+            copy_workers=max_workers,
+            journal=journal,
+            author_results=author_results,
+        )
+    return copy_executor.execute_copy_jobs(
+        jobs,
+        results,
+        allowed_authors,
+        validation_enabled,
+        design_mode,
+        max_workers=max_workers,
+        journal=journal,
+        author_results=author_results,
+    )
@@ -0,0 +1,127 @@
+"""Per-file install outcomes returned by the installer.
+
+``InstallReport`` replaces the old InstallFlags counters: every template the
+copy step handled gets a ``FileResult`` (source, destination, outcome, bytes,
+duration, author), and ``totals`` keeps the files/errors/blocked view the
+final log line, metrics and the agent reply are built from. Fleet tooling
+can read ``to_dict()`` (or ``--results RUTA``) instead of re-scanning the
+destination folders.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+class FileOutcome(str, Enum):
+    COPIED = "copied"
+    RESUMED = "resumed"
+    BLOCKED = "blocked"
+    MISSING = "missing"
+    FAILED = "failed"
+    NO_DESTINATION = "no-destination"
+
+
+# Which of InstallReport.totals each outcome counts towards.
+_TOTALS = {
+    FileOutcome.COPIED: "files",
+    FileOutcome.RESUMED: "files",
+    FileOutcome.BLOCKED: "blocked",
+    FileOutcome.MISSING: "errors",
+    FileOutcome.FAILED: "errors",
+}
+
+
+@dataclass(frozen=True)
+class FileResult:
+    source: str
+    destination: str
+    outcome: FileOutcome
+    bytes: int = 0
+    duration: float = 0.0
+    author: Optional[str] = None
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "source": self.source,
+            "destination": self.destination,
+            "outcome": self.outcome.value,
+            "bytes": self.bytes,
+            "duration": round(self.duration, 6),
+            "author": self.author,
+        }
+
+
+@dataclass
+class InstallReport:
+    files: list[FileResult] = field(default_factory=list)
+    totals: dict[str, int] = field(default_factory=lambda: {"files": 0, "errors": 0, "blocked": 0})
+    # Process exit code for 01_installer.main (0 also when nothing had to be installed).
+    exit_code: int = 0
+
+    def add(
+        self,
+        source: Path | str,
+        destination: Optional[Path | str],
+        outcome: FileOutcome | str,
+        size: int = 0,
+        duration: float = 0.0,
+        author: Optional[str] = None,
+    ) -> FileResult:
+        outcome = FileOutcome(outcome)
+        result = FileResult(str(source), str(destination or ""), outcome, size, duration, author)
+        self.files.append(result)
+        total = _TOTALS.get(outcome)
+        if total is not None:
+            self.totals[total] += 1
+        return result
+
+    def __iter__(self) -> Iterator[FileResult]:
+        return iter(self.files)
+
+    def by_outcome(self, outcome: FileOutcome | str) -> list[FileResult]:
+        outcome = FileOutcome(outcome)
+        return [result for result in self.files if result.outcome is outcome]
+
+    def outcome_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for result in self.files:
+            counts[result.outcome.value] = counts.get(result.outcome.value, 0) + 1
+        return counts
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(result.bytes for result in self.files if result.outcome is FileOutcome.COPIED)
+
+    @property
+    def duration(self) -> float:
+        return sum(result.duration for result in self.files)
+
+    @property
+    def ok(self) -> bool:
+        return self.totals["errors"] == 0 and self.totals["blocked"] == 0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "totals": dict(self.totals),
+            "outcomes": self.outcome_counts(),
+            "bytes_written": self.bytes_written,
+            "duration": round(self.duration, 6),
+            "exit_code": self.exit_code,
+            "files": [result.to_dict() for result in self.files],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def write(self, path: Path | str) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + ".part")
+        with open(temp, "w", encoding="utf-8") as handle:
+            handle.write(self.to_json())
+        os.replace(temp, path)
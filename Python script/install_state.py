@@ -0,0 +1,210 @@
+"""Last installed state per payload and profile, used by delta sync."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import common
+import copy_executor
+import install_plan
+import uninstall_plan
+
+STATE_VERSION = 1
+_HASH_CHUNK = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def authors_fingerprint(allowed_authors: Iterable[str], validation_enabled: bool) -> str:
+    """Blocked results are only reusable while the author policy is unchanged."""
+    normalized = sorted({author.strip().lower() for author in allowed_authors if author.strip()})
+    return hashlib.sha1(f"{validation_enabled}|{';'.join(normalized)}".encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class FileState:
+    sha256: str
+    size: int
+    mtime_ns: int
+    destination: str
+    blocked: bool = False
+
+
+class InstallState:
+    """Names, hashes and destinations of the templates a payload last installed."""
+
+    def __init__(self, path: Path, files: dict[str, FileState] | None = None) -> None:
+        self.path = path
+        self.files: dict[str, FileState] = files or {}
+        self.authors = ""
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+
+    @classmethod
+    def for_payload(cls, base_dir: Path, state_dir: Path | None = None) -> "InstallState":
+        root = common.normalize_path(state_dir or common.INSTALLER_STATE_DIR)
+        key = hashlib.sha1(os.path.normcase(str(common.normalize_path(base_dir))).encode("utf-8")).hexdigest()[:16]
+        state = cls(root / "state" / f"{key}.json")
+        state.load()
+        return state
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if raw.get("version") != STATE_VERSION:
+            return
+        self.files = {name: FileState(**record) for name, record in raw.get("files", {}).items()}
+        self.authors = raw.get("authors", "")
+
+    def save(self) -> None:
+        common.ensure_directory(self.path.parent)
+        payload = {
+            "version": STATE_VERSION,
+            "authors": self.authors,
+            "files": {name: asdict(record) for name, record in self.files.items()},
+        }
+        handle, temp_name = tempfile.mkstemp(prefix=common.STAGED_TEMP_PREFIX, suffix=".part", dir=self.path.parent)
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as temp:
+                json.dump(payload, temp, indent=1, sort_keys=True)
+            os.replace(temp_name, self.path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+
+    def discard(self) -> None:
+        self.files.clear()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def source_hash(self, source: Path) -> Optional[str]:
+        """Hash `source`, reusing the recorded hash while size and mtime are unchanged."""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        cached = self._hashes.get(source.name)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        record = self.files.get(source.name)
+        if record and (record.size, record.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            digest = record.sha256
+        else:
+            digest = hash_file(source)
+        self._hashes[source.name] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def record_install(
+        self,
+        outcomes: Iterable[copy_executor.CopyOutcome],
+        removal_results: Iterable[uninstall_plan.OperationResult] = (),
+        authors: str = "",
+    ) -> None:
+        if authors != self.authors:
+            self.files = {name: record for name, record in self.files.items() if not record.blocked}
+            self.authors = authors
+        recorded = {copy_executor.STATUS_COPIED, copy_executor.STATUS_RESUMED, copy_executor.STATUS_BLOCKED}
+        for outcome in outcomes:
+            job = outcome.job
+            if outcome.status not in recorded:
+                continue
+            digest = self.source_hash(job.source)
+            if digest is None or job.destination is None:
+                continue
+            size, mtime_ns, _ = self._hashes[job.source.name]
+            blocked = outcome.status == copy_executor.STATUS_BLOCKED
+            if blocked and job.source.name in self.files and not self.files[job.source.name].blocked:
+                # An earlier approved version is still installed; keep tracking it.
+                continue
+            self.files[job.source.name] = FileState(digest, size, mtime_ns, str(job.destination), blocked)
+        removed = {
+            os.path.normcase(result.target)
+            for result in removal_results
+            if result.kind == "delete"
+            and result.outcome in {uninstall_plan.OUTCOME_DELETED, uninstall_plan.OUTCOME_MISSING}
+        }
+        for name, record in list(self.files.items()):
+            if os.path.normcase(record.destination) in removed:
+                del self.files[name]
+
+
+def _destination_matches(destination: Path, record: FileState) -> bool:
+    """True when the installed copy is still the recorded template.
+
+    Copies keep the source's mtime, so size plus mtime_ns is the fast path;
+    a destination whose mtime differs is hashed before it counts as current.
+    """
+    try:
+        stat = os.stat(destination)
+        if stat.st_size != record.size:
+            return False
+        if stat.st_mtime_ns == record.mtime_ns:
+            return True
+        return hash_file(destination) == record.sha256
+    except OSError:
+        return False
+
+
+def apply_delta(plan: install_plan.InstallPlan, state: InstallState, authors: str = "") -> int:
+    """Skip unchanged templates and queue removals; return the number of changes."""
+    if authors != state.authors:
+        # A different author policy may unblock or block templates: re-validate them.
+        state.files = {name: record for name, record in state.files.items() if not record.blocked}
+    changes = 0
+    current: dict[str, str] = {}
+    for item in plan.items:
+        if item.destination is None or not item.has(install_plan.CopyOp.kind):
+            continue
+        name = item.source.name
+        current[name] = str(item.destination)
+        record = state.files.get(name)
+        if (
+            record is not None
+            and record.destination == str(item.destination)
+            and (record.blocked or _destination_matches(item.destination, record))
+            and state.source_hash(item.source) == record.sha256
+        ):
+            item.operations = [install_plan.SkipOp(reason=install_plan.SKIP_UNCHANGED)]
+            continue
+        changes += 1
+    for name, record in list(state.files.items()):
+        if current.get(name) == record.destination:
+            continue
+        if record.blocked:
+            # Never installed, so there is nothing to remove.
+            del state.files[name]
+            continue
+        plan.removals.append(Path(record.destination))
+        changes += 1
+    return changes
+
+
+def execute_removals(plan: install_plan.InstallPlan, design_mode: bool) -> list[uninstall_plan.OperationResult]:
+    """Delete templates dropped from the payload and clear their MRU entries."""
+    if not plan.removals:
+        return []
+    removal_plan = uninstall_plan.UninstallPlan()
+    for path in plan.removals:
+        removal_plan.add_delete(path, backup=path.name in common.BASE_TEMPLATE_NAMES, requested_by="sync")
+    removal_plan.mru_cleanups = uninstall_plan.group_mru_cleanups(
+        path for path in plan.removals if common._should_update_mru(path)
+    )
+    return uninstall_plan.execute_uninstall_plan(removal_plan, design_mode)
@@ -0,0 +1,81 @@
+"""Detect destination files held open by Office before replacing them."""
+from __future__ import annotations
+
+import errno
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import routing
+
+OWNER_FILE_PREFIX = "~$"
+# ERROR_SHARING_VIOLATION and ERROR_LOCK_VIOLATION; any other access error is not a lock.
+LOCK_WINERRORS = frozenset({32, 33})
+LOCK_ERRNOS = frozenset({errno.EBUSY, errno.ETXTBSY})
+
+
+@dataclass
+class LockProbeResult:
+    locked: list[Path] = field(default_factory=list)
+    processes: list[str] = field(default_factory=list)
+    # Targets that could not be probed for another reason (read-only, ACL-denied...).
+    errors: list[tuple[Path, OSError]] = field(default_factory=list)
+
+
+def owner_file_candidates(path: Path) -> list[Path]:
+    """Return the `~$` owner files Office may create next to `path`."""
+    name = path.name
+    candidates = [path.parent / f"{OWNER_FILE_PREFIX}{name}"]
+    if len(name) > 2:
+        candidates.append(path.parent / f"{OWNER_FILE_PREFIX}{name[2:]}")
+    return candidates
+
+
+def is_lock_violation(exc: OSError) -> bool:
+    winerror = getattr(exc, "winerror", None)
+    if winerror is not None:
+        return winerror in LOCK_WINERRORS
+    return exc.errno in LOCK_ERRNOS
+
+
+def is_locked(path: Path) -> bool:
+    """Return True when another process holds `path` with a share-deny lock.
+
+    Missing files are not locked; other errors opening `path` for writing
+    (read-only attribute, ACL denial...) are raised.
+    """
+    try:
+        with open(path, "r+b"):
+            return False
+    except FileNotFoundError:
+        return False
+    except OSError as exc:
+        if is_lock_violation(exc):
+            return True
+        raise
+
+
+def processes_for(path: Path) -> tuple[str, ...]:
+    """Office executables that may hold `path` open, from the routing table."""
+    return routing.ROUTES.processes_for_name(path.name)
+
+
+def probe_targets(targets: Iterable[Path]) -> LockProbeResult:
+    """Check each planned destination and its owner files for Office locks."""
+    result = LockProbeResult()
+    seen: set[str] = set()
+    for target in targets:
+        try:
+            locked = is_locked(target)
+        except OSError as exc:
+            result.errors.append((target, exc))
+            locked = False
+        locked = locked or any(owner.exists() for owner in owner_file_candidates(target))
+        if not locked:
+            continue
+        result.locked.append(target)
+        for image in processes_for(target):
+            if image not in seen:
+                seen.add(image)
+                result.processes.append(image)
+    return result
@@ -0,0 +1,214 @@
+"""Run metrics for fleet monitoring, written as a Prometheus textfile or JSON.
+
+Counters are process-wide (``METRICS``) so the low-level helpers in common
+can count backups, MRU writes and process kills without extra arguments;
+the installer and uninstaller add their run report and InstallReport totals
+at the end and write the file with ``--metrics RUTA`` (or TemplateMetricsPath).
+
+The Prometheus output is meant for the node exporter textfile collector:
+it is replaced atomically and describes the last run of each command.
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import run_report
+
+PREFIX = "template_installer_"
+FORMAT_PROMETHEUS = "prometheus"
+FORMAT_JSON = "json"
+METRICS_PATH = os.environ.get("TemplateMetricsPath", "")
+METRICS_FORMAT = os.environ.get("TemplateMetricsFormat", "").lower()
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HELP = {
+    "files_total": "Templates handled in the last run, by outcome.",
+    "bytes_written_total": "Bytes written to template destinations.",
+    "backups_total": "Backups created before overwriting or deleting a template.",
+    "mru_writes_total": "Recent-templates (MRU) lists rewritten to add a template.",
+    "mru_cleanups_total": "Recent-templates (MRU) lists rewritten to remove templates.",
+    "registry_calls_total": "winreg calls, by function.",
+    "registry_call_seconds": "Latency of winreg calls, by function.",
+    "process_kills_total": "Office processes the run tried to close, by result.",
+    "results_total": "InstallReport totals (files copied, errors, blocked) for the run.",
+    "phase_seconds": "Duration of each run phase.",
+    "file_seconds": "Time spent on each template.",
+    "run_duration_seconds": "Wall-clock duration of the run.",
+    "run_exit_code": "Exit code of the run (0 is success).",
+    "last_run_timestamp_seconds": "Unix time the run finished.",
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        rows = []
+        for bound, count in zip((*map(_number, self.buckets), "+Inf"), self.counts):
+            total += count
+            rows.append((bound, total))
+        return rows
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms keyed by name and sorted labels."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.gauges: dict[tuple[str, Labels], float] = {}
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self.gauges[(name, _labels(labels))] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    def record_report(self, report: run_report.RunReport) -> None:
+        """Add phase and per-file latencies, outcomes and bytes from a run report."""
+        command = report.command
+        for phase in report.phases:
+            self.observe("phase_seconds", phase.duration, command=command, phase=phase.name)
+        for record in report.files:
+            self.inc("files_total", command=command, outcome=record.outcome)
+            if record.duration:
+                self.observe("file_seconds", record.duration, command=command)
+            if record.bytes:
+                self.inc("bytes_written_total", record.bytes, command=command)
+
+    def record_results(self, results: Any, command: str = "install") -> None:
+        """Add InstallReport totals (files, errors, blocked)."""
+        for kind, value in results.totals.items():
+            self.inc("results_total", value, command=command, kind=kind)
+
+    def finish_run(self, command: str, duration: float, exit_code: int) -> None:
+        self.set("run_duration_seconds", duration, command=command)
+        self.set("run_exit_code", exit_code, command=command)
+        self.set("last_run_timestamp_seconds", time.time(), command=command)
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            histograms = dict(self.histograms)
+        lines: list[str] = []
+        for kind, series in (("counter", counters), ("gauge", gauges)):
+            for name in sorted({name for name, _ in series}):
+                lines.extend(_header(name, kind))
+                for (series_name, labels), value in sorted(series.items()):
+                    if series_name == name:
+                        lines.append(f"{PREFIX}{name}{_format_labels(labels)} {_number(value)}")
+        for name in sorted({name for name, _ in histograms}):
+            lines.extend(_header(name, "histogram"))
+            for (series_name, labels), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+                if series_name != name:
+                    continue
+                for bound, count in histogram.cumulative():
+                    lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+                lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict[str, list[dict[str, object]]]:
+        with self._lock:
+            return {
+                "counters": [_series(name, labels, value) for (name, labels), value in sorted(self.counters.items())],
+                "gauges": [_series(name, labels, value) for (name, labels), value in sorted(self.gauges.items())],
+                "histograms": [
+                    _series(
+                        name,
+                        labels,
+                        {"buckets": dict(histogram.cumulative()), "sum": round(histogram.sum, 6), "count": histogram.count},
+                    )
+                    for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0])
+                ],
+            }
+
+    def write(self, path: Path | str, output_format: Optional[str] = None) -> Path:
+        path = Path(path)
+        output_format = output_format or METRICS_FORMAT or (FORMAT_JSON if path.suffix.lower() == ".json" else FORMAT_PROMETHEUS)
+        text = json.dumps(self.to_dict(), indent=2) if output_format == FORMAT_JSON else self.to_prometheus()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + ".part")
+        with open(temp, "w", encoding="utf-8", newline="\n") as handle:
+            handle.write(text)
+        os.replace(temp, path)
+        return path
+
+
+METRICS = MetricsRegistry()
+
+
+def resolve_metrics_path(cli_value: Optional[str], command: str) -> Optional[Path]:
+    """CLI value or TemplateMetricsPath; a folder gets template_<command>.prom (or .json)."""
+    raw = cli_value or METRICS_PATH
+    if not raw:
+        return None
+    path = Path(raw)
+    if path.is_dir():
+        suffix = ".json" if METRICS_FORMAT == FORMAT_JSON else ".prom"
+        path = path / f"template_{command}{suffix}"
+    return path
+
+
+def _labels(labels: dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _header(name: str, kind: str) -> list[str]:
+    return [f"# HELP {PREFIX}{name} {HELP.get(name, name)}", f"# TYPE {PREFIX}{name} {kind}"]
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(round(value, 6))
+
+
+def _series(name: str, labels: Labels, value: object) -> dict[str, object]:
+    return {"name": PREFIX + name, "labels": dict(labels), "value": value}
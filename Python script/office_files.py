@@ -6,18 +6,11 @@ import os
 from pathlib import Path
 from typing import Iterable
 
-import office_destination
 import path_utils
+import profiling
+import routing
 
-OFFICE_EXTENSIONS = (
-    ".dotx",
-    ".dotm",
-    ".potx",
-    ".potm",
-    ".xltx",
-    ".xltm",
-    ".thmx",
-)
+OFFICE_EXTENSIONS = routing.ROUTES.extensions
 
 def _resolve_template_paths() -> dict[str, Path]:
     base_paths = path_utils.resolve_base_paths()
@@ -49,15 +42,15 @@ def _resolve_template_paths() -> dict[str, Path]:
 
 def iter_office_files(base_dir: Path, extensions: Iterable[str] = OFFICE_EXTENSIONS) -> list[dict[str, str]]:
     base_dir = Path(base_dir)
-    paths = _resolve_template_paths()
+    destinations = routing.destinations_from_template_paths(_resolve_template_paths())
     items: list[dict[str, str]] = []
     for ext in extensions:
         for path in base_dir.glob(f"*{ext}"):
             if not path.is_file():
                 continue
-            destination_root = office_destination.resolve_destination_for_name(path.name, paths)
+            destination_root = routing.ROUTES.destination_for_name(path.name, destinations)
             copy_allowed = path_utils.format_copy_column(path)
-            app_label = _resolve_app_label(path.suffix.lower())
+            app_label = routing.ROUTES.app_for_name(path.name)
             items.append(
                 {
                     "name": path.name,
@@ -79,9 +72,11 @@ def main(argv: list[str] | None = None) -> int:
         default=".",
         help="Folder to scan (defaults to the current folder).",
     )
+    profiling.add_profile_arguments(parser)
     args = parser.parse_args(argv)
     base_dir = path_utils.normalize_path(Path(args.base_dir)).resolve()
-    items = iter_office_files(base_dir)
+    with profiling.profiled(args.cprofile, args.cprofile_sample):
+        items = iter_office_files(base_dir)
     name_width = max((len(item["name"]) for item in items), default=len("name"))
     print(f"{'name':<{name_width}}  {'extension':<9}  {'copy':<5}  {'app':<10}  destination")
     for item in items:
@@ -95,15 +90,5 @@ def main(argv: list[str] | None = None) -> int:
     return 0
 
 
-def _resolve_app_label(extension: str) -> str:
-    if extension in {".dotx", ".dotm"}:
-        return "WORD"
-    if extension in {".potx", ".potm", ".thmx"}:
-        return "POWERPOINT"
-    if extension in {".xltx", ".xltm"}:
-        return "EXCEL"
-    return ""
-
-
 if __name__ == "__main__":
     raise SystemExit(main())
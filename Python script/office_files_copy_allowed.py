@@ -6,6 +6,7 @@ from pathlib import Path
 
 import office_files
 import path_utils
+import profiling
 
 
 def iter_copy_allowed_files(base_dir: Path) -> list[dict[str, str]]:
@@ -23,9 +24,11 @@ def main(argv: list[str] | None = None) -> int:
         default=".",
         help="Folder to scan (defaults to the current folder).",
     )
+    profiling.add_profile_arguments(parser)
     args = parser.parse_args(argv)
     base_dir = path_utils.normalize_path(Path(args.base_dir)).resolve()
-    items = iter_copy_allowed_files(base_dir)
+    with profiling.profiled(args.cprofile, args.cprofile_sample):
+        items = iter_copy_allowed_files(base_dir)
     name_width = max((len(item["name"]) for item in items), default=len("name"))
     print(f"{'name':<{name_width}}  {'extension':<9}  {'copy':<5}  {'app':<10}  destination")
     for item in items:
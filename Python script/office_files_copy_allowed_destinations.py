@@ -8,6 +8,7 @@ from pathlib import Path
 
 import office_files_copy_allowed
 import path_utils
+import profiling
 
 
 def iter_copy_allowed_destinations(base_dir: Path) -> list[str]:
@@ -70,10 +71,12 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Show debug information and open destinations.",
     )
+    profiling.add_profile_arguments(parser)
     args = parser.parse_args(argv)
     base_dir = path_utils.normalize_path(Path(args.base_dir)).resolve()
     design_mode = args.design_mode
-    run_actions(base_dir, design_mode)
+    with profiling.profiled(args.cprofile, args.cprofile_sample):
+        run_actions(base_dir, design_mode)
     return 0
 
 
@@ -7,6 +7,8 @@ from pathlib import Path
 from typing import Iterable, Optional
 
 import author_validation
+import event_log
+import registry_trace
 
 
 def normalize_path(path: Path | str | None) -> Path:
@@ -45,6 +47,7 @@ else:  # pragma: no cover - no Windows
     winreg = None  # type: ignore[assignment]
 
 
+@registry_trace.traced("read_registry_value")
 def read_registry_value(path: str, name: str) -> Optional[str]:
     if winreg is None:
         return None
@@ -136,12 +139,12 @@ def _resolve_excel_template_path(custom_primary: Path, default_custom_dir: Path,
 
 
 def _log_paths_if_design_mode(paths: dict[str, Path]) -> None:
-    design_mode = os.environ.get("IsDesignModeEnabled", "false").lower() == "true"
-    if not design_mode:
+    channel = event_log.EVENTS.paths
+    if not channel.enabled:
         return
-    print("[PATHS] Resolved paths:")
+    channel.info("[PATHS] Resolved paths:")
     for key, value in paths.items():
-        print(f"[PATHS] {key} = {value}")
+        channel.info("[PATHS] %s = %s", key, value)
 
 
 def resolve_base_paths() -> dict[str, Path]:
@@ -165,6 +168,28 @@ def resolve_base_paths() -> dict[str, Path]:
     return paths
 
 
+def resolve_profile_base_paths(profile_root: Path | str) -> dict[str, Path]:
+    """Resolve the default layout of another user's profile folder.
+
+    Unlike resolve_base_paths, this ignores the current user's registry and
+    environment, so it can be used for every profile on a shared host.
+    """
+    profile_root = normalize_path(profile_root)
+    appdata_path = profile_root / "AppData" / "Roaming"
+    documents_path = profile_root / "Documents"
+    custom_dir = documents_path / "Custom Office Templates"
+    return {
+        "APPDATA": appdata_path,
+        "DOCUMENTS": documents_path,
+        "CUSTOM_WORD": custom_dir,
+        "CUSTOM_PPT": custom_dir,
+        "CUSTOM_EXCEL": custom_dir,
+        "THEME": appdata_path / "Microsoft" / "Templates" / "Document Themes",
+        "ROAMING": appdata_path / "Microsoft" / "Templates",
+        "EXCEL_STARTUP": appdata_path / "Microsoft" / "Excel" / "XLSTART",
+    }
+
+
 def _print_paths() -> None:
     paths = resolve_base_paths()
     print("[PATHS] Resolved paths:")
@@ -0,0 +1,258 @@
+"""Resolve a payload source (folder, UNC share, bundle file or URL) to local files.
+
+Remote payloads are fetched into a content cache under the installer state
+folder so an unchanged payload costs one small request:
+
+* ``http(s)://`` sources must point at a bundle (see bundle.py). They are
+  revalidated with If-None-Match / If-Modified-Since, and an interrupted
+  download resumes from its ``.part`` file with a Range + If-Range request.
+* UNC sources (``\\\\server\\share\\...``) are mirrored: only files whose size
+  or mtime changed are copied again.
+* Local folders and bundle files are used in place.
+
+If a remote source cannot be reached, the last cached copy is used. After a
+bundle from a URL installs without failed copies, ``mark_installed`` records
+its validator; a later 304 for that validator resolves with ``installed``
+set so the installer can skip the install (--fresh forces it).
+"""
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import common
+
+SOURCE_TIMEOUT = float(os.environ.get("TemplateSourceTimeout", "30") or 30)
+BUNDLE_SUFFIXES = {".zip"}
+
+KIND_FOLDER = "folder"
+KIND_BUNDLE = "bundle"
+
+FETCH_LOCAL = "local"
+FETCH_NOT_MODIFIED = "not-modified"
+FETCH_DOWNLOADED = "downloaded"
+FETCH_RESUMED = "resumed"
+FETCH_MIRRORED = "mirrored"
+FETCH_OFFLINE = "offline"
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class SourceError(OSError):
+    """The source could not be fetched and nothing usable is cached."""
+
+
+@dataclass
+class ResolvedSource:
+    kind: str
+    path: Path
+    fetch: str = FETCH_LOCAL
+    bytes_transferred: int = 0
+    # The server reported the cached bundle unchanged and it was already installed.
+    installed: bool = False
+
+    @property
+    def is_bundle(self) -> bool:
+        return self.kind == KIND_BUNDLE
+
+
+@dataclass
+class CacheMeta:
+    source: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    size: int = 0
+    # Validator (ETag or Last-Modified) of the interrupted download in payload.zip.part.
+    partial_validator: str = ""
+    # Validator of the cached payload.zip when it was last installed successfully.
+    installed_validator: str = ""
+
+
+def is_url(source: str) -> bool:
+    return urllib.parse.urlsplit(source).scheme.lower() in {"http", "https"}
+
+
+def is_unc(source: str) -> bool:
+    return source.startswith("\\\\") or source.startswith("//")
+
+
+def cache_dir_for(source: str, state_dir: Path | None = None) -> Path:
+    root = common.normalize_path(state_dir or common.INSTALLER_STATE_DIR)
+    key = hashlib.sha1(source.strip().lower().encode("utf-8")).hexdigest()[:16]
+    return root / "cache" / key
+
+
+def resolve_source(source: str, design_mode: bool = False, state_dir: Path | None = None) -> ResolvedSource:
+    """Return local files for `source`, fetching into the content cache when it is remote."""
+    source = source.strip()
+    if is_url(source):
+        return fetch_url(source, cache_dir_for(source, state_dir), design_mode)
+    if source.lower().startswith("file:"):
+        source = urllib.request.url2pathname(urllib.parse.urlsplit(source).path)
+    path = common.normalize_path(source)
+    kind = KIND_BUNDLE if path.suffix.lower() in BUNDLE_SUFFIXES else KIND_FOLDER
+    if not is_unc(source):
+        if not path.exists():
+            raise SourceError(f"Payload source not found: {path}")
+        return ResolvedSource(kind, path)
+    cache_dir = cache_dir_for(source, state_dir)
+    try:
+        if kind == KIND_BUNDLE:
+            target = cache_dir / "payload.zip"
+            copied = _mirror_file(path, target)
+            return ResolvedSource(kind, target, FETCH_MIRRORED if copied else FETCH_NOT_MODIFIED, copied)
+        copied = mirror_directory(path, cache_dir / "payload")
+        return ResolvedSource(kind, cache_dir / "payload", FETCH_MIRRORED if copied else FETCH_NOT_MODIFIED, copied)
+    except OSError as exc:
+        return _offline_fallback(kind, cache_dir, source, exc, design_mode)
+
+
+def mirror_directory(source_dir: Path, target_dir: Path) -> int:
+    """Copy changed templates from `source_dir` and drop removed ones; return bytes copied."""
+    if not source_dir.is_dir():
+        raise SourceError(f"Payload source not found: {source_dir}")
+    common.ensure_directory(target_dir)
+    copied = 0
+    names: set[str] = set()
+    for file in common.iter_template_files(source_dir):
+        names.add(file.name)
+        copied += _mirror_file(file, target_dir / file.name)
+    for stale in common.iter_template_files(target_dir):
+        if stale.name not in names:
+            stale.unlink()
+    return copied
+
+
+def _mirror_file(source: Path, target: Path) -> int:
+    stat = os.stat(source)
+    try:
+        current = os.stat(target)
+        if (current.st_size, current.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return 0
+    except OSError:
+        pass
+    common.ensure_parents_and_copy(source, target)
+    return stat.st_size
+
+
+def fetch_url(url: str, cache_dir: Path, design_mode: bool = False) -> ResolvedSource:
+    """Fetch a bundle over HTTP into `cache_dir`, revalidating and resuming where possible."""
+    target = cache_dir / "payload.zip"
+    partial = cache_dir / "payload.zip.part"
+    meta_path = cache_dir / "meta.json"
+    meta = _load_meta(meta_path)
+    if meta.source != url:
+        meta = CacheMeta(source=url)
+    common.ensure_directory(cache_dir)
+
+    request = urllib.request.Request(url)
+    if target.exists():
+        if meta.etag:
+            request.add_header("If-None-Match", meta.etag)
+        if meta.last_modified:
+            request.add_header("If-Modified-Since", meta.last_modified)
+    offset = partial.stat().st_size if partial.exists() and meta.partial_validator else 0
+    if offset:
+        # If-Range: the server only sends the rest if the file is still the one we started.
+        request.add_header("Range", f"bytes={offset}-")
+        request.add_header("If-Range", meta.partial_validator)
+
+    try:
+        response = urllib.request.urlopen(request, timeout=SOURCE_TIMEOUT)
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304 and target.exists():
+            installed = bool(meta.installed_validator) and meta.installed_validator == _validator(meta)
+            return ResolvedSource(KIND_BUNDLE, target, FETCH_NOT_MODIFIED, installed=installed)
+        if exc.code == 416 and offset:
+            # The partial file no longer matches what the server has: start over.
+            partial.unlink(missing_ok=True)
+            meta.partial_validator = ""
+            _save_meta(meta_path, meta)
+            return fetch_url(url, cache_dir, design_mode)
+        return _offline_fallback(KIND_BUNDLE, cache_dir, url, exc, design_mode)
+    except (urllib.error.URLError, OSError) as exc:
+        return _offline_fallback(KIND_BUNDLE, cache_dir, url, exc, design_mode)
+
+    with response:
+        resumed = response.status == 206 and offset > 0
+        etag = response.headers.get("ETag", "")
+        last_modified = response.headers.get("Last-Modified", "")
+        meta.partial_validator = etag or last_modified
+        _save_meta(meta_path, meta)
+        transferred = 0
+        try:
+            with open(partial, "ab" if resumed else "wb") as handle:
+                for chunk in iter(lambda: response.read(_CHUNK_SIZE), b""):
+                    handle.write(chunk)
+                    transferred += len(chunk)
+            expected = response.headers.get("Content-Length")
+            if expected is not None and transferred < int(expected):
+                raise http.client.IncompleteRead(b"", int(expected) - transferred)
+        except (OSError, http.client.HTTPException) as exc:
+            # Keep the .part file; the next run resumes it.
+            return _offline_fallback(KIND_BUNDLE, cache_dir, url, exc, design_mode)
+    os.replace(partial, target)
+    meta.etag = etag
+    meta.last_modified = last_modified
+    meta.size = target.stat().st_size
+    meta.partial_validator = ""
+    _save_meta(meta_path, meta)
+    return ResolvedSource(KIND_BUNDLE, target, FETCH_RESUMED if resumed else FETCH_DOWNLOADED, transferred)
+
+
+def mark_installed(source: ResolvedSource) -> None:
+    """Record that the cached bundle behind `source` was installed successfully."""
+    if source.kind != KIND_BUNDLE or source.fetch == FETCH_LOCAL:
+        return
+    meta_path = source.path.parent / "meta.json"
+    meta = _load_meta(meta_path)
+    validator = _validator(meta)
+    if not validator or meta.installed_validator == validator:
+        return
+    meta.installed_validator = validator
+    try:
+        _save_meta(meta_path, meta)
+    except OSError:
+        pass
+
+
+def _validator(meta: CacheMeta) -> str:
+    return meta.etag or meta.last_modified
+
+
+def _offline_fallback(
+    kind: str,
+    cache_dir: Path,
+    source: str,
+    exc: Exception,
+    design_mode: bool,
+) -> ResolvedSource:
+    cached = cache_dir / ("payload.zip" if kind == KIND_BUNDLE else "payload")
+    # The cached bundle is only ever replaced whole, so any copy on disk is complete.
+    if not cached.exists():
+        raise SourceError(f"Could not fetch {source} ({exc})") from exc
+    common.EVENTS.installer.warning("[WARN] Could not reach %s (%s); using the cached copy.", source, exc)
+    return ResolvedSource(kind, cached, FETCH_OFFLINE)
+
+
+def _load_meta(path: Path) -> CacheMeta:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return CacheMeta(**json.load(handle))
+    except (OSError, ValueError, TypeError):
+        return CacheMeta()
+
+
+def _save_meta(path: Path, meta: CacheMeta) -> None:
+    temp = path.with_name(path.name + ".part")
+    with open(temp, "w", encoding="utf-8") as handle:
+        json.dump(asdict(meta), handle)
+    os.replace(temp, path)
+
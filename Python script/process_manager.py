@@ -0,0 +1,112 @@
+"""Enumerate and close running Office processes."""
+from __future__ import annotations
+
+import csv
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable
+
+OFFICE_PROCESSES = ("WINWORD.EXE", "POWERPNT.EXE", "EXCEL.EXE", "OUTLOOK.EXE")
+DEFAULT_SHUTDOWN_TIMEOUT = 5.0
+DEFAULT_POLL_INTERVAL = 0.1
+
+
+class WindowsProcessTable:
+    """Process table backed by one `tasklist` call per enumeration."""
+
+    def list_images(self) -> set[str]:
+        result = subprocess.run(
+            ["tasklist", "/FO", "CSV", "/NH"],
+            capture_output=True,
+            text=True,
+        )
+        images: set[str] = set()
+        for row in csv.reader((result.stdout or "").splitlines()):
+            if row:
+                images.add(row[0].strip().upper())
+        return images
+
+    def terminate(self, image: str) -> bool:
+        result = subprocess.run(
+            ["taskkill", "/IM", image, "/F"],
+            capture_output=True,
+            text=True,
+        )
+        return result.returncode == 0
+
+
+class FakeProcessTable:
+    """In-memory process table for exercising shutdown logic off Windows."""
+
+    def __init__(self, running: Iterable[str] = (), exit_delay: float = 0.0, stubborn: Iterable[str] = ()) -> None:
+        self._lock = threading.Lock()
+        self._exit_at: dict[str, float | None] = {image.upper(): None for image in running}
+        self._stubborn = {image.upper() for image in stubborn}
+        self.exit_delay = exit_delay
+        self.list_calls = 0
+        self.terminate_calls: list[str] = []
+
+    def list_images(self) -> set[str]:
+        now = time.monotonic()
+        with self._lock:
+            self.list_calls += 1
+            for image, exit_at in list(self._exit_at.items()):
+                if exit_at is not None and exit_at <= now:
+                    del self._exit_at[image]
+            return set(self._exit_at)
+
+    def terminate(self, image: str) -> bool:
+        image = image.upper()
+        with self._lock:
+            self.terminate_calls.append(image)
+            if image not in self._exit_at:
+                return False
+            if image not in self._stubborn:
+                self._exit_at[image] = time.monotonic() + self.exit_delay
+            return True
+
+
+@dataclass
+class ShutdownResult:
+    targeted: list[str] = field(default_factory=list)
+    closed: list[str] = field(default_factory=list)
+    remaining: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+def close_processes(
+    images: Iterable[str] = OFFICE_PROCESSES,
+    table: WindowsProcessTable | FakeProcessTable | None = None,
+    timeout: float | None = None,
+    poll_interval: float | None = None,
+) -> ShutdownResult:
+    """Terminate the running subset of `images` concurrently and wait up to `timeout`."""
+    started = time.monotonic()
+    timeout = DEFAULT_SHUTDOWN_TIMEOUT if timeout is None else timeout
+    poll_interval = DEFAULT_POLL_INTERVAL if poll_interval is None else poll_interval
+    table = table or WindowsProcessTable()
+    running = table.list_images()
+    targets = [image.upper() for image in images if image.upper() in running]
+    result = ShutdownResult(targeted=targets)
+    if not targets:
+        result.elapsed = time.monotonic() - started
+        return result
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        list(pool.map(table.terminate, targets))
+
+    deadline = started + timeout
+    remaining = set(targets)
+    while True:
+        remaining &= table.list_images()
+        if not remaining or time.monotonic() >= deadline:
+            break
+        time.sleep(poll_interval)
+
+    result.closed = [image for image in targets if image not in remaining]
+    result.remaining = [image for image in targets if image in remaining]
+    result.elapsed = time.monotonic() - started
+    return result
@@ -0,0 +1,145 @@
+"""Install one validated payload into many user profiles."""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import common
+import install_plan
+import metrics
+import path_utils
+
+SYSTEM_PROFILE_NAMES = {"default", "default user", "defaultuser0", "public", "all users"}
+DEFAULT_PROFILE_WORKERS = max(1, int(os.environ.get("TemplateProfileWorkers", "8") or 1))
+# Copy workers per profile; profiles already run in parallel.
+COPY_WORKERS_PER_PROFILE = 2
+
+
+@dataclass
+class ProfileResult:
+    profile: Path
+    files: int = 0
+    errors: int = 0
+    blocked: int = 0
+    duration: float = 0.0
+    error: str = ""
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "profile": str(self.profile),
+            "files": self.files,
+            "errors": self.errors,
+            "blocked": self.blocked,
+            "duration": round(self.duration, 6),
+            "error": self.error,
+        }
+
+    def as_line(self) -> str:
+        status = f"error={self.error}" if self.error else f"files={self.files}, errors={self.errors}, blocked={self.blocked}"
+        return f"[PROFILE] {self.profile}: {status} ({self.duration:.2f}s)"
+
+
+def enumerate_profiles(profiles_dir: Path) -> list[Path]:
+    """Return user profile folders under e.g. C:\\Users, skipping system profiles."""
+    profiles: list[Path] = []
+    try:
+        with os.scandir(profiles_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir() or entry.name.lower() in SYSTEM_PROFILE_NAMES:
+                    continue
+                if os.path.isdir(os.path.join(entry.path, "AppData")):
+                    profiles.append(Path(entry.path))
+    except OSError:
+        return []
+    return sorted(profiles, key=lambda path: path.name.lower())
+
+
+def destinations_for_profile(profile_root: Path) -> dict[str, Path]:
+    base_paths = path_utils.resolve_profile_base_paths(profile_root)
+    return common.destinations_from_template_paths(common.template_paths_from_base(base_paths))
+
+
+def validate_payload(
+    base_dir: Path,
+    allowed_authors: Iterable[str],
+    validation_enabled: bool,
+) -> dict[Path, common.AuthorCheckResult]:
+    """Check every payload template's author once for all profiles."""
+    allowed_authors = list(allowed_authors)
+    return {
+        common.normalize_path(file): common.check_template_author(
+            file,
+            allowed_authors=allowed_authors,
+            validation_enabled=validation_enabled,
+        )
+        for file in common.iter_template_files(base_dir)
+    }
+
+
+def install_profile(
+    base_dir: Path,
+    profile_root: Path,
+    author_results: dict[Path, common.AuthorCheckResult],
+    allowed_authors: list[str],
+    validation_enabled: bool,
+    design_mode: bool,
+) -> ProfileResult:
+    """Install into one profile; MRU lists live in that user's hive, so they are left alone."""
+    started = time.perf_counter()
+    result = ProfileResult(profile_root)
+    try:
+        plan = install_plan.build_install_plan(base_dir, destinations_for_profile(profile_root))
+        for item in plan.items:
+            item.drop(install_plan.MruAddOp.kind)
+        results = common.InstallReport()
+        install_plan.execute_install_plan(
+            plan,
+            results,
+            allowed_authors,
+            validation_enabled,
+            design_mode,
+            author_results=author_results,
+            max_workers=COPY_WORKERS_PER_PROFILE,
+        )
+        metrics.METRICS.record_results(results)
+        result.files = results.totals["files"]
+        result.errors = results.totals["errors"]
+        result.blocked = results.totals["blocked"]
+    except OSError as exc:
+        result.error = str(exc)
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def install_to_profiles(
+    base_dir: Path,
+    profile_roots: Iterable[Path],
+    allowed_authors: Iterable[str],
+    validation_enabled: bool,
+    design_mode: bool,
+    max_workers: int = DEFAULT_PROFILE_WORKERS,
+) -> list[ProfileResult]:
+    """Fan one payload out to `profile_roots`; results keep the input order."""
+    profile_roots = list(profile_roots)
+    allowed_authors = list(allowed_authors)
+    author_results = validate_payload(base_dir, allowed_authors, validation_enabled)
+    if not profile_roots:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(profile_roots))) as pool:
+        futures = [
+            pool.submit(
+                install_profile,
+                base_dir,
+                profile_root,
+                author_results,
+                allowed_authors,
+                validation_enabled,
+                design_mode,
+            )
+            for profile_root in profile_roots
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,186 @@
+"""Opt-in profiling for the installer, uninstaller and office_files CLIs.
+
+``--cprofile RUTA`` writes one zip a user can send back:
+  profile.pstats   cProfile stats (load with pstats or snakeviz)
+  summary.txt      top functions by cumulative time plus the key helpers
+  samples.txt      with --cprofile-sample: wall-clock stacks of the main
+                   thread (collapsed format, one "a;b;c count" per line),
+                   which include time spent waiting on disk, network or locks
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+SAMPLE_INTERVAL = 0.005
+# Before 3.12 a cProfile.Profile only sees the thread that enabled it, so the
+# copy and audit worker threads each get their own profiler, merged at the end.
+_PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+TOP_FUNCTIONS = 20
+# Helpers whose call counts and times are always listed in the summary.
+KEY_FUNCTIONS = (
+    "_extract_author",
+    "_read_author",
+    "SetValueEx",
+    "DeleteValue",
+    "copy2",
+    "copyfile",
+    "staged_copy",
+    "ensure_parents_and_copy",
+    "stream_to_destination",
+    "close_office_apps",
+)
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cprofile",
+        metavar="RUTA",
+        help="Profile the run and write a zip with cProfile stats and a summary to this file.",
+    )
+    parser.add_argument(
+        "--cprofile-sample",
+        action="store_true",
+        help="With --cprofile, also sample wall-clock stacks (includes I/O waits).",
+    )
+
+
+class StackSampler:
+    """Samples one thread's stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: dict[str, int] = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            key = ";".join(reversed(names))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        lines = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in lines)
+
+
+def key_function_stats(stats: pstats.Stats) -> list[tuple[str, int, float, float]]:
+    """(function, calls, own seconds, cumulative seconds) for KEY_FUNCTIONS that ran."""
+    rows = []
+    patterns = [re.compile(rf"(?<!\w){re.escape(name)}\b") for name in KEY_FUNCTIONS]
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():  # type: ignore[attr-defined]
+        if any(pattern.search(function) for pattern in patterns):
+            label = function if filename == "~" else f"{os.path.basename(filename)}:{line}({function})"
+            rows.append((label, calls, own, cumulative))
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+
+def summarize(stats: pstats.Stats, wall_seconds: float, sampler: Optional[StackSampler] = None) -> str:
+    buffer = io.StringIO()
+    buffer.write(f"Wall time: {wall_seconds:.3f}s\n\n")
+    buffer.write("Key helpers (calls, own s, cumulative s):\n")
+    stats.stream = buffer  # type: ignore[attr-defined]
+    rows = key_function_stats(stats)
+    for label, calls, own, cumulative in rows:
+        buffer.write(f"  {calls:>8}  {own:>9.4f}  {cumulative:>9.4f}  {label}\n")
+    if not rows:
+        buffer.write("  (none called)\n")
+    if sampler is not None and sampler.samples:
+        buffer.write(f"\nWall-clock samples: {sampler.samples} every {sampler.interval * 1000:.0f} ms; hottest leaves:\n")
+        leaves: dict[str, int] = {}
+        for stack, count in sampler.stacks.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + count
+        for leaf, count in sorted(leaves.items(), key=lambda item: item[1], reverse=True)[:10]:
+            buffer.write(f"  {count / sampler.samples:6.1%}  {leaf}\n")
+    buffer.write("\n")
+    stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    return buffer.getvalue()
+
+
+def write_artifact(path: Path, stats: pstats.Stats, summary: str, sampler: Optional[StackSampler]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(path.name + ".part")
+    stats_file = temp.with_name(temp.name + ".pstats")
+    stats.dump_stats(stats_file)
+    try:
+        with zipfile.ZipFile(temp, "w", zipfile.ZIP_DEFLATED) as artifact:
+            artifact.write(stats_file, "profile.pstats")
+            artifact.writestr("summary.txt", summary)
+            artifact.writestr("command.txt", " ".join(sys.argv) + "\n")
+            if sampler is not None:
+                artifact.writestr("samples.txt", sampler.collapsed())
+        os.replace(temp, path)
+    finally:
+        stats_file.unlink(missing_ok=True)
+
+
+@contextmanager
+def profiled(path: Optional[str], sample: bool = False) -> Iterator[Optional[cProfile.Profile]]:
+    """Profile the block when `path` is set; the artifact is written even if the block exits."""
+    if not path:
+        yield None
+        return
+    sampler = StackSampler(threading.get_ident()) if sample else None
+    profiler = cProfile.Profile()
+    thread_profilers: list[cProfile.Profile] = []
+
+    def profile_new_thread(frame: object, event: str, arg: object) -> None:
+        # First event in a new thread: hand the thread over to its own profiler.
+        thread_profiler = cProfile.Profile()
+        thread_profilers.append(thread_profiler)
+        thread_profiler.enable()
+
+    started = time.perf_counter()
+    if sampler is not None:
+        sampler.start()
+    if _PER_THREAD_PROFILERS:
+        threading.setprofile(profile_new_thread)
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if _PER_THREAD_PROFILERS:
+            threading.setprofile(None)  # type: ignore[arg-type]
+        if sampler is not None:
+            sampler.stop()
+        stats = pstats.Stats(profiler)
+        for thread_profiler in thread_profilers:
+            stats.add(thread_profiler)
+        summary = summarize(stats, time.perf_counter() - started, sampler)
+        try:
+            write_artifact(Path(path), stats, summary, sampler)
+            print(f"[INFO] Profile written to {path}", file=sys.stderr)
+        except OSError as exc:
+            print(f"[WARN] Could not write profile {path} ({exc})", file=sys.stderr)
+        print(summary, file=sys.stderr)
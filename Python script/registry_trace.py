@@ -0,0 +1,228 @@
+"""Registry operation tracer: call counts, latency and keys touched.
+
+``install(common, common.path_utils)`` swaps each module's ``winreg`` for a
+``TracingRegistry`` proxy. Every winreg function call is timed and charged
+to its operation (OpenKey, EnumValue, SetValueEx...), to the key it touched
+and to the innermost ``traced`` scope running on that thread, so the run
+report shows which helper (MRU discovery, MRU writes, cleanups, path
+lookups) the registry time went to. Calls also feed METRICS
+(registry_calls_total, registry_call_seconds).
+
+With no tracer installed a ``traced`` helper costs one global lookup.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+import metrics
+
+# Keys listed in the report, slowest first; the total count is always reported.
+KEY_LIMIT = 100
+# Remembered handles past which closed ones are dropped (see RegistryTracer._remember).
+HANDLE_PRUNE_THRESHOLD = 256
+# winreg functions whose second argument is a sub key of the first.
+_OPENERS = {"OpenKey", "OpenKeyEx", "CreateKey", "CreateKeyEx", "DeleteKey", "DeleteKeyEx"}
+_HIVE_ABBREVIATIONS = {
+    "HKEY_CURRENT_USER": "HKCU",
+    "HKEY_LOCAL_MACHINE": "HKLM",
+    "HKEY_CLASSES_ROOT": "HKCR",
+    "HKEY_USERS": "HKU",
+    "HKEY_CURRENT_CONFIG": "HKCC",
+}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+ACTIVE: Optional["RegistryTracer"] = None
+
+
+class OperationStats:
+    __slots__ = ("calls", "seconds", "max_seconds", "errors")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.errors = 0
+
+    def add(self, elapsed: float, failed: bool) -> None:
+        self.calls += 1
+        self.seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+        if failed:
+            self.errors += 1
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "calls": self.calls,
+            "seconds": round(self.seconds, 6),
+            "max_seconds": round(self.max_seconds, 6),
+            "errors": self.errors,
+        }
+
+
+class RegistryTracer:
+    """Aggregates the calls made through every TracingRegistry it created."""
+
+    def __init__(self, registry: metrics.MetricsRegistry = metrics.METRICS) -> None:
+        self.metrics = registry
+        self.operations: dict[str, OperationStats] = {}
+        self.keys: dict[str, OperationStats] = {}
+        self.scopes: dict[str, OperationStats] = {}
+        self.scope_calls: dict[str, int] = {}
+        # id(handle) -> (handle, key path). Holding the handle keeps its id from being
+        # reused by a later handle while the entry exists.
+        self._handles: dict[int, tuple[object, str]] = {}
+        self._prune_at = HANDLE_PRUNE_THRESHOLD
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def scope(self, name: str) -> Iterator[None]:
+        stack = self._stack()
+        stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stack.pop()
+            with self._lock:
+                self.scopes.setdefault(name, OperationStats()).add(elapsed, False)
+
+    def record(self, op: str, key: str, elapsed: float, failed: bool, handle: object = None) -> None:
+        stack = self._stack()
+        scope = stack[-1] if stack else ""
+        with self._lock:
+            self.operations.setdefault(op, OperationStats()).add(elapsed, failed)
+            self.keys.setdefault(key, OperationStats()).add(elapsed, failed)
+            self.scope_calls[scope] = self.scope_calls.get(scope, 0) + 1
+            if handle is not None:
+                self._remember(handle, key)
+        self.metrics.inc("registry_calls_total", op=op)
+        self.metrics.observe("registry_call_seconds", elapsed, op=op)
+
+    def key_name(self, handle: object, hive_names: dict[object, str]) -> str:
+        try:
+            hive = hive_names.get(handle)
+        except TypeError:
+            hive = None
+        if hive is not None:
+            return hive
+        entry = self._handles.get(id(handle))
+        return entry[1] if entry is not None and entry[0] is handle else "?"
+
+    def forget(self, handle: object) -> None:
+        """Drop a handle passed to CloseKey."""
+        with self._lock:
+            entry = self._handles.get(id(handle))
+            if entry is not None and entry[0] is handle:
+                del self._handles[id(handle)]
+
+    def _remember(self, handle: object, key: str) -> None:
+        self._handles[id(handle)] = (handle, key)
+        if len(self._handles) > self._prune_at:
+            # Handles closed by Close() or a with block are never passed to CloseKey.
+            self._handles = {ident: entry for ident, entry in self._handles.items() if not _is_closed(entry[0])}
+            self._prune_at = max(HANDLE_PRUNE_THRESHOLD, 2 * len(self._handles))
+
+    def to_dict(self) -> dict[str, object]:
+        with self._lock:
+            total_calls = sum(stats.calls for stats in self.operations.values())
+            total_seconds = sum(stats.seconds for stats in self.operations.values())
+            slowest = sorted(self.keys.items(), key=lambda item: item[1].seconds, reverse=True)
+            return {
+                "calls": total_calls,
+                "seconds": round(total_seconds, 6),
+                "operations": {op: stats.to_dict() for op, stats in sorted(self.operations.items())},
+                "scopes": {
+                    name: {**stats.to_dict(), "registry_calls": self.scope_calls.get(name, 0)}
+                    for name, stats in sorted(self.scopes.items())
+                },
+                "unscoped_calls": self.scope_calls.get("", 0),
+                "keys_touched": len(self.keys),
+                "keys": [{"key": key, **stats.to_dict()} for key, stats in slowest[:KEY_LIMIT]],
+            }
+
+    def _stack(self) -> list[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+
+class TracingRegistry:
+    """Wraps the winreg module; handles pass through unchanged."""
+
+    def __init__(self, module: Any, tracer: RegistryTracer) -> None:
+        self._module = module
+        self._tracer = tracer
+        self._hive_names: dict[object, str] = {}
+        for name in dir(module):
+            if name.startswith("HKEY_"):
+                self._hive_names[getattr(module, name)] = _HIVE_ABBREVIATIONS.get(name, name)
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._module, name)
+        if not callable(value) or name[:1].islower():
+            return value
+        tracer = self._tracer
+        hive_names = self._hive_names
+        opens_key = name in _OPENERS
+        closes_key = name == "CloseKey"
+
+        def traced_call(*args: Any, **kwargs: Any) -> Any:
+            key = tracer.key_name(args[0], hive_names) if args else "?"
+            if opens_key and len(args) > 1:
+                key = f"{key}\\{args[1]}"
+            started = time.perf_counter()
+            try:
+                result = value(*args, **kwargs)
+            except OSError:
+                # EnumValue signals the end of a key with OSError; it still counts as a call.
+                tracer.record(name, key, time.perf_counter() - started, True)
+                raise
+            tracer.record(name, key, time.perf_counter() - started, False, result if opens_key else None)
+            if closes_key and args:
+                tracer.forget(args[0])
+            return result
+
+        return traced_call
+
+
+def _is_closed(handle: object) -> bool:
+    # PyHKEY.handle reads 0 once the key is closed.
+    return getattr(handle, "handle", None) == 0
+
+
+def install(*modules: Any) -> RegistryTracer:
+    """Trace winreg calls made through `modules` (each must have a module-level `winreg`)."""
+    global ACTIVE
+    if ACTIVE is None:
+        ACTIVE = RegistryTracer()
+    for module in modules:
+        current = getattr(module, "winreg", None)
+        if current is not None and not isinstance(current, TracingRegistry):
+            module.winreg = TracingRegistry(current, ACTIVE)
+    return ACTIVE
+
+
+def traced(scope: str) -> Callable[[F], F]:
+    """Charge the registry calls made inside the decorated function to `scope`."""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = ACTIVE
+            if tracer is None:
+                return func(*args, **kwargs)
+            with tracer.scope(scope):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
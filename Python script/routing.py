@@ -0,0 +1,164 @@
+"""Routing table: which Office app owns a template and which folder it goes to.
+
+The rules live in routing.json next to this module (or the file named by
+TemplateRoutingConfig) and are compiled once into dict lookups keyed by base
+template name and lowercase extension:
+
+  folders          extra destination keys, e.g. {"WORKGROUP": "%APPDATA%\\Workgroup"}
+  apps             app -> {"processes"}: the Office executables of each app
+  base_templates   ordered {"name", "app", "destination"} entries for the files
+                   Office opens by default (Normal.dotx, Blank.potx, Book.xltx...)
+  extensions       ".ext" -> {"app", "destination", "mru"} for every other template
+
+"destination" is a key of the destinations mapping (WORD, WORD_CUSTOM,
+THEMES...) or of "folders". "mru" marks extensions whose Recent Templates
+list is updated on install and cleaned on uninstall. A rule's optional
+"processes" list replaces its app's executables for lock checks (themes are
+held by every app, NormalEmail by Outlook too).
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+ROUTING_CONFIG_PATH = Path(
+    os.environ.get("TemplateRoutingConfig", "") or Path(__file__).with_name("routing.json")
+)
+ROUTING_VERSION = 1
+
+
+class RoutingError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Route:
+    app: str
+    destination: str
+    mru: bool = False
+    # Executables that may hold a file of this route open.
+    processes: tuple[str, ...] = ()
+
+    def folder(self, destinations: dict[str, Path]) -> Optional[Path]:
+        return destinations.get(self.destination)
+
+
+class RoutingTable:
+    def __init__(
+        self,
+        base_templates: Iterable[tuple[str, Route]],
+        extensions: dict[str, Route],
+        folders: Optional[dict[str, str]] = None,
+    ) -> None:
+        self._base = dict(base_templates)
+        self._base_folded = {name.lower(): route for name, route in self._base.items()}
+        self._extensions = {extension.lower(): route for extension, route in extensions.items()}
+        self.folders = {key: Path(os.path.expandvars(value)) for key, value in (folders or {}).items()}
+        self.base_routes = tuple(self._base.items())
+        # (app, file name) in install order, as common.BASE_TEMPLATE_TARGETS has always been.
+        self.base_targets = tuple((route.app, name) for name, route in self.base_routes)
+        self.base_names = frozenset(self._base)
+        self.extensions = tuple(self._extensions)
+        self.mru_extensions = frozenset(ext for ext, route in self._extensions.items() if route.mru)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> "RoutingTable":
+        if data.get("version") != ROUTING_VERSION:
+            raise RoutingError(f"Unsupported routing version {data.get('version')!r}")
+        try:
+            apps = {
+                app: tuple(str(image).upper() for image in rule.get("processes", []))
+                for app, rule in data.get("apps", {}).items()  # type: ignore[union-attr]
+            }
+            base = [
+                (entry["name"], _route(entry, entry["app"], apps))
+                for entry in data.get("base_templates", [])  # type: ignore[union-attr]
+            ]
+            extensions = {
+                extension: _route(rule, rule.get("app", ""), apps)
+                for extension, rule in data.get("extensions", {}).items()  # type: ignore[union-attr]
+            }
+        except (KeyError, TypeError, AttributeError) as exc:
+            raise RoutingError(f"Invalid routing rule ({exc!r})") from exc
+        return cls(base, extensions, data.get("folders") or {})  # type: ignore[arg-type]
+
+    @classmethod
+    def load(cls, path: Path | str = ROUTING_CONFIG_PATH) -> "RoutingTable":
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise RoutingError(f"Could not read routing table {path} ({exc})") from exc
+        return cls.from_dict(data)
+
+    def for_extension(self, extension: str) -> Optional[Route]:
+        return self._extensions.get(extension.lower())
+
+    def for_name(self, name: str) -> Optional[Route]:
+        """Base template rule for `name`, else the rule for its extension."""
+        route = self._base.get(name)
+        if route is not None:
+            return route
+        return self._extensions.get(os.path.splitext(name)[1].lower())
+
+    def app_for_name(self, name: str) -> str:
+        route = self.for_name(name)
+        return route.app if route is not None else ""
+
+    def destination_for_extension(self, extension: str, destinations: dict[str, Path]) -> Optional[Path]:
+        route = self._extensions.get(extension.lower())
+        return route.folder(destinations) if route is not None else None
+
+    def destination_for_name(self, name: str, destinations: dict[str, Path]) -> Optional[Path]:
+        route = self.for_name(name)
+        return route.folder(destinations) if route is not None else None
+
+    def processes_for_name(self, name: str) -> tuple[str, ...]:
+        """Executables that may lock `name` (base template rule first, then extension).
+
+        Matched case-insensitively, like the files on disk.
+        """
+        route = self._base_folded.get(name.lower()) or self.for_extension(os.path.splitext(name)[1])
+        return route.processes if route is not None else ()
+
+    def mru_app(self, name: str) -> str:
+        """App whose Recent Templates should list `name` after install, or ""."""
+        route = self.for_name(name)
+        return route.app if route is not None and route.mru else ""
+
+    def with_folders(self, destinations: dict[str, Path]) -> dict[str, Path]:
+        """`destinations` plus the extra folders declared in the table."""
+        return {**destinations, **self.folders} if self.folders else destinations
+
+
+def _route(rule: dict[str, object], app: str, apps: dict[str, tuple[str, ...]]) -> Route:
+    processes = rule.get("processes")
+    return Route(
+        app,
+        rule["destination"],  # type: ignore[arg-type]
+        bool(rule.get("mru", False)),
+        tuple(str(image).upper() for image in processes) if processes is not None else apps.get(app, ()),  # type: ignore[union-attr]
+    )
+
+
+def destinations_from_template_paths(paths: dict[str, Path]) -> dict[str, Path]:
+    """Destination keys used by the routing rules, from resolve_template_paths() folders."""
+    return ROUTES.with_folders(
+        {
+            "WORD": paths["ROAMING"],
+            "POWERPOINT": paths["ROAMING"],
+            "EXCEL": paths["EXCEL"],
+            "CUSTOM": paths["CUSTOM_WORD"],
+            "WORD_CUSTOM": paths["CUSTOM_WORD"],
+            "POWERPOINT_CUSTOM": paths["CUSTOM_PPT"],
+            "EXCEL_CUSTOM": paths["CUSTOM_EXCEL"],
+            "ROAMING": paths["ROAMING"],
+            "THEMES": paths["THEME"],
+        }
+    )
+
+
+ROUTES = RoutingTable.load()
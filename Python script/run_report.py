@@ -0,0 +1,114 @@
+"""Phase timers and the JSON run report written by --report."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+REPORT_VERSION = 1
+
+
+@dataclass
+class PhaseRecord:
+    name: str
+    parent: str = ""
+    started: float = 0.0
+    duration: float = 0.0
+    attributes: dict[str, object] = field(default_factory=dict)
+
+
+@dataclass
+class FileRecord:
+    source: str
+    destination: str
+    outcome: str
+    duration: float = 0.0
+    bytes: int = 0
+
+
+class RunReport:
+    """Collects phase spans, per-file outcomes and counters for one run."""
+
+    def __init__(self, command: str) -> None:
+        self.command = command
+        self.created = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.phases: list[PhaseRecord] = []
+        self.files: list[FileRecord] = []
+        self.counters: dict[str, int] = {}
+        self.sections: dict[str, object] = {}
+        self._origin = time.perf_counter()
+        self._stack: list[PhaseRecord] = []
+
+    @contextmanager
+    def span(self, name: str, **attributes: object) -> Iterator[PhaseRecord]:
+        """Time a phase; nested spans record their enclosing phase as parent."""
+        record = PhaseRecord(
+            name,
+            parent=self._stack[-1].name if self._stack else "",
+            started=time.perf_counter() - self._origin,
+            attributes=dict(attributes),
+        )
+        self.phases.append(record)
+        self._stack.append(record)
+        try:
+            yield record
+        finally:
+            record.duration = time.perf_counter() - self._origin - record.started
+            self._stack.pop()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_file(
+        self,
+        source: Path | str,
+        destination: Optional[Path | str],
+        outcome: str,
+        duration: float = 0.0,
+        size: int = 0,
+    ) -> None:
+        self.files.append(FileRecord(str(source), str(destination or ""), outcome, duration, size))
+        self.count(f"files.{outcome}")
+        if size:
+            self.count("bytes", size)
+
+    def add_section(self, name: str, data: object) -> None:
+        """Attach extra data (e.g. registry or profiler stats) under `name`."""
+        self.sections[name] = data
+
+    @property
+    def duration(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "version": REPORT_VERSION,
+            "command": self.command,
+            "created": self.created,
+            "platform": sys.platform,
+            "pid": os.getpid(),
+            "duration": round(self.duration, 6),
+            "phases": [_rounded(asdict(phase)) for phase in self.phases],
+            "counters": dict(sorted(self.counters.items())),
+            "files": [_rounded(asdict(record)) for record in self.files],
+            **self.sections,
+        }
+
+    def write(self, path: Path | str) -> None:
+        path = Path(path)
+        if path.parent and not path.parent.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + ".part")
+        with open(temp, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, indent=2)
+        os.replace(temp, path)
+
+
+def _rounded(record: dict[str, object]) -> dict[str, object]:
+    return {key: round(value, 6) if isinstance(value, float) else value for key, value in record.items()}
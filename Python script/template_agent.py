@@ -0,0 +1,318 @@
+"""Resident agent that serves install jobs with warm paths and template metadata.
+
+Every BAT entry point otherwise starts a fresh interpreter, resolves the
+Office paths from the registry again and reparses every template. The agent
+pays for that once: it keeps a snapshot of the resolved destinations and the
+author cache of author_validation alive between jobs. Each client connection
+is served on its own thread, so an idle or slow client does not hold up the
+others, but jobs run one at a time so two installs never race on the same
+folders.
+
+Run: py template_agent.py            (serve until a "shutdown" job arrives)
+     py agent_client.py install      (see agent_client.py for the jobs)
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener, answer_challenge, deliver_challenge
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    from . import common
+except ImportError:  # pragma: no cover - allow direct execution as a script
+    sys.path.append(str(Path(__file__).resolve().parent))
+    import common  # type: ignore[no-redef]
+
+import agent_client
+import author_validation
+import install_plan
+
+LOGGER = logging.getLogger(__name__)
+# Seconds a connected client may stay silent before the agent hangs up.
+CONNECTION_IDLE_TIMEOUT = float(os.environ.get("TemplateAgentIdleTimeout", "300") or 300)
+# Jobs that only read agent state and may run while another job holds the lock.
+LOCK_FREE_JOBS = frozenset({"ping"})
+
+
+class TemplateAgent:
+    """Job handlers sharing one path snapshot and the process-wide author cache."""
+
+    def __init__(self, design_mode: bool = False) -> None:
+        self.design_mode = design_mode
+        self.validation_enabled = common.AUTHOR_VALIDATION_ENABLED
+        self.destinations: dict[str, Path] = {}
+        self.started = time.time()
+        self.jobs_served = 0
+        self.running = True
+        self._job_lock = threading.Lock()
+        # The scripts start with a digit, so they can only be loaded by name.
+        self.installer = importlib.import_module("01_installer")
+        self.uninstaller = importlib.import_module("02_uninstaller")
+        self.handlers: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "ping": self.ping,
+            "refresh": self.refresh,
+            "install": self.install,
+            "uninstall": self.uninstall,
+            "check-author": self.check_author,
+            "list": self.list_templates,
+            "repair-mru": self.repair_mru,
+            "shutdown": self.shutdown,
+        }
+        self.refresh({})
+
+    def handle(self, message: dict[str, Any]) -> dict[str, Any]:
+        started = time.perf_counter()
+        job = message.get("job", "")
+        handler = self.handlers.get(job)
+        if handler is None:
+            return {"ok": False, "error": f"Unknown job: {job}", "elapsed": 0.0}
+        try:
+            if job in LOCK_FREE_JOBS:
+                result = handler(message.get("params") or {})
+            else:
+                with self._job_lock:
+                    result = handler(message.get("params") or {})
+        except Exception as exc:  # noqa: BLE001 - one failed job must not stop the agent
+            LOGGER.exception("[ERROR] Job %s failed", job)
+            return {"ok": False, "error": str(exc), "elapsed": time.perf_counter() - started}
+        self.jobs_served += 1
+        return {"ok": True, "result": result, "elapsed": time.perf_counter() - started}
+
+    def ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {"pid": os.getpid(), "uptime": time.time() - self.started, "jobs": self.jobs_served}
+
+    def refresh(self, params: dict[str, Any]) -> dict[str, str]:
+        """Re-snapshot destinations and drop cached metadata (e.g. after a registry change)."""
+        self.destinations = common.default_destinations()
+        author_validation.clear_author_cache()
+        common.DIRECTORIES.reset()
+        return {key: str(value) for key, value in self.destinations.items()}
+
+    def install(self, params: dict[str, Any]) -> dict[str, int]:
+        base_dir = self._base_dir(params)
+        results = self.installer.run_install(
+            base_dir,
+            self.destinations,
+            _allowed_authors(params.get("allowed_authors")),
+            self.validation_enabled,
+            self.design_mode,
+            sync=bool(params.get("sync")),
+            fresh=bool(params.get("fresh")),
+        )
+        # Folders may be deleted between jobs; only memoize within one job.
+        common.DIRECTORIES.reset()
+        return dict(results.totals) if results is not None else {"files": 0, "errors": 0, "blocked": 0}
+
+    def uninstall(self, params: dict[str, Any]) -> dict[str, int]:
+        results = self.uninstaller.run_uninstall(self._base_dir(params), self.destinations, self.design_mode)
+        common.DIRECTORIES.reset()
+        outcomes: dict[str, int] = {}
+        for result in results:
+            outcomes[result.outcome] = outcomes.get(result.outcome, 0) + 1
+        return outcomes
+
+    def check_author(self, params: dict[str, Any]) -> dict[str, Any]:
+        result = common.check_template_author(
+            Path(params["path"]),
+            allowed_authors=_allowed_authors(params.get("allowed_authors")),
+            validation_enabled=self.validation_enabled,
+        )
+        return {"allowed": result.allowed and not result.error, "message": result.message, "authors": result.authors}
+
+    def list_templates(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        plan = install_plan.build_install_plan(self._base_dir(params), self.destinations)
+        allowed = _allowed_authors(params.get("allowed_authors"))
+        rows = []
+        for item in plan.items:
+            row = item.to_dict()
+            if item.source.exists():
+                result = common.check_template_author(
+                    item.source, allowed_authors=allowed, validation_enabled=self.validation_enabled
+                )
+                row["authors"] = result.authors
+                row["allowed"] = result.allowed and not result.error
+            rows.append(row)
+        return rows
+
+    def repair_mru(self, params: dict[str, Any]) -> dict[str, int]:
+        """Re-add MRU entries for installed custom templates of a payload."""
+        plan = install_plan.build_install_plan(self._base_dir(params), self.destinations)
+        repaired = 0
+        for item in plan.items:
+            if not item.has(install_plan.MruAddOp.kind) or item.destination is None or not item.destination.exists():
+                continue
+            common.update_mru_for_template(item.app_label or "", item.destination, self.design_mode)
+            repaired += 1
+        return {"repaired": repaired}
+
+    def shutdown(self, params: dict[str, Any]) -> dict[str, int]:
+        self.running = False
+        return {"jobs": self.jobs_served}
+
+    def _base_dir(self, params: dict[str, Any]) -> Path:
+        base_dir = params.get("base_dir")
+        if not base_dir:
+            raise ValueError("base_dir is required")
+        requested = Path(base_dir)
+        base_dir = common.resolve_base_directory(requested)
+        # Same guard as 01_installer/02_uninstaller: never treat an APPDATA folder as the payload.
+        if common.is_unpinned_payload(requested, base_dir):
+            raise ValueError(f"Payload folder is inside APPDATA, not a pinned template folder: {base_dir}")
+        if not base_dir.is_dir():
+            raise ValueError(f"Payload folder not found: {base_dir}")
+        return base_dir
+
+
+def _allowed_authors(raw: str | None) -> list[str]:
+    raw = raw or os.environ.get("AllowedTemplateAuthors")
+    if not raw:
+        return common.DEFAULT_ALLOWED_TEMPLATE_AUTHORS
+    return [author.strip() for author in raw.split(";") if author.strip()]
+
+
+def _open_listener() -> tuple[Listener, bytes]:
+    """Listen without a Listener authkey; each connection thread runs the handshake itself.
+
+    A running agent is detected with the key it published before that key is
+    replaced, so a second agent never locks clients out of the first one.
+    """
+    address = agent_client.agent_address()
+    family = "AF_PIPE" if os.name == "nt" else "AF_UNIX"
+    if _agent_running(address, family):
+        raise OSError(f"Another template agent is already listening on {address}")
+    if family == "AF_UNIX" and os.path.exists(address):
+        os.unlink(address)  # stale socket from an agent that did not exit cleanly
+    key_path = agent_client.key_path()
+    common.ensure_directory(key_path.parent)
+    authkey = secrets.token_bytes(32)
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(authkey)
+    try:
+        return Listener(address, family=family), authkey
+    except OSError:
+        _remove_key(authkey)
+        raise
+
+
+def _agent_running(address: str, family: str) -> bool:
+    """True when something answers on `address`, whether or not it accepts the current key."""
+    try:
+        key = agent_client.key_path().read_bytes()
+    except OSError:
+        key = None
+    try:
+        Client(address, family=family, authkey=key).close()
+    except AuthenticationError:
+        return True  # an agent with another key: still alive, its socket must stay
+    except EOFError:
+        return True  # accepted, then hung up during the handshake
+    except OSError:
+        return False
+    return True
+
+
+def _remove_key(authkey: bytes) -> None:
+    """Delete the key file only while it still holds the key this process wrote."""
+    key_path = agent_client.key_path()
+    try:
+        if key_path.read_bytes() == authkey:
+            key_path.unlink()
+    except OSError:
+        pass
+
+
+def _serve_connection(agent: TemplateAgent, conn: Connection, authkey: bytes, address: str) -> None:
+    with conn:
+        try:
+            # What Listener.accept does with an authkey, off the accept thread.
+            deliver_challenge(conn, authkey)
+            answer_challenge(conn, authkey)
+        except (AuthenticationError, EOFError, OSError) as exc:
+            if agent.design_mode:
+                LOGGER.warning("[AGENT] Rejected connection (%s)", exc)
+            return
+        while agent.running:
+            try:
+                if not conn.poll(CONNECTION_IDLE_TIMEOUT):
+                    return
+                message = conn.recv()
+            except (EOFError, OSError):
+                return
+            reply = agent.handle(message if isinstance(message, dict) else {})
+            if agent.design_mode:
+                LOGGER.info("[AGENT] %s -> ok=%s (%.3fs)", message.get("job"), reply["ok"], reply["elapsed"])
+            try:
+                conn.send(reply)
+            except OSError:
+                return
+    if not agent.running:
+        _wake_listener(address)
+
+
+def _wake_listener(address: str) -> None:
+    """Unblock the accept loop after a shutdown job so serve() can return."""
+    try:
+        Client(address, family="AF_PIPE" if os.name == "nt" else "AF_UNIX").close()
+    except OSError:
+        pass
+
+
+def serve(design_mode: bool = False) -> int:
+    try:
+        listener, authkey = _open_listener()
+    except OSError as exc:
+        print(f"[ERROR] {exc}", file=sys.stderr)
+        return 1
+    try:
+        agent = TemplateAgent(design_mode)
+    except BaseException:
+        listener.close()
+        _remove_key(authkey)
+        raise
+    address = listener.address
+    if design_mode:
+        LOGGER.info("[AGENT] Listening on %s", address)
+    try:
+        while agent.running:
+            try:
+                conn = listener.accept()
+            except OSError as exc:
+                if design_mode:
+                    LOGGER.warning("[AGENT] Could not accept connection (%s)", exc)
+                continue
+            if not agent.running:
+                conn.close()
+                break
+            threading.Thread(
+                target=_serve_connection,
+                args=(agent, conn, authkey, address),
+                name="agent-connection",
+                daemon=True,
+            ).start()
+    finally:
+        listener.close()
+        _remove_key(authkey)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Resident Office template agent.")
+    parser.parse_args(argv)
+    design_mode = bool(common.DEFAULT_DESIGN_MODE)
+    common.configure_events(design_mode)
+    common.configure_logging(design_mode)
+    return serve(design_mode)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
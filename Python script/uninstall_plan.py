@@ -0,0 +1,218 @@
+"""Deduplicated uninstall plan for Office templates."""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import common
+
+
+NORMAL_TEMPLATE_NAMES = ("Normal.dotx", "Normal.dotm", "NormalEmail.dotx", "NormalEmail.dotm")
+
+OUTCOME_DELETED = "deleted"
+OUTCOME_MISSING = "missing"
+OUTCOME_PERSISTED = "persisted"
+OUTCOME_FAILED = "failed"
+OUTCOME_CLEANED = "cleaned"
+OUTCOME_SKIPPED = "skipped"
+
+
+@dataclass
+class DeleteOperation:
+    target: Path
+    backup: bool
+    # Seen while planning; only picks the files to probe for locks. Office may
+    # recreate or release a file before the delete runs, so _run_delete looks again.
+    present: bool
+    requested_by: list[str] = field(default_factory=list)
+
+
+@dataclass
+class MruCleanup:
+    app_label: str
+    paths: set[str]
+
+
+@dataclass
+class OperationResult:
+    kind: str
+    target: str
+    outcome: str
+    duration: float
+    detail: str = ""
+
+
+@dataclass
+class UninstallPlan:
+    deletes: list[DeleteOperation] = field(default_factory=list)
+    mru_cleanups: list[MruCleanup] = field(default_factory=list)
+    _index: dict[str, DeleteOperation] = field(default_factory=dict, repr=False)
+    _listings: dict[str, set[str]] = field(default_factory=dict, repr=False)
+
+    def add_delete(self, target: Path, backup: bool, requested_by: str) -> DeleteOperation:
+        """Register a delete once; the first request for a target fixes its options."""
+        target = common.normalize_path(target)
+        key = _path_key(target)
+        operation = self._index.get(key)
+        if operation is None:
+            operation = DeleteOperation(target, backup, self._is_present(target))
+            self._index[key] = operation
+            self.deletes.append(operation)
+        if requested_by not in operation.requested_by:
+            operation.requested_by.append(requested_by)
+        return operation
+
+    def _is_present(self, target: Path) -> bool:
+        folder_key = _path_key(target.parent)
+        names = self._listings.get(folder_key)
+        if names is None:
+            names = set()
+            try:
+                with os.scandir(target.parent) as entries:
+                    names = {os.path.normcase(entry.name) for entry in entries if entry.is_file()}
+            except OSError:
+                pass
+            self._listings[folder_key] = names
+        return os.path.normcase(target.name) in names
+
+
+def _path_key(path: Path) -> str:
+    return os.path.normcase(str(common.normalize_path(path)))
+
+
+def build_uninstall_plan(base_dir: Path, destinations: dict[str, Path]) -> UninstallPlan:
+    """Collect every delete and MRU cleanup the uninstall helpers used to perform."""
+    plan = UninstallPlan()
+    roaming = common.resolve_template_paths()["ROAMING"]
+    for name in NORMAL_TEMPLATE_NAMES:
+        plan.add_delete(roaming / name, backup=False, requested_by="normal")
+    for _, name, root in common.base_template_targets(destinations):
+        plan.add_delete(root / name, backup=True, requested_by="base")
+
+    payload_files = [
+        file for file in common.iter_template_files(base_dir) if file.name not in common.BASE_TEMPLATE_NAMES
+    ]
+    distinct_roots = _distinct_paths(destinations.values())
+    for file in payload_files:
+        for root in distinct_roots:
+            plan.add_delete(root / file.name, backup=False, requested_by="custom")
+
+    plan.mru_cleanups = group_mru_cleanups(common._collect_mru_targets(base_dir, destinations, payload_files))
+    return plan
+
+
+def group_mru_cleanups(paths: Iterable[Path]) -> list[MruCleanup]:
+    """Group `paths` by the app whose MRU list routing.json says they belong to."""
+    grouped: dict[str, set[str]] = {}
+    # Apps in routing table order so plans stay stable across runs.
+    for extension in common.ROUTES.extensions:
+        route = common.ROUTES.for_extension(extension)
+        if route is not None and route.mru and route.app:
+            grouped.setdefault(route.app, set())
+    for path in paths:
+        route = common.ROUTES.for_extension(path.suffix)
+        if route is not None and route.mru and route.app:
+            grouped.setdefault(route.app, set()).add(str(path))
+    return [MruCleanup(app, paths) for app, paths in grouped.items() if paths]
+
+
+def _distinct_paths(paths: Iterable[Path]) -> list[Path]:
+    seen: set[str] = set()
+    ordered: list[Path] = []
+    for path in paths:
+        key = _path_key(path)
+        if key in seen:
+            continue
+        seen.add(key)
+        ordered.append(common.normalize_path(path))
+    return ordered
+
+
+def execute_uninstall_plan(plan: UninstallPlan, design_mode: bool) -> list[OperationResult]:
+    """Run deletes first, retry leftovers once, then rewrite the MRU lists."""
+    results: list[OperationResult] = []
+    retry: list[tuple[int, DeleteOperation]] = []
+    for operation in plan.deletes:
+        result = _run_delete(operation, design_mode)
+        if result.outcome in {OUTCOME_PERSISTED, OUTCOME_FAILED}:
+            retry.append((len(results), operation))
+        results.append(result)
+    for position, operation in retry:
+        results[position] = _run_delete(operation, design_mode)
+
+    for cleanup in plan.mru_cleanups:
+        results.append(_run_mru_cleanup(cleanup, design_mode))
+    _log_summary(results, design_mode)
+    return results
+
+
+def _run_delete(operation: DeleteOperation, design_mode: bool) -> OperationResult:
+    started = time.perf_counter()
+    target = operation.target
+    operation.present = target.exists()
+    if not operation.present:
+        _log(logging.INFO, "[INFO] Does not exist %s", target)
+        return OperationResult("delete", str(target), OUTCOME_MISSING, time.perf_counter() - started)
+    try:
+        if operation.backup:
+            common.backup_existing(target, design_mode)
+            operation.backup = False
+        _log(logging.INFO, "[INFO] Deleting %s", target)
+        target.unlink()
+    except FileNotFoundError:
+        operation.present = False
+        return OperationResult("delete", str(target), OUTCOME_MISSING, time.perf_counter() - started)
+    except OSError as exc:
+        _log(logging.WARNING, "[WARN] Could not delete %s (%s)", target, exc)
+        return OperationResult("delete", str(target), OUTCOME_FAILED, time.perf_counter() - started, str(exc))
+    if target.exists():
+        _log(logging.WARNING, "[WARN] File persisted after deletion: %s", target)
+        return OperationResult("delete", str(target), OUTCOME_PERSISTED, time.perf_counter() - started)
+    operation.present = False
+    _log(logging.INFO, "[INFO] Deleted %s", target)
+    return OperationResult("delete", str(target), OUTCOME_DELETED, time.perf_counter() - started)
+
+
+def _run_mru_cleanup(cleanup: MruCleanup, design_mode: bool) -> OperationResult:
+    started = time.perf_counter()
+    if not common.is_windows() or common.winreg is None:
+        return OperationResult("mru", cleanup.app_label, OUTCOME_SKIPPED, time.perf_counter() - started)
+    common._clear_mru_for_app(cleanup.app_label, cleanup.paths, design_mode)
+    return OperationResult("mru", cleanup.app_label, OUTCOME_CLEANED, time.perf_counter() - started)
+
+
+def _log_summary(results: list[OperationResult], design_mode: bool) -> None:
+    channel = common.EVENTS.uninstaller
+    if not channel.enabled:
+        return
+    for result in results:
+        if result.outcome == OUTCOME_MISSING:
+            continue
+        channel.info(
+            "[PLAN] %s %s -> %s (%.1f ms)",
+            result.kind,
+            result.target,
+            result.outcome,
+            result.duration * 1000,
+        )
+    failures = [r.target for r in results if r.outcome in {OUTCOME_PERSISTED, OUTCOME_FAILED}]
+    if failures:
+        channel.warning(
+            "[WARN] Files remained after deletion. Close Office/Outlook and try again: %s",
+            ", ".join(failures),
+        )
+    channel.info(
+        "[PLAN] %s operations, %s deleted, %.1f ms total",
+        len(results),
+        sum(1 for r in results if r.outcome == OUTCOME_DELETED),
+        sum(r.duration for r in results) * 1000,
+    )
+
+
+def _log(level: int, message: str, *args: object) -> None:
+    common.EVENTS.uninstaller.log(level, message, *args)
+
@@ -0,0 +1,93 @@
+"""async_pipeline stage wiring, ordering and backpressure.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import async_pipeline  # noqa: E402
+import common  # noqa: E402
+import copy_executor  # noqa: E402
+from copy_executor import CopyJob  # noqa: E402
+
+JOBS = 24
+
+
+class PipelineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        root = Path(temp.name)
+        (root / "payload").mkdir()
+        self.jobs: list[CopyJob] = []
+        for index in range(JOBS):
+            source = root / "payload" / f"t{index:02}.dotx"
+            source.write_bytes(b"x" * (index + 1))
+            self.jobs.append(CopyJob(source, root / "out" / source.name, validate=False, update_mru=False))
+        # A job whose source is gone never reaches validation or copy.
+        self.jobs.append(CopyJob(root / "payload" / "Normal.dotm", root / "out" / "Normal.dotm", "WORD"))
+        self.jobs.append(CopyJob(root / "payload" / "nowhere.dotx", None))
+
+    def run_pipeline(self, **kwargs: object) -> tuple[common.InstallReport, list[copy_executor.CopyOutcome]]:
+        results = common.InstallReport()
+        outcomes = async_pipeline.execute_pipeline(self.jobs, results, [], False, False, **kwargs)
+        return results, outcomes
+
+    def test_matches_copy_executor(self) -> None:
+        results, outcomes = self.run_pipeline(copy_workers=4, validate_workers=2)
+        expected = common.InstallReport()
+        copy_executor.execute_copy_jobs(self.jobs, expected, [], False, False)
+        self.assertEqual([outcome.job for outcome in outcomes], self.jobs)
+        self.assertEqual(
+            [(item.source, item.destination, item.outcome) for item in results],
+            [(item.source, item.destination, item.outcome) for item in expected],
+        )
+        self.assertEqual(results.totals, {"files": JOBS, "errors": 1, "blocked": 0})
+
+    def test_records_in_job_order_when_copies_finish_out_of_order(self) -> None:
+        copy_checked = copy_executor._copy_checked
+
+        def reversed_copy(outcome: copy_executor.CopyOutcome, journal: object = None) -> None:
+            # Earlier jobs take longest, so completion order is roughly reversed.
+            time.sleep(0.002 * (JOBS - self.jobs.index(outcome.job)))
+            copy_checked(outcome, journal)
+
+        with mock.patch.object(copy_executor, "_copy_checked", reversed_copy):
+            results, outcomes = self.run_pipeline(copy_workers=8, queue_size=4)
+        self.assertEqual([outcome.job for outcome in outcomes], self.jobs)
+        self.assertEqual([Path(item.source) for item in results], [job.source for job in self.jobs])
+
+    def test_window_bounds_jobs_in_flight(self) -> None:
+        scan_job = copy_executor._scan_job
+        apply_outcome = copy_executor._apply_outcome
+        lock = threading.Lock()
+        counts = {"scanned": 0, "applied": 0, "max": 0}
+
+        def scan(outcome: copy_executor.CopyOutcome) -> bool:
+            with lock:
+                counts["scanned"] += 1
+                counts["max"] = max(counts["max"], counts["scanned"] - counts["applied"])
+            return scan_job(outcome)
+
+        def apply(*args: object) -> None:
+            with lock:
+                counts["applied"] += 1
+            apply_outcome(*args)  # type: ignore[arg-type]
+
+        with mock.patch.object(copy_executor, "_scan_job", scan), mock.patch.object(copy_executor, "_apply_outcome", apply):
+            self.run_pipeline(queue_size=1, copy_workers=2, validate_workers=2)
+        self.assertEqual(counts["applied"], len(self.jobs))
+        self.assertLessEqual(counts["max"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
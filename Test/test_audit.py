@@ -0,0 +1,101 @@
+"""audit.run_audit over a copy of the Test/ sample templates.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+TEST_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TEST_DIR.parent / "Python script"))
+
+import audit  # noqa: E402
+import author_validation  # noqa: E402
+
+ALLOWED = ["www.grada.cc", "www.gradaz.com"]
+SAMPLES = (
+    "Normal.dotm",
+    "The blank document - No author.dotx",
+    "The blank workbook - By unauthorized author.xltx",
+    "The blank workbook - By www.grada.cc.xltx",
+    "The Dysolve's Office theme - Reliable Fonts.thmx",
+)
+
+
+class AuditTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        nested = self.root / "b" / "nested"
+        nested.mkdir(parents=True)
+        for name in SAMPLES:
+            shutil.copy2(TEST_DIR / name, self.root / name)
+        # Same bytes as a top-level file, an Office owner file, a corrupt template and a non-template.
+        shutil.copy2(TEST_DIR / "Normal.dotm", nested / "Copy of Normal.dotm")
+        shutil.copy2(TEST_DIR / "Normal.dotm", self.root / "~$Normal.dotm")
+        (nested / "broken.potx").write_bytes(b"not a zip")
+        (self.root / "notes.txt").write_text("ignored")
+
+    def run_audit(self, output_format: str) -> tuple[str, audit.AuditSummary]:
+        stream = io.StringIO()
+        summary = audit.run_audit(self.root, stream, output_format, ALLOWED, True, max_workers=2)
+        return stream.getvalue(), summary
+
+    def test_jsonl_records(self) -> None:
+        output, _ = self.run_audit("jsonl")
+        records = {Path(row["path"]).name: row for row in map(json.loads, output.splitlines())}
+        self.assertEqual(set(records), {*SAMPLES, "Copy of Normal.dotm", "broken.potx"})
+        self.assertEqual(list(records["Normal.dotm"]), list(audit.FIELDS))
+        self.assertTrue(records["Normal.dotm"]["allowed"])
+        self.assertTrue(records["Normal.dotm"]["macro_enabled"])
+        self.assertEqual(records["The blank workbook - By unauthorized author.xltx"]["author"], "Guillermo")
+        self.assertFalse(records["The blank workbook - By unauthorized author.xltx"]["allowed"])
+        self.assertFalse(records["The blank document - No author.dotx"]["allowed"])
+        self.assertEqual(records["The blank document - No author.dotx"]["error"], "")
+        self.assertTrue(records["broken.potx"]["error"])
+        self.assertEqual(records["Copy of Normal.dotm"]["duplicate_of"], records["Normal.dotm"]["path"])
+        self.assertEqual(records["Copy of Normal.dotm"]["sha256"], records["Normal.dotm"]["sha256"])
+
+    def test_walk_order(self) -> None:
+        output, _ = self.run_audit("jsonl")
+        paths = [Path(json.loads(line)["path"]) for line in output.splitlines()]
+        self.assertEqual(paths, list(audit.iter_templates(self.root)))
+        # A folder's own files come before its subfolders.
+        self.assertEqual([path.parent for path in paths[-2:]], [self.root / "b" / "nested"] * 2)
+
+    def test_csv_matches_fields(self) -> None:
+        output, _ = self.run_audit("csv")
+        rows = list(csv.DictReader(io.StringIO(output)))
+        self.assertEqual(len(rows), len(SAMPLES) + 2)
+        self.assertEqual(tuple(rows[0]), audit.FIELDS)
+
+    def test_summary(self) -> None:
+        _, summary = self.run_audit("jsonl")
+        self.assertEqual(summary.files, len(SAMPLES) + 2)
+        self.assertEqual(summary.allowed, 4)
+        self.assertEqual(summary.blocked, 2)
+        self.assertEqual(summary.errors, 1)
+        self.assertEqual(summary.no_author, 1)
+        self.assertEqual(summary.macro_enabled, 2)
+        self.assertEqual(summary.by_author, {"www.grada.cc": 3, "Guillermo": 1})
+        self.assertEqual(
+            summary.duplicate_groups,
+            [[str(self.root / "Normal.dotm"), str(self.root / "b" / "nested" / "Copy of Normal.dotm")]],
+        )
+
+    def test_does_not_fill_the_author_cache(self) -> None:
+        author_validation.clear_author_cache()
+        self.run_audit("jsonl")
+        self.assertEqual(author_validation._author_cache, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
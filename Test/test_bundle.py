@@ -0,0 +1,114 @@
+"""bundle manifest validation and bundle installs into a temporary profile.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+TEST_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TEST_DIR.parent / "Python script"))
+
+import bundle  # noqa: E402
+import common  # noqa: E402
+
+ALLOWED = ["www.grada.cc", "www.gradaz.com"]
+GOOD = "The blank workbook - By www.grada.cc.xltx"
+BAD = "The blank workbook - By unauthorized author.xltx"
+
+
+def manifest_json(*entries: dict[str, object]) -> str:
+    return json.dumps({"version": bundle.BUNDLE_VERSION, "created": "", "entries": list(entries)})
+
+
+def entry(name: str, **overrides: object) -> dict[str, object]:
+    return {"name": name, "sha256": "0" * 64, "size": 1, "authors": [], "destination": "", **overrides}
+
+
+class ManifestTests(unittest.TestCase):
+    def test_rejects_unsupported_extensions(self) -> None:
+        for name in ("evil.xlam", "evil.dll", "evil.xla", "Normal.dotx.lnk", "noextension"):
+            with self.subTest(name=name), self.assertRaises(bundle.BundleError):
+                bundle.BundleManifest.from_json(manifest_json(entry(name)))
+
+    def test_rejects_paths(self) -> None:
+        for name in ("../Normal.dotm", "..\\Normal.dotm", "sub/x.dotx", "C:x.dotx", "/tmp/x.dotx", "..", ""):
+            with self.subTest(name=name), self.assertRaises(bundle.BundleError):
+                bundle.BundleManifest.from_json(manifest_json(entry(name)))
+
+    def test_rejects_duplicate_names(self) -> None:
+        with self.assertRaises(bundle.BundleError):
+            bundle.BundleManifest.from_json(manifest_json(entry("A.dotx"), entry("a.DOTX")))
+
+    def test_accepts_templates(self) -> None:
+        manifest = bundle.BundleManifest.from_json(manifest_json(entry("Normal.dotm"), entry("Theme.thmx")))
+        self.assertEqual([item.name for item in manifest.entries], ["Normal.dotm", "Theme.thmx"])
+
+
+class InstallBundleTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        keys = ("WORD", "POWERPOINT", "EXCEL", "WORD_CUSTOM", "POWERPOINT_CUSTOM", "EXCEL_CUSTOM", "THEMES")
+        self.destinations = {key: self.root / "profile" / key for key in keys}
+
+    def build(self, names: list[str], **overrides: object) -> Path:
+        """Bundle copies of Test/ samples, then apply `overrides` to every manifest entry."""
+        payload = self.root / "payload"
+        payload.mkdir(exist_ok=True)
+        for name in names:
+            shutil.copy2(TEST_DIR / name, payload / name)
+        path = self.root / "payload.zip"
+        manifest = bundle.create_bundle(payload, path)
+        for item in manifest.entries:
+            for key, value in overrides.items():
+                setattr(item, key, value)
+        tampered = self.root / "tampered.zip"
+        with zipfile.ZipFile(path) as source, zipfile.ZipFile(tampered, "w", zipfile.ZIP_STORED) as target:
+            target.writestr(bundle.MANIFEST_NAME, manifest.to_json())
+            for item in manifest.entries:
+                target.writestr(source.getinfo(item.member), source.read(item.member))
+        return tampered
+
+    def install(self, path: Path) -> common.InstallReport:
+        results = common.InstallReport()
+        bundle.install_bundle(path, self.destinations, results, ALLOWED, True, False, close_apps=False)
+        return results
+
+    def test_manifest_cannot_route_into_xlstart(self) -> None:
+        # The manifest claims an allowed author and the EXCEL (XLSTART) folder.
+        results = self.install(self.build([BAD], authors=["www.grada.cc"], destination="EXCEL"))
+        blocked = results.by_outcome(common.FileOutcome.BLOCKED)
+        self.assertEqual([Path(item.source).name for item in blocked], [BAD])
+        self.assertEqual(Path(blocked[0].destination).parent, self.destinations["EXCEL_CUSTOM"])
+        self.assertFalse(self.destinations["EXCEL"].exists())
+        self.assertFalse(self.destinations["EXCEL_CUSTOM"].exists())
+
+    def test_destination_comes_from_routing(self) -> None:
+        results = self.install(self.build([GOOD], destination="EXCEL"))
+        copied = results.by_outcome(common.FileOutcome.COPIED)
+        self.assertEqual([Path(item.destination) for item in copied], [self.destinations["EXCEL_CUSTOM"] / GOOD])
+        self.assertEqual((self.destinations["EXCEL_CUSTOM"] / GOOD).read_bytes(), (TEST_DIR / GOOD).read_bytes())
+        self.assertFalse(self.destinations["EXCEL"].exists())
+
+    def test_missing_base_templates_count_as_missing(self) -> None:
+        results = self.install(self.build([GOOD]))
+        missing = {Path(item.source).name for item in results.by_outcome(common.FileOutcome.MISSING)}
+        self.assertEqual(missing, set(common.BASE_TEMPLATE_NAMES))
+        self.assertEqual(results.totals, {"files": 1, "errors": len(missing), "blocked": 0})
+
+    def test_manifest_matches_folder_install_totals(self) -> None:
+        results = self.install(self.build([GOOD, BAD, "Normal.dotm"]))
+        self.assertEqual(results.outcome_counts()["copied"], 2)
+        self.assertEqual(results.totals["blocked"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
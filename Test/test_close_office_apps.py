@@ -0,0 +1,111 @@
+"""close_office_apps against process_manager.FakeProcessTable.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import common  # noqa: E402
+import process_manager  # noqa: E402
+from process_manager import FakeProcessTable  # noqa: E402
+
+
+class SlowKillTable(FakeProcessTable):
+    """Fake table whose taskkill takes `kill_seconds`, to observe parallel kills."""
+
+    def __init__(self, running, kill_seconds: float) -> None:
+        super().__init__(running)
+        self.kill_seconds = kill_seconds
+        self.active = 0
+        self.max_active = 0
+        self._active_lock = threading.Lock()
+
+    def terminate(self, image: str) -> bool:
+        with self._active_lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.kill_seconds)
+        with self._active_lock:
+            self.active -= 1
+        return super().terminate(image)
+
+
+class CloseOfficeAppsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        # Tests use short waits; restore the module defaults afterwards.
+        self._timeout = process_manager.DEFAULT_SHUTDOWN_TIMEOUT
+        self._poll = process_manager.DEFAULT_POLL_INTERVAL
+        process_manager.DEFAULT_SHUTDOWN_TIMEOUT = 0.3
+        process_manager.DEFAULT_POLL_INTERVAL = 0.01
+
+    def tearDown(self) -> None:
+        process_manager.DEFAULT_SHUTDOWN_TIMEOUT = self._timeout
+        process_manager.DEFAULT_POLL_INTERVAL = self._poll
+
+    def test_already_closed(self) -> None:
+        table = FakeProcessTable(running=["explorer.exe"])
+        result = common.close_office_apps(False, table=table)
+        self.assertIsNotNone(result)
+        self.assertEqual(result.targeted, [])
+        self.assertEqual(result.closed, [])
+        self.assertEqual(table.terminate_calls, [])
+        # One tasklist pass and no polling when nothing is running.
+        self.assertEqual(table.list_calls, 1)
+
+    def test_closes_running_apps(self) -> None:
+        table = FakeProcessTable(running=["WINWORD.EXE", "EXCEL.EXE"])
+        result = common.close_office_apps(False, table=table)
+        self.assertEqual(result.targeted, ["WINWORD.EXE", "EXCEL.EXE"])
+        self.assertEqual(result.closed, ["WINWORD.EXE", "EXCEL.EXE"])
+        self.assertEqual(result.remaining, [])
+        self.assertEqual(sorted(table.terminate_calls), ["EXCEL.EXE", "WINWORD.EXE"])
+        self.assertEqual(table.list_images(), set())
+
+    def test_kill_failure_is_reported_as_remaining(self) -> None:
+        table = FakeProcessTable(running=["OUTLOOK.EXE"], stubborn=["OUTLOOK.EXE"])
+        result = common.close_office_apps(False, table=table)
+        self.assertEqual(result.targeted, ["OUTLOOK.EXE"])
+        self.assertEqual(result.closed, [])
+        self.assertEqual(result.remaining, ["OUTLOOK.EXE"])
+        self.assertGreaterEqual(result.elapsed, process_manager.DEFAULT_SHUTDOWN_TIMEOUT)
+        self.assertEqual(table.list_images(), {"OUTLOOK.EXE"})
+
+    def test_mixed_apps(self) -> None:
+        table = FakeProcessTable(
+            running=["winword.exe", "POWERPNT.EXE", "OUTLOOK.EXE", "notepad.exe"],
+            exit_delay=0.05,
+            stubborn=["POWERPNT.EXE"],
+        )
+        result = common.close_office_apps(False, table=table)
+        self.assertEqual(result.targeted, ["WINWORD.EXE", "POWERPNT.EXE", "OUTLOOK.EXE"])
+        self.assertEqual(result.closed, ["WINWORD.EXE", "OUTLOOK.EXE"])
+        self.assertEqual(result.remaining, ["POWERPNT.EXE"])
+        # Apps that are not running are never passed to taskkill.
+        self.assertNotIn("EXCEL.EXE", table.terminate_calls)
+        self.assertNotIn("NOTEPAD.EXE", table.terminate_calls)
+        self.assertEqual(table.list_images(), {"POWERPNT.EXE", "NOTEPAD.EXE"})
+
+    def test_kills_run_in_parallel(self) -> None:
+        table = SlowKillTable(running=process_manager.OFFICE_PROCESSES, kill_seconds=0.1)
+        result = common.close_office_apps(False, table=table)
+        self.assertEqual(result.closed, list(process_manager.OFFICE_PROCESSES))
+        self.assertEqual(table.max_active, len(process_manager.OFFICE_PROCESSES))
+        self.assertLess(result.elapsed, 0.1 * len(process_manager.OFFICE_PROCESSES))
+
+    def test_enumeration_error_leaves_apps_alone(self) -> None:
+        class BrokenTable(FakeProcessTable):
+            def list_images(self) -> set[str]:
+                raise OSError("tasklist not found")
+
+        self.assertIsNone(common.close_office_apps(False, table=BrokenTable(["WINWORD.EXE"])))
+
+
+if __name__ == "__main__":
+    unittest.main()
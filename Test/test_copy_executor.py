@@ -0,0 +1,113 @@
+"""copy_executor job collection, totals and job-order logging in a temporary profile.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+TEST_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TEST_DIR.parent / "Python script"))
+
+import common  # noqa: E402
+import copy_executor  # noqa: E402
+
+ALLOWED = ["www.grada.cc", "www.gradaz.com"]
+SAMPLES = (
+    "Normal.dotm",
+    "Blank.potx",
+    "The blank document - By www.grada.cc.dotx",
+    "The blank document - No author.dotx",
+    "The blank workbook - By unauthorized author.xltx",
+    "The blank workbook - By www.grada.cc.xltx",
+    "The presentation template - By www.grada.cc.potx",
+    "The Dysolve's Office theme - Reliable Fonts.thmx",
+)
+
+
+class CopyExecutorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.payload = self.root / "payload"
+        self.payload.mkdir()
+        for name in SAMPLES:
+            shutil.copy2(TEST_DIR / name, self.payload / name)
+        keys = ("WORD", "POWERPOINT", "EXCEL", "WORD_CUSTOM", "POWERPOINT_CUSTOM", "EXCEL_CUSTOM", "THEMES")
+        self.destinations = {key: self.root / "profile" / key for key in keys}
+
+    def jobs(self) -> list[copy_executor.CopyJob]:
+        jobs = copy_executor.collect_copy_jobs(self.payload, self.destinations)
+        for job in jobs:
+            job.update_mru = False
+        return jobs
+
+    def test_collects_base_then_custom_by_name(self) -> None:
+        jobs = self.jobs()
+        base = [job.source.name for job in jobs if job.is_base]
+        custom = [job.source.name for job in jobs if not job.is_base]
+        self.assertEqual(base, [name for _, name in common.BASE_TEMPLATE_TARGETS])
+        self.assertEqual([job.is_base for job in jobs], [True] * len(base) + [False] * len(custom))
+        self.assertEqual(custom, sorted((name for name in SAMPLES if name not in base), key=str.lower))
+        by_name = {job.source.name: job for job in jobs}
+        self.assertEqual(by_name["Blank.potx"].destination, self.destinations["POWERPOINT"] / "Blank.potx")
+        theme = "The Dysolve's Office theme - Reliable Fonts.thmx"
+        self.assertEqual(by_name[theme].destination, self.destinations["THEMES"] / theme)
+
+    def test_totals(self) -> None:
+        results = common.InstallReport()
+        outcomes = copy_executor.execute_copy_jobs(self.jobs(), results, ALLOWED, True, False, max_workers=4)
+        base_missing = len(common.BASE_TEMPLATE_NAMES) - 2
+        self.assertEqual(results.totals, {"files": 6, "errors": base_missing, "blocked": 2})
+        self.assertEqual(
+            {outcome.job.source.name for outcome in outcomes if outcome.status == copy_executor.STATUS_BLOCKED},
+            {"The blank document - No author.dotx", "The blank workbook - By unauthorized author.xltx"},
+        )
+        copied = [outcome for outcome in outcomes if outcome.status == copy_executor.STATUS_COPIED]
+        for outcome in copied:
+            self.assertEqual(outcome.job.destination.read_bytes(), outcome.job.source.read_bytes())
+            self.assertEqual(outcome.bytes, outcome.job.source.stat().st_size)
+        self.assertEqual(results.bytes_written, sum(outcome.bytes for outcome in copied))
+
+    def test_failed_copy_counts_as_error(self) -> None:
+        # A file where the WORD_CUSTOM folder should be makes every .dotx copy fail.
+        self.destinations["WORD_CUSTOM"].parent.mkdir(parents=True)
+        self.destinations["WORD_CUSTOM"].write_bytes(b"")
+        results = common.InstallReport()
+        copy_executor.execute_copy_jobs(self.jobs(), results, ALLOWED, False, False)
+        failed = [Path(item.source).name for item in results.by_outcome(common.FileOutcome.FAILED)]
+        self.assertEqual(failed, ["The blank document - By www.grada.cc.dotx", "The blank document - No author.dotx"])
+        self.assertEqual(results.totals["errors"], len(common.BASE_TEMPLATE_NAMES) - 2 + 2)
+
+    def test_logs_and_records_in_job_order(self) -> None:
+        sink = self.root / "events.jsonl"
+        common.EVENTS.configure(False, jsonl_path=sink)
+        self.addCleanup(common.EVENTS.close)
+        jobs = self.jobs()
+        copy_checked = copy_executor._copy_checked
+
+        def reversed_copy(outcome: copy_executor.CopyOutcome, journal: object = None) -> None:
+            # Earlier jobs finish last.
+            time.sleep(0.01 * (len(jobs) - jobs.index(outcome.job)))
+            copy_checked(outcome, journal)
+
+        results = common.InstallReport()
+        with mock.patch.object(copy_executor, "_copy_checked", reversed_copy):
+            copy_executor.execute_copy_jobs(jobs, results, ALLOWED, True, False, max_workers=8)
+        self.assertEqual([Path(item.source) for item in results], [job.source for job in jobs])
+        events = [json.loads(line) for line in sink.read_text(encoding="utf-8").splitlines()]
+        logged = [Path(event["args"][0]).name for event in events if event["event"].startswith("[OK] Copied")]
+        self.assertEqual(len(logged), 6)
+        self.assertEqual(logged, [Path(item.source).name for item in results.by_outcome(common.FileOutcome.COPIED)])
+
+
+if __name__ == "__main__":
+    unittest.main()
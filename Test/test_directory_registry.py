@@ -0,0 +1,62 @@
+"""common.DirectoryRegistry: each destination folder is created once per run.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import common  # noqa: E402
+
+REAL_MKDIR = Path.mkdir
+
+
+class DirectoryRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.registry = common.DirectoryRegistry()
+        self.created: list[Path] = []
+
+        def mkdir(path: Path, *args: object, **kwargs: object) -> None:
+            self.created.append(path)
+            REAL_MKDIR(path, *args, **kwargs)
+
+        self.mkdir = mkdir
+
+    def test_creates_each_folder_once(self) -> None:
+        folder, themes = self.root / "Templates", self.root / "Themes"
+        with mock.patch.object(Path, "mkdir", self.mkdir):
+            self.assertEqual(self.registry.ensure(folder), folder)
+            self.registry.prepare([folder, Path(str(folder)), themes, folder])
+        self.assertTrue(folder.is_dir())
+        self.assertEqual(self.created, [folder, themes])
+
+    def test_reset_starts_a_new_run(self) -> None:
+        folder = self.root / "Templates"
+        with mock.patch.object(Path, "mkdir", self.mkdir):
+            self.registry.ensure(folder)
+            folder.rmdir()
+            self.registry.reset()
+            self.registry.ensure(folder)
+        self.assertEqual(self.created, [folder, folder])
+        self.assertTrue(folder.is_dir())
+
+    def test_copy_creates_missing_destination_folder(self) -> None:
+        source = self.root / "a.dotx"
+        source.write_bytes(b"template")
+        destination = self.root / "profile" / "Custom" / "a.dotx"
+        with mock.patch.object(common, "DIRECTORIES", self.registry):
+            common.ensure_parents_and_copy(source, destination)
+        self.assertEqual(destination.read_bytes(), b"template")
+
+
+if __name__ == "__main__":
+    unittest.main()
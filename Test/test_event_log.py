@@ -0,0 +1,78 @@
+"""event_log channel resolution and the JSONL sink.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import event_log  # noqa: E402
+
+
+class EventLogTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.events = event_log.EventLog()
+        self.addCleanup(self.events.close)
+        environ = {key: value for key, value in os.environ.items() if key not in event_log.CATEGORIES.values()}
+        patcher = mock.patch.dict(os.environ, environ, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read(self, path: Path) -> list[dict[str, object]]:
+        return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    def test_disabled_outside_design_mode_without_sink(self) -> None:
+        self.events.configure(False, jsonl_path=None)
+        self.assertFalse(any(self.events.channel(name).enabled for name in event_log.CATEGORIES))
+
+    def test_design_mode_flags_and_overrides(self) -> None:
+        os.environ["DesignLogMRU"] = "false"
+        self.events.configure(True, {"backup": False, "paths": True})
+        self.assertFalse(self.events.mru.enabled)
+        self.assertFalse(self.events.backup.enabled)
+        self.assertTrue(self.events.paths.console)
+        self.assertTrue(self.events.installer.console)
+        # Overrides never turn console output on outside design mode.
+        self.events.configure(False, {"paths": True})
+        self.assertFalse(self.events.paths.enabled)
+
+    def test_sink_records_every_category(self) -> None:
+        sink = self.root / "logs" / "events.jsonl"
+        self.events.configure(False, {"mru": False}, jsonl_path=sink)
+        self.assertTrue(self.events.mru.enabled)
+        self.assertFalse(self.events.mru.console)
+        self.events.mru.info("[MRU] %s -> %s", "Letter.dotx", "Item 1")
+        self.events.backup.warning("[WARN] %d backups", "bad")
+        records = self.read(sink)
+        self.assertEqual(
+            [(record["category"], record["level"], record["text"]) for record in records],
+            [("mru", "INFO", "[MRU] Letter.dotx -> Item 1"), ("backup", "WARNING", "[WARN] %d backups bad")],
+        )
+        self.assertEqual(records[0]["event"], "[MRU] %s -> %s")
+        self.assertEqual(records[0]["args"], ["Letter.dotx", "Item 1"])
+
+    def test_reconfigure_switches_and_close_detaches_sink(self) -> None:
+        first, second = self.root / "first.jsonl", self.root / "second.jsonl"
+        self.events.configure(False, jsonl_path=first)
+        self.events.configure(False, jsonl_path=second)
+        self.events.installer.info("second")
+        self.events.close()
+        self.assertFalse(self.events.installer.enabled)
+        self.events.installer.info("dropped")
+        self.assertEqual(first.read_text(encoding="utf-8"), "")
+        self.assertEqual([record["text"] for record in self.read(second)], ["second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""install_journal resume after an interrupted install into a temporary profile.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+TEST_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TEST_DIR.parent / "Python script"))
+
+import common  # noqa: E402
+import install_journal  # noqa: E402
+import install_plan  # noqa: E402
+
+ALLOWED = ["www.grada.cc", "www.gradaz.com"]
+XLTX = "The blank workbook - By www.grada.cc.xltx"
+DOTX = "The blank document - By www.grada.cc.dotx"
+POTX = "The presentation template - By www.grada.cc.potx"
+
+
+class JournalResumeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.payload = self.root / "payload"
+        self.payload.mkdir()
+        for name in (XLTX, DOTX, POTX):
+            shutil.copy2(TEST_DIR / name, self.payload / name)
+        keys = ("WORD", "POWERPOINT", "EXCEL", "WORD_CUSTOM", "POWERPOINT_CUSTOM", "EXCEL_CUSTOM", "THEMES")
+        self.destinations = {key: self.root / "profile" / key for key in keys}
+        self.interrupted_run()
+
+    def journal(self) -> install_journal.InstallJournal:
+        return install_journal.InstallJournal.for_payload(self.payload, self.root / "state")
+
+    def plan(self) -> tuple[install_plan.InstallPlan, install_journal.InstallJournal, int]:
+        plan = install_plan.build_install_plan(self.payload, self.destinations)
+        journal = self.journal()
+        return plan, journal, install_journal.apply_journal(plan, journal)
+
+    def item(self, plan: install_plan.InstallPlan, name: str) -> install_plan.PlanItem:
+        return next(item for item in plan.items if item.source.name == name)
+
+    def interrupted_run(self) -> None:
+        """First run: the .dotx copy fails, so the journal is kept for the next run."""
+        plan, journal, _ = self.plan()
+        copy = common.ensure_parents_and_copy
+
+        def failing_copy(source: Path, destination: Path) -> str:
+            if source.name == DOTX:
+                raise OSError("disk full")
+            return copy(source, destination)
+
+        with mock.patch.object(common, "ensure_parents_and_copy", failing_copy):
+            outcomes = install_plan.execute_install_plan(plan, common.InstallReport(), ALLOWED, True, False, journal)
+        journal.close()
+        self.assertEqual(
+            {outcome.job.source.name: outcome.status for outcome in outcomes if not outcome.job.is_base},
+            {XLTX: "copied", DOTX: "failed", POTX: "copied"},
+        )
+
+    def test_completed_steps_are_skipped(self) -> None:
+        plan, journal, resumed = self.plan()
+        self.assertEqual(resumed, 2)
+        for name in (XLTX, POTX):
+            item = self.item(plan, name)
+            self.assertFalse(item.has(install_plan.CopyOp.kind))
+            self.assertFalse(item.has(install_plan.ValidateOp.kind))
+            self.assertTrue(item.to_job().resumed)
+        self.assertTrue(self.item(plan, DOTX).has(install_plan.CopyOp.kind))
+
+        results = common.InstallReport()
+        outcomes = install_plan.execute_install_plan(plan, results, ALLOWED, True, False, journal)
+        statuses = {outcome.job.source.name: outcome.status for outcome in outcomes if not outcome.job.is_base}
+        self.assertEqual(statuses, {XLTX: "resumed", DOTX: "copied", POTX: "resumed"})
+        self.assertEqual(results.totals["files"], 3)
+
+    def test_changed_destination_is_copied_again(self) -> None:
+        destination = self.item(self.plan()[0], XLTX).destination
+        data = bytearray(destination.read_bytes())
+        data[-1] ^= 0xFF
+        destination.write_bytes(bytes(data))
+        os.utime(destination, ns=(0, destination.stat().st_mtime_ns + 1_000_000))
+        plan, _, resumed = self.plan()
+        self.assertEqual(resumed, 1)
+        self.assertTrue(self.item(plan, XLTX).has(install_plan.CopyOp.kind))
+
+    def test_torn_last_line_is_ignored(self) -> None:
+        journal = self.journal()
+        with open(journal.path, "a", encoding="utf-8") as handle:
+            handle.write('{"step": "copy", "destin')
+        self.assertEqual(self.plan()[2], 2)
+
+    def test_edited_payload_starts_a_new_journal(self) -> None:
+        old_path = self.journal().path
+        (self.payload / POTX).write_bytes((self.payload / POTX).read_bytes() + b"\0")
+        self.assertNotEqual(self.journal().path, old_path)
+        self.assertEqual(self.plan()[2], 0)
+
+    def test_discard_removes_the_journal(self) -> None:
+        journal = self.journal()
+        self.assertTrue(journal.path.exists())
+        journal.discard()
+        self.assertFalse(journal.path.exists())
+        self.assertFalse(journal.is_done(self.item(self.plan()[0], XLTX).destination, install_journal.STEP_COPY))
+
+
+if __name__ == "__main__":
+    unittest.main()
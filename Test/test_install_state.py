@@ -0,0 +1,109 @@
+"""install_state.apply_delta (--sync) against a real install into a temporary profile.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+TEST_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TEST_DIR.parent / "Python script"))
+
+import common  # noqa: E402
+import install_plan  # noqa: E402
+import install_state  # noqa: E402
+
+ALLOWED = ["www.grada.cc", "www.gradaz.com"]
+GOOD = "The blank workbook - By www.grada.cc.xltx"
+BAD = "The blank workbook - By unauthorized author.xltx"
+DOTX = "The blank document - By www.grada.cc.dotx"
+
+
+class SyncDeltaTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.payload = self.root / "payload"
+        self.payload.mkdir()
+        for name in (GOOD, BAD, DOTX):
+            shutil.copy2(TEST_DIR / name, self.payload / name)
+        keys = ("WORD", "POWERPOINT", "EXCEL", "WORD_CUSTOM", "POWERPOINT_CUSTOM", "EXCEL_CUSTOM", "THEMES")
+        self.destinations = {key: self.root / "profile" / key for key in keys}
+        self.authors = install_state.authors_fingerprint(ALLOWED, True)
+        self.install()
+
+    def installed(self, name: str) -> Path:
+        return self.destinations["EXCEL_CUSTOM" if name.endswith(".xltx") else "WORD_CUSTOM"] / name
+
+    def state(self) -> install_state.InstallState:
+        return install_state.InstallState.for_payload(self.payload, self.root / "state")
+
+    def delta(self, authors: str | None = None) -> tuple[install_plan.InstallPlan, int]:
+        plan = install_plan.build_install_plan(self.payload, self.destinations)
+        changes = install_state.apply_delta(plan, self.state(), self.authors if authors is None else authors)
+        return plan, changes
+
+    def install(self) -> None:
+        plan = install_plan.build_install_plan(self.payload, self.destinations)
+        state = self.state()
+        install_state.apply_delta(plan, state, self.authors)
+        outcomes = install_plan.execute_install_plan(plan, common.InstallReport(), ALLOWED, True, False)
+        state.record_install(outcomes, install_state.execute_removals(plan, False), self.authors)
+        state.save()
+
+    def copied(self, plan: install_plan.InstallPlan) -> list[str]:
+        return [item.source.name for item in plan.items if item.has(install_plan.CopyOp.kind)]
+
+    def test_unchanged_payload_has_no_changes(self) -> None:
+        plan, changes = self.delta()
+        self.assertEqual(changes, 0)
+        self.assertEqual(self.copied(plan), [])
+        self.assertEqual(plan.removals, [])
+
+    def test_changed_source_is_copied(self) -> None:
+        source = self.payload / GOOD
+        source.write_bytes(source.read_bytes() + b"\0")
+        plan, changes = self.delta()
+        self.assertEqual((changes, self.copied(plan)), (1, [GOOD]))
+
+    def test_same_size_edit_of_destination_is_repaired(self) -> None:
+        installed = self.installed(GOOD)
+        data = bytearray(installed.read_bytes())
+        data[-1] ^= 0xFF
+        installed.write_bytes(bytes(data))
+        plan, changes = self.delta()
+        self.assertEqual((changes, self.copied(plan)), (1, [GOOD]))
+
+    def test_touched_but_identical_destination_is_current(self) -> None:
+        installed = self.installed(GOOD)
+        os.utime(installed, (1, 1))
+        self.assertEqual(self.delta()[1], 0)
+
+    def test_deleted_destination_is_copied(self) -> None:
+        self.installed(DOTX).unlink()
+        plan, changes = self.delta()
+        self.assertEqual((changes, self.copied(plan)), (1, [DOTX]))
+
+    def test_removed_source_queues_removal(self) -> None:
+        (self.payload / DOTX).unlink()
+        plan, changes = self.delta()
+        self.assertEqual(changes, 1)
+        self.assertEqual(plan.removals, [self.installed(DOTX)])
+        install_state.execute_removals(plan, False)
+        self.assertFalse(self.installed(DOTX).exists())
+
+    def test_blocked_template_is_revalidated_after_policy_change(self) -> None:
+        self.assertNotIn(BAD, self.copied(self.delta()[0]))
+        other = install_state.authors_fingerprint([*ALLOWED, "Guillermo"], True)
+        plan, changes = self.delta(other)
+        self.assertEqual((changes, self.copied(plan)), (1, [BAD]))
+
+
+if __name__ == "__main__":
+    unittest.main()
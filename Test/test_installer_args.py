@@ -0,0 +1,76 @@
+"""01_installer argument combinations that must not touch any destination.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+TEST_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TEST_DIR.parent / "Python script"))
+
+import bundle  # noqa: E402
+
+installer = importlib.import_module("01_installer")
+
+SAMPLES = ("Normal.dotm", "The blank workbook - By www.grada.cc.xltx")
+
+
+def snapshot(root: Path) -> list[str]:
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*"))
+
+
+class InstallerArgsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.payload = self.root / "payload"
+        self.payload.mkdir()
+        for name in SAMPLES:
+            shutil.copy2(TEST_DIR / name, self.payload / name)
+        self.profiles = self.root / "Users"
+        for user in ("alice", "bob"):
+            (self.profiles / user / "AppData" / "Roaming").mkdir(parents=True)
+        cwd = os.getcwd()
+        os.chdir(self.payload)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_profiles_install_copies(self) -> None:
+        # Control: without --plan the same arguments do install into the profiles.
+        before = snapshot(self.profiles)
+        results = installer.main(["--profiles-root", str(self.profiles)])
+        self.assertEqual(results.exit_code, 0)
+        self.assertNotEqual(snapshot(self.profiles), before)
+
+    def test_dry_run_leaves_profiles_untouched(self) -> None:
+        before = snapshot(self.profiles)
+        for argv in (
+            ["--profiles-root", str(self.profiles), "--dry-run"],
+            ["--profile", str(self.profiles / "alice"), "--plan"],
+        ):
+            with self.subTest(argv=argv), self.assertRaises(SystemExit) as raised:
+                installer.main(argv)
+            self.assertEqual(raised.exception.code, 1)
+        self.assertEqual(snapshot(self.profiles), before)
+
+    def test_bundle_dry_run_copies_nothing(self) -> None:
+        path = self.root / "payload.zip"
+        bundle.create_bundle(self.payload, path)
+        for argv in (["--bundle", str(path), "--plan"], ["--source", str(path), "--dry-run"]):
+            with self.subTest(argv=argv), mock.patch.object(bundle, "install_bundle") as install:
+                with self.assertRaises(SystemExit) as raised:
+                    installer.main(argv)
+                self.assertEqual(raised.exception.code, 1)
+                install.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""metrics Prometheus textfile and JSON output.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import metrics  # noqa: E402
+import run_report  # noqa: E402
+
+
+class PrometheusOutputTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = metrics.MetricsRegistry()
+
+    def test_counters_and_gauges(self) -> None:
+        self.registry.inc("process_kills_total", result="killed", process="WINWORD.EXE")
+        self.registry.inc("process_kills_total", 2, process="EXCEL.EXE", result="killed")
+        self.registry.inc("backups_total")
+        self.registry.set("run_exit_code", 0, command="install")
+        self.registry.set("run_duration_seconds", 1.2345678, command="install")
+        self.assertEqual(
+            self.registry.to_prometheus().splitlines(),
+            [
+                "# HELP template_installer_backups_total Backups created before overwriting or deleting a template.",
+                "# TYPE template_installer_backups_total counter",
+                "template_installer_backups_total 1",
+                "# HELP template_installer_process_kills_total Office processes the run tried to close, by result.",
+                "# TYPE template_installer_process_kills_total counter",
+                'template_installer_process_kills_total{process="EXCEL.EXE",result="killed"} 2',
+                'template_installer_process_kills_total{process="WINWORD.EXE",result="killed"} 1',
+                "# HELP template_installer_run_duration_seconds Wall-clock duration of the run.",
+                "# TYPE template_installer_run_duration_seconds gauge",
+                'template_installer_run_duration_seconds{command="install"} 1.234568',
+                "# HELP template_installer_run_exit_code Exit code of the run (0 is success).",
+                "# TYPE template_installer_run_exit_code gauge",
+                'template_installer_run_exit_code{command="install"} 0',
+            ],
+        )
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        for value in (0.004, 0.3, 0.3, 120.0):
+            self.registry.observe("file_seconds", value, command="install")
+        lines = self.registry.to_prometheus().splitlines()
+        self.assertEqual(lines[1], "# TYPE template_installer_file_seconds histogram")
+        buckets = {line.split('le="')[1].split('"')[0]: int(line.rsplit(" ", 1)[1]) for line in lines if "_bucket" in line}
+        self.assertEqual(list(buckets), [*map(metrics._number, metrics.LATENCY_BUCKETS), "+Inf"])
+        self.assertEqual((buckets["0.005"], buckets["0.25"], buckets["0.5"], buckets["60"], buckets["+Inf"]), (1, 1, 3, 3, 4))
+        self.assertIn('template_installer_file_seconds_bucket{command="install",le="0.005"} 1', lines)
+        self.assertEqual(
+            lines[-2:],
+            [
+                'template_installer_file_seconds_sum{command="install"} 120.604',
+                'template_installer_file_seconds_count{command="install"} 4',
+            ],
+        )
+
+    def test_label_values_are_escaped(self) -> None:
+        self.registry.inc("files_total", outcome='C:\\Temp\\"new"\nline')
+        self.assertIn(
+            'template_installer_files_total{outcome="C:\\\\Temp\\\\\\"new\\"\\nline"} 1',
+            self.registry.to_prometheus().splitlines(),
+        )
+
+    def test_records_run_report_and_results(self) -> None:
+        report = run_report.RunReport("install")
+        with report.span("copy"):
+            pass
+        report.add_file("a.dotx", "dest/a.dotx", "copied", duration=0.02, size=100)
+        report.add_file("b.dotx", "dest/b.dotx", "copied", duration=0.03, size=50)
+        report.add_file("c.xltx", None, "blocked")
+        self.registry.record_report(report)
+        self.registry.record_results(SimpleNamespace(totals={"files": 2, "errors": 0, "blocked": 1}))
+        text = self.registry.to_prometheus()
+        self.assertIn('template_installer_files_total{command="install",outcome="copied"} 2\n', text)
+        self.assertIn('template_installer_files_total{command="install",outcome="blocked"} 1\n', text)
+        self.assertIn('template_installer_bytes_written_total{command="install"} 150\n', text)
+        self.assertIn('template_installer_results_total{command="install",kind="blocked"} 1\n', text)
+        self.assertIn('template_installer_file_seconds_count{command="install"} 2\n', text)
+        self.assertIn('template_installer_phase_seconds_count{command="install",phase="copy"} 1\n', text)
+
+    def test_empty_registry(self) -> None:
+        self.assertEqual(self.registry.to_prometheus(), "\n")
+
+
+class WriteTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.registry = metrics.MetricsRegistry()
+        self.registry.inc("backups_total")
+
+    def test_format_follows_suffix(self) -> None:
+        prom = self.registry.write(self.root / "out" / "template_install.prom")
+        self.assertEqual(prom.read_text(encoding="utf-8"), self.registry.to_prometheus())
+        data = json.loads(self.registry.write(self.root / "template_install.json").read_text(encoding="utf-8"))
+        self.assertEqual(data["counters"], [{"name": "template_installer_backups_total", "labels": {}, "value": 1}])
+        self.assertEqual(sorted(path.name for path in self.root.rglob("*")), ["out", "template_install.json", "template_install.prom"])
+
+    def test_write_replaces_previous_run(self) -> None:
+        path = self.root / "template_install.prom"
+        path.write_text("stale\n", encoding="utf-8")
+        self.registry.write(path)
+        self.assertNotIn("stale", path.read_text(encoding="utf-8"))
+
+    def test_resolve_metrics_path(self) -> None:
+        self.assertEqual(metrics.resolve_metrics_path(str(self.root), "uninstall"), self.root / "template_uninstall.prom")
+        self.assertEqual(metrics.resolve_metrics_path(str(self.root / "m.json"), "install"), self.root / "m.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""payload_source.fetch_url against benchmarks/payload_server.py on localhost.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent / "Python script"
+sys.path.insert(0, str(SCRIPT_DIR))
+sys.path.insert(0, str(SCRIPT_DIR / "benchmarks"))
+
+import payload_server  # noqa: E402
+import payload_source  # noqa: E402
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+
+
+class PayloadSourceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+        self.served = self.root / "served"
+        self.served.mkdir()
+        self.bundle = self.served / "payload.zip"
+        self.bundle.write_bytes(PAYLOAD)
+        self.cache_dir = self.root / "cache"
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler(drop_after=0))
+        self.server.requests = []  # type: ignore[attr-defined]
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/payload.zip"
+
+    def _handler(self, drop_after: int):
+        test = self
+
+        class RecordingHandler(payload_server.PayloadHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                test.server.requests.append(dict(self.headers))  # type: ignore[attr-defined]
+                super().do_GET()
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                pass
+
+        return partial(RecordingHandler, root=self.served.resolve(), drop_after=drop_after)
+
+    def fetch(self) -> payload_source.ResolvedSource:
+        return payload_source.fetch_url(self.url, self.cache_dir)
+
+    def cached(self) -> bytes:
+        return (self.cache_dir / "payload.zip").read_bytes()
+
+    def meta(self) -> dict[str, object]:
+        return json.loads((self.cache_dir / "meta.json").read_text(encoding="utf-8"))
+
+    def test_etag_not_modified(self) -> None:
+        first = self.fetch()
+        self.assertEqual(first.fetch, payload_source.FETCH_DOWNLOADED)
+        self.assertEqual(first.bytes_transferred, len(PAYLOAD))
+        second = self.fetch()
+        self.assertEqual(second.fetch, payload_source.FETCH_NOT_MODIFIED)
+        self.assertEqual(second.bytes_transferred, 0)
+        self.assertFalse(second.installed)
+        self.assertEqual(self.server.requests[-1].get("If-None-Match"), self.meta()["etag"])
+        self.assertEqual(self.cached(), PAYLOAD)
+
+    def test_not_modified_after_install_is_marked_installed(self) -> None:
+        payload_source.mark_installed(self.fetch())
+        self.assertTrue(self.fetch().installed)
+        # A changed bundle is downloaded and is not considered installed.
+        self.bundle.write_bytes(PAYLOAD[::-1])
+        os.utime(self.bundle, (1, 1))
+        changed = self.fetch()
+        self.assertEqual(changed.fetch, payload_source.FETCH_DOWNLOADED)
+        self.assertFalse(changed.installed)
+        self.assertFalse(self.fetch().installed)
+
+    def test_range_resume(self) -> None:
+        self.server.RequestHandlerClass = self._handler(drop_after=300_000)
+        with self.assertRaises(payload_source.SourceError):
+            self.fetch()
+        partial_file = self.cache_dir / "payload.zip.part"
+        self.assertEqual(partial_file.stat().st_size, 300_000)
+        self.assertTrue(self.meta()["partial_validator"])
+
+        self.server.RequestHandlerClass = self._handler(drop_after=0)
+        resumed = self.fetch()
+        self.assertEqual(resumed.fetch, payload_source.FETCH_RESUMED)
+        self.assertEqual(resumed.bytes_transferred, len(PAYLOAD) - 300_000)
+        self.assertEqual(self.server.requests[-1].get("Range"), "bytes=300000-")
+        self.assertEqual(self.cached(), PAYLOAD)
+        self.assertFalse(partial_file.exists())
+
+    def test_stale_partial_restarts(self) -> None:
+        # The .part file belongs to an older version of the bundle: If-Range no longer matches.
+        self.cache_dir.mkdir()
+        (self.cache_dir / "payload.zip.part").write_bytes(b"x" * 1000)
+        meta = payload_source.CacheMeta(source=self.url, partial_validator='"stale"')
+        payload_source._save_meta(self.cache_dir / "meta.json", meta)
+        result = self.fetch()
+        self.assertEqual(result.fetch, payload_source.FETCH_DOWNLOADED)
+        self.assertEqual(self.server.requests[-1].get("If-Range"), '"stale"')
+        self.assertEqual(self.cached(), PAYLOAD)
+
+    def test_oversized_partial_restarts(self) -> None:
+        # A .part file longer than the bundle gets 416; it is dropped and the download starts over.
+        self.server.RequestHandlerClass = self._handler(drop_after=1000)
+        with self.assertRaises(payload_source.SourceError):
+            self.fetch()
+        partial_file = self.cache_dir / "payload.zip.part"
+        partial_file.write_bytes(b"x" * (len(PAYLOAD) + 10))
+        self.server.RequestHandlerClass = self._handler(drop_after=0)
+        result = self.fetch()
+        self.assertEqual(result.fetch, payload_source.FETCH_DOWNLOADED)
+        self.assertEqual(self.cached(), PAYLOAD)
+
+    def test_unreachable_server_uses_cache(self) -> None:
+        self.fetch()
+        self.server.shutdown()
+        self.server.server_close()
+        result = self.fetch()
+        self.assertEqual(result.fetch, payload_source.FETCH_OFFLINE)
+        self.assertEqual(result.path.read_bytes(), PAYLOAD)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""registry_trace call accounting and handle pruning against the in-memory winreg.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import metrics  # noqa: E402
+import registry_trace  # noqa: E402
+from benchmarks.fake_winreg import FakeRegistry  # noqa: E402
+
+HKCU = FakeRegistry.HKEY_CURRENT_USER
+
+
+class RegistryTracerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metrics = metrics.MetricsRegistry()
+        self.tracer = registry_trace.RegistryTracer(self.metrics)
+        self.winreg = registry_trace.TracingRegistry(FakeRegistry(), self.tracer)
+
+    def test_calls_are_charged_to_the_opened_key(self) -> None:
+        key = self.winreg.CreateKeyEx(HKCU, r"Software\Grada", 0, self.winreg.KEY_ALL_ACCESS)
+        self.winreg.SetValueEx(key, "Item 1", 0, self.winreg.REG_SZ, "a")
+        self.winreg.CloseKey(key)
+        with self.assertRaises(OSError):
+            self.winreg.OpenKey(HKCU, r"Software\Missing")
+        report = self.tracer.to_dict()
+        self.assertEqual(report["calls"], 4)
+        self.assertEqual(report["operations"]["OpenKey"]["errors"], 1)
+        self.assertEqual(
+            {entry["key"]: entry["calls"] for entry in report["keys"]},
+            {r"HKCU\Software\Grada": 3, r"HKCU\Software\Missing": 1},
+        )
+        self.assertEqual(self.metrics.counters[("registry_calls_total", (("op", "SetValueEx"),))], 1)
+
+    def test_close_key_forgets_the_handle(self) -> None:
+        key = self.winreg.CreateKeyEx(HKCU, "Software")
+        self.assertEqual(len(self.tracer._handles), 1)
+        self.winreg.CloseKey(key)
+        self.assertEqual(self.tracer._handles, {})
+        self.assertEqual(self.tracer.key_name(key, {}), "?")
+
+    def test_closed_handles_are_pruned(self) -> None:
+        kept = [self.winreg.CreateKeyEx(HKCU, rf"Software\Open{index}") for index in range(10)]
+        for index in range(3 * registry_trace.HANDLE_PRUNE_THRESHOLD):
+            # Closed by the with block, so CloseKey never sees them.
+            with self.winreg.CreateKeyEx(HKCU, rf"Software\Closed{index}"):
+                pass
+        self.assertLessEqual(len(self.tracer._handles), registry_trace.HANDLE_PRUNE_THRESHOLD + 1)
+        for index, key in enumerate(kept):
+            self.assertEqual(self.tracer.key_name(key, {}), rf"HKCU\Software\Open{index}")
+
+    def test_threshold_grows_with_open_handles(self) -> None:
+        count = 2 * registry_trace.HANDLE_PRUNE_THRESHOLD
+        kept = [self.winreg.CreateKeyEx(HKCU, rf"Software\Open{index}") for index in range(count)]
+        self.assertEqual(len(self.tracer._handles), count)
+        self.assertGreaterEqual(self.tracer._prune_at, count)
+        self.assertEqual(self.tracer.key_name(kept[0], {}), r"HKCU\Software\Open0")
+
+    def test_traced_scopes(self) -> None:
+        @registry_trace.traced("mru.discover")
+        def discover() -> None:
+            with self.winreg.CreateKeyEx(HKCU, "Software") as key:
+                self.winreg.QueryInfoKey(key)
+
+        discover()  # no active tracer: the calls stay unscoped
+        self.assertEqual(self.tracer.scope_calls, {"": 2})
+        with mock.patch.object(registry_trace, "ACTIVE", self.tracer):
+            discover()
+        report = self.tracer.to_dict()
+        self.assertEqual(report["scopes"]["mru.discover"]["calls"], 1)
+        self.assertEqual(report["scopes"]["mru.discover"]["registry_calls"], 2)
+        self.assertEqual(report["unscoped_calls"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""routing.json lookups and the MRU cleanup grouping built on them.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import routing  # noqa: E402
+import uninstall_plan  # noqa: E402
+from routing import ROUTES, RoutingError, RoutingTable  # noqa: E402
+
+
+class RoutingTableTests(unittest.TestCase):
+    def test_base_templates_keep_file_order(self) -> None:
+        with open(routing.ROUTING_CONFIG_PATH, encoding="utf-8") as handle:
+            names = [entry["name"] for entry in json.load(handle)["base_templates"]]
+        self.assertEqual([name for _, name in ROUTES.base_targets], names)
+        self.assertEqual(ROUTES.base_names, frozenset(names))
+
+    def test_for_name(self) -> None:
+        normal = ROUTES.for_name("Normal.dotm")
+        self.assertEqual((normal.app, normal.destination), ("WORD", "WORD"))
+        self.assertEqual(ROUTES.for_name("Book.xltx").destination, "EXCEL")
+        # Any other name routes by extension, case-insensitively.
+        self.assertEqual(ROUTES.for_name("Report.DOTX").destination, "WORD_CUSTOM")
+        self.assertEqual(ROUTES.for_name("Deck.potm").destination, "POWERPOINT_CUSTOM")
+        self.assertEqual(ROUTES.for_name("Theme.thmx").destination, "THEMES")
+        self.assertIsNone(ROUTES.for_name("addin.xlam"))
+        self.assertEqual(ROUTES.app_for_name("addin.xlam"), "")
+
+    def test_destination_lookups(self) -> None:
+        destinations = {"WORD": Path("roaming"), "WORD_CUSTOM": Path("custom-word")}
+        self.assertEqual(ROUTES.destination_for_name("Normal.dotx", destinations), Path("roaming"))
+        self.assertEqual(ROUTES.destination_for_extension(".DOTM", destinations), Path("custom-word"))
+        self.assertIsNone(ROUTES.destination_for_extension(".xltx", destinations))
+
+    def test_mru(self) -> None:
+        self.assertEqual(ROUTES.mru_app("Letter.dotx"), "WORD")
+        self.assertEqual(ROUTES.mru_app("Budget.XLTM"), "EXCEL")
+        self.assertEqual(ROUTES.mru_app("Theme.thmx"), "")
+        self.assertNotIn(".thmx", ROUTES.mru_extensions)
+
+    def test_processes(self) -> None:
+        self.assertEqual(ROUTES.processes_for_name("Budget.xltx"), ("EXCEL.EXE",))
+        # Base template rules override their app's processes, matched case-insensitively.
+        self.assertEqual(ROUTES.processes_for_name("normalemail.DOTM"), ("OUTLOOK.EXE", "WINWORD.EXE"))
+        self.assertEqual(ROUTES.processes_for_name("Theme.thmx"), ("WINWORD.EXE", "POWERPNT.EXE", "EXCEL.EXE"))
+        self.assertEqual(ROUTES.processes_for_name("notes.txt"), ())
+
+    def test_custom_table(self) -> None:
+        with mock.patch.dict(os.environ, {"TEMPLATE_ROOT": "/srv/templates"}):
+            table = RoutingTable.from_dict(
+                {
+                    "version": 1,
+                    "folders": {"WORKGROUP": "${TEMPLATE_ROOT}/workgroup"},
+                    "apps": {"WORD": {"processes": ["winword.exe"]}},
+                    "base_templates": [],
+                    "extensions": {".DOTX": {"app": "WORD", "destination": "WORKGROUP", "mru": True}},
+                }
+            )
+        self.assertEqual(table.for_extension(".dotx"), routing.Route("WORD", "WORKGROUP", True, ("WINWORD.EXE",)))
+        destinations = table.with_folders({"WORD": Path("roaming")})
+        self.assertEqual(destinations["WORKGROUP"], Path("/srv/templates/workgroup"))
+        self.assertEqual(table.destination_for_name("a.dotx", destinations), Path("/srv/templates/workgroup"))
+
+    def test_invalid_tables(self) -> None:
+        for data in (
+            {"version": 2},
+            {"version": 1, "base_templates": [{"name": "Normal.dotm", "app": "WORD"}]},
+            {"version": 1, "extensions": {".dotx": "WORD"}},
+        ):
+            with self.subTest(data=data), self.assertRaises(RoutingError):
+                RoutingTable.from_dict(data)
+
+    def test_load_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            broken = Path(temp) / "routing.json"
+            broken.write_text("{", encoding="utf-8")
+            with self.assertRaises(RoutingError):
+                RoutingTable.load(broken)
+            with self.assertRaises(RoutingError):
+                RoutingTable.load(Path(temp) / "missing.json")
+
+
+class MruGroupingTests(unittest.TestCase):
+    def test_groups_by_app_in_routing_order(self) -> None:
+        paths = [Path("c/Budget.xltx"), Path("a/Letter.dotx"), Path("b/Deck.potx"), Path("a/Memo.DOTM"), Path("t/Theme.thmx")]
+        cleanups = uninstall_plan.group_mru_cleanups(paths)
+        self.assertEqual([cleanup.app_label for cleanup in cleanups], ["WORD", "POWERPOINT", "EXCEL"])
+        self.assertEqual(cleanups[0].paths, {str(Path("a/Letter.dotx")), str(Path("a/Memo.DOTM"))})
+        self.assertEqual(cleanups[2].paths, {str(Path("c/Budget.xltx"))})
+
+    def test_skips_apps_without_paths(self) -> None:
+        cleanups = uninstall_plan.group_mru_cleanups([Path("Deck.potm"), Path("Theme.thmx"), Path("notes.txt")])
+        self.assertEqual([(cleanup.app_label, cleanup.paths) for cleanup in cleanups], [("POWERPOINT", {"Deck.potm"})])
+        self.assertEqual(uninstall_plan.group_mru_cleanups([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
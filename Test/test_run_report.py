@@ -0,0 +1,73 @@
+"""run_report phase spans, file records and the --report JSON file.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import run_report  # noqa: E402
+
+
+class RunReportTests(unittest.TestCase):
+    def test_nested_spans_record_their_parent(self) -> None:
+        report = run_report.RunReport("install")
+        with report.span("install", payload="Templates"):
+            with report.span("copy") as copy:
+                pass
+            with report.span("mru"):
+                pass
+        with report.span("cleanup"):
+            pass
+        self.assertEqual(
+            [(phase.name, phase.parent) for phase in report.phases],
+            [("install", ""), ("copy", "install"), ("mru", "install"), ("cleanup", "")],
+        )
+        outer = report.phases[0]
+        self.assertEqual(outer.attributes, {"payload": "Templates"})
+        self.assertGreaterEqual(outer.duration, copy.duration)
+        self.assertLessEqual(outer.started, copy.started)
+
+    def test_span_is_closed_when_the_phase_fails(self) -> None:
+        report = run_report.RunReport("uninstall")
+        with self.assertRaises(OSError), report.span("delete"):
+            raise OSError("in use")
+        with report.span("mru"):
+            pass
+        self.assertEqual([phase.parent for phase in report.phases], ["", ""])
+        self.assertGreaterEqual(report.phases[0].duration, 0)
+
+    def test_files_and_counters(self) -> None:
+        report = run_report.RunReport("install")
+        report.add_file("a.dotx", Path("dest") / "a.dotx", "copied", duration=0.5, size=10)
+        report.add_file("b.xltx", None, "blocked")
+        report.count("mru_writes", 2)
+        self.assertEqual(report.counters, {"files.copied": 1, "bytes": 10, "files.blocked": 1, "mru_writes": 2})
+        self.assertEqual(report.files[1].destination, "")
+
+    def test_write(self) -> None:
+        report = run_report.RunReport("install")
+        with report.span("copy"):
+            pass
+        report.add_file("a.dotx", "dest/a.dotx", "copied", duration=0.1234567, size=10)
+        report.add_section("registry", {"calls": 3})
+        with tempfile.TemporaryDirectory() as temp:
+            path = Path(temp) / "reports" / "install.json"
+            report.write(path)
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(sorted(item.name for item in path.parent.iterdir()), ["install.json"])
+        self.assertEqual((data["version"], data["command"]), (run_report.REPORT_VERSION, "install"))
+        self.assertEqual([phase["name"] for phase in data["phases"]], ["copy"])
+        self.assertEqual(data["files"][0]["duration"], 0.123457)
+        self.assertEqual(data["counters"], {"bytes": 10, "files.copied": 1})
+        self.assertEqual(data["registry"], {"calls": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
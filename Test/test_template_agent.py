@@ -0,0 +1,88 @@
+"""template_agent startup and shutdown against a second agent on the same address.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import secrets
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import agent_client  # noqa: E402
+import template_agent  # noqa: E402
+
+
+@unittest.skipIf(os.name == "nt", "uses a Unix socket address")
+class SecondAgentTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        patcher = mock.patch.dict(os.environ, {"TemplateInstallerStateDir": temp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.first = threading.Thread(target=template_agent.serve, daemon=True)
+        self.first.start()
+        self.addCleanup(self.stop_first)
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                self.pid = agent_client.request("ping")["result"]["pid"]
+                break
+            except agent_client.AgentUnavailable:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        self.key = agent_client.key_path().read_bytes()
+
+    def stop_first(self) -> None:
+        if self.first.is_alive():
+            agent_client.key_path().write_bytes(self.key)
+            agent_client.request("shutdown")
+            self.first.join(10)
+
+    def serve_second(self) -> int:
+        with contextlib.redirect_stderr(io.StringIO()):
+            return template_agent.serve()
+
+    def test_second_agent_refuses_to_start(self) -> None:
+        self.assertEqual(self.serve_second(), 1)
+        self.assertEqual(agent_client.key_path().read_bytes(), self.key)
+        self.assertEqual(agent_client.request("ping")["result"]["jobs"], 1)
+
+    def test_unknown_key_still_means_running(self) -> None:
+        # The key file no longer matches the live agent: the socket must survive.
+        agent_client.key_path().write_bytes(secrets.token_bytes(32))
+        self.assertEqual(self.serve_second(), 1)
+        self.assertTrue(os.path.exists(agent_client.agent_address()))
+        agent_client.key_path().write_bytes(self.key)
+        self.assertEqual(agent_client.request("ping")["result"]["pid"], self.pid)
+
+    def test_shutdown_keeps_a_key_it_did_not_write(self) -> None:
+        other = secrets.token_bytes(32)
+        with agent_client.connect() as conn:
+            agent_client.key_path().write_bytes(other)
+            conn.send({"job": "shutdown", "params": {}})
+            conn.recv()
+        self.first.join(10)
+        self.assertFalse(self.first.is_alive())
+        self.assertEqual(agent_client.key_path().read_bytes(), other)
+
+    def test_shutdown_removes_its_key(self) -> None:
+        agent_client.request("shutdown")
+        self.first.join(10)
+        self.assertFalse(self.first.is_alive())
+        self.assertFalse(agent_client.key_path().exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""uninstall_plan dedup, execution and the leftover retry in a temporary folder.
+
+Run: py -m unittest discover -s Test
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Python script"))
+
+import uninstall_plan  # noqa: E402
+from uninstall_plan import UninstallPlan  # noqa: E402
+
+REAL_UNLINK = Path.unlink
+
+
+class UninstallPlanTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.root = Path(temp.name)
+
+    def template(self, name: str) -> Path:
+        path = self.root / name
+        path.write_bytes(b"template")
+        return path
+
+    def outcomes(self, plan: UninstallPlan) -> list[tuple[str, str]]:
+        return [(Path(result.target).name, result.outcome) for result in uninstall_plan.execute_uninstall_plan(plan, False)]
+
+    def test_deletes_are_deduplicated(self) -> None:
+        path = self.template("Normal.dotm")
+        plan = UninstallPlan()
+        first = plan.add_delete(path, backup=False, requested_by="normal")
+        second = plan.add_delete(Path(str(path) + "\\"), backup=True, requested_by="base")
+        plan.add_delete(path, backup=True, requested_by="base")
+        self.assertIs(first, second)
+        self.assertEqual(plan.deletes, [first])
+        self.assertEqual(first.requested_by, ["normal", "base"])
+        # The first request fixes the options.
+        self.assertFalse(first.backup)
+
+    def test_deletes_and_reports_missing(self) -> None:
+        plan = UninstallPlan()
+        plan.add_delete(self.template("a.dotx"), backup=False, requested_by="custom")
+        plan.add_delete(self.root / "b.dotx", backup=False, requested_by="custom")
+        self.assertEqual(self.outcomes(plan), [("a.dotx", "deleted"), ("b.dotx", "missing")])
+        self.assertFalse((self.root / "a.dotx").exists())
+
+    def test_backup_before_delete(self) -> None:
+        plan = UninstallPlan()
+        plan.add_delete(self.template("Normal.dotm"), backup=True, requested_by="base")
+        self.assertEqual(self.outcomes(plan), [("Normal.dotm", "deleted")])
+        backups = list((self.root / "Backups").iterdir())
+        self.assertEqual([path.name.endswith(" - Normal.dotm") for path in backups], [True])
+
+    def test_existence_is_checked_again_when_deleting(self) -> None:
+        released = self.template("released.dotx")
+        plan = UninstallPlan()
+        plan.add_delete(self.root / "recreated.dotx", backup=False, requested_by="custom")
+        plan.add_delete(released, backup=False, requested_by="custom")
+        self.assertEqual([operation.present for operation in plan.deletes], [False, True])
+        # Office writes one file back and lets go of (and removes) the other before the deletes run.
+        self.template("recreated.dotx")
+        REAL_UNLINK(released)
+        self.assertEqual(self.outcomes(plan), [("recreated.dotx", "deleted"), ("released.dotx", "missing")])
+        self.assertFalse((self.root / "recreated.dotx").exists())
+
+    def test_leftovers_are_retried_once_in_place(self) -> None:
+        attempts: dict[str, int] = {}
+
+        def unlink(path: Path, missing_ok: bool = False) -> None:
+            attempts[path.name] = attempts.get(path.name, 0) + 1
+            if path.name == "locked.dotx" and attempts[path.name] == 1:
+                raise PermissionError("in use")
+            if path.name == "stuck.dotx":
+                return  # e.g. a sync client puts it back at once
+            REAL_UNLINK(path, missing_ok)
+
+        paths = [self.template(name) for name in ("locked.dotx", "stuck.dotx", "free.dotx")]
+        plan = UninstallPlan()
+        for path in paths:
+            plan.add_delete(path, backup=False, requested_by="custom")
+        with mock.patch.object(Path, "unlink", unlink):
+            outcomes = self.outcomes(plan)
+        self.assertEqual(outcomes, [("locked.dotx", "deleted"), ("stuck.dotx", "persisted"), ("free.dotx", "deleted")])
+        self.assertEqual(attempts, {"locked.dotx": 2, "stuck.dotx": 2, "free.dotx": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()